@@ -0,0 +1,94 @@
+#!/usr/bin/env node
+
+/**
+ * Long-lived Batch Reconciliation Worker
+ *
+ * Keeps a warm Node.js process (and Biconomy Smart Account client) so the
+ * Python backend no longer pays interpreter start-up, SDK import and
+ * smart account setup for every reconciliation batch.
+ *
+ * Spawned and supervised by the backend (services/reconcile_worker.py).
+ * Speaks newline-delimited JSON over stdin/stdout:
+ *   -> {"id": "...", "type": "reconcile", "config": {users, points, points_to_well_rate}}
+ *   <- {"id": "...", "result": <batch-reconcile.js result JSON>}
+ *   -> {"id": "...", "type": "ping"}
+ *   <- {"id": "...", "result": {"status": "ok"}}
+ *
+ * stdout carries only protocol lines; all logging goes to stderr.
+ * The worker exits when stdin is closed.
+ *
+ * Usage: node batch-reconcile-server.js
+ */
+
+import readline from 'readline';
+import { exit } from 'process';
+import { loadEnv, batchReconcile } from './batch-reconcile.js';
+
+// Keep stdout for protocol lines only
+console.log = console.error;
+
+// Batches share one smart account nonce, so run them one after another
+let queue = Promise.resolve();
+
+function enqueue(task) {
+  const run = queue.then(task, task);
+  queue = run.catch(() => {});
+  return run;
+}
+
+function reply(id, result) {
+  process.stdout.write(JSON.stringify({ id, result }) + '\n');
+}
+
+async function handleLine(line) {
+  let message;
+  try {
+    message = JSON.parse(line);
+  } catch (error) {
+    console.error(`❌ Ignoring malformed request: ${error.message}`);
+    return;
+  }
+
+  const { id, type } = message;
+
+  if (type === 'ping') {
+    reply(id, { status: 'ok' });
+    return;
+  }
+
+  if (type !== 'reconcile') {
+    reply(id, { success: false, error: `Unknown request type: ${type}` });
+    return;
+  }
+
+  try {
+    const result = await enqueue(() => batchReconcile(message.config));
+    reply(id, result);
+  } catch (error) {
+    console.error('❌ Batch reconciliation failed:', error.message);
+    reply(id, { success: false, error: error.message, stack: error.stack });
+  }
+}
+
+async function main() {
+  await loadEnv();
+
+  const input = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  input.on('line', line => {
+    if (line.trim()) {
+      handleLine(line);
+    }
+  });
+
+  // Backend closed our stdin: finish queued batches, then exit
+  input.on('close', () => {
+    queue.then(() => exit(0));
+  });
+
+  console.error('🚀 Batch reconcile worker ready');
+}
+
+main().catch(error => {
+  console.error('❌ Failed to start batch reconcile worker:', error.message);
+  exit(1);
+});
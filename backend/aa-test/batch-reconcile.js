@@ -8,14 +8,16 @@
  * TRUE gasless - Paymaster pays all gas fees for backend operations
  *
  * Usage: node batch-reconcile.js <batch-config.json>
+ *        node batch-reconcile.js --stdin < batch-config.json
  */
 
-import { createWalletClient, createPublicClient, http, encodeFunctionData } from 'viem';
+import { createWalletClient, http, encodeFunctionData } from 'viem';
 import { privateKeyToAccount } from 'viem/accounts';
 import { polygonAmoy } from 'viem/chains';
 import { createSmartAccountClient, PaymasterMode } from '@biconomy/account';
 import fs from 'fs/promises';
 import { exit } from 'process';
+import { fileURLToPath } from 'url';
 
 // RedemptionSystem ABI (batchReconcile function)
 const REDEMPTION_SYSTEM_ABI = [
@@ -45,17 +47,51 @@ async function loadBatchConfig(filePath) {
 }
 
 /**
- * Execute batch reconciliation via Biconomy Smart Account
+ * Load environment from parent directory's smartaccount.env
  */
-async function batchReconcile(config) {
-  console.log('🚀 Starting ERC-4337 batch points reconciliation...\n');
+export async function loadEnv() {
+  const envPath = new URL('../smartaccount.env', import.meta.url);
+  const envContent = await fs.readFile(envPath, 'utf8');
+
+  // Parse environment variables
+  envContent.split('\n').forEach(line => {
+    const trimmed = line.trim();
+    if (trimmed && !trimmed.startsWith('#')) {
+      const [key, ...valueParts] = trimmed.split('=');
+      const value = valueParts.join('=');
+      if (key && value) {
+        process.env[key] = value;
+      }
+    }
+  });
+}
+
+// Biconomy Smart Account client, created once per process
+let smartAccountClientPromise = null;
+
+/**
+ * Create (or reuse) the backend Biconomy Smart Account client
+ *
+ * The long-lived reconcile server calls this for every batch, so the SDK
+ * setup and account address lookup are only paid on the first one.
+ */
+export function getSmartAccountClient() {
+  if (!smartAccountClientPromise) {
+    smartAccountClientPromise = createBackendSmartAccountClient().catch(error => {
+      // Let the next batch retry instead of caching the failure
+      smartAccountClientPromise = null;
+      throw error;
+    });
+  }
+  return smartAccountClientPromise;
+}
 
+async function createBackendSmartAccountClient() {
   // Load environment variables
   const {
     AMOY_RPC_URL,
     BICONOMY_BUNDLER_URL,
     BICONOMY_PAYMASTER_API_KEY,
-    REDEMPTION_ADDRESS,
     OWNER_PRIVATE_KEY  // Backend owner with BACKEND_ROLE
   } = process.env;
 
@@ -64,14 +100,55 @@ async function batchReconcile(config) {
     throw new Error('Missing required environment variables (RPC/Bundler/Paymaster)');
   }
 
-  if (!REDEMPTION_ADDRESS) {
-    throw new Error('Missing REDEMPTION_ADDRESS');
-  }
-
   if (!OWNER_PRIVATE_KEY) {
     throw new Error('Missing OWNER_PRIVATE_KEY (backend wallet with BACKEND_ROLE)');
   }
 
+  // Create backend account (has BACKEND_ROLE on RedemptionSystem)
+  const backendAccount = privateKeyToAccount(`0x${OWNER_PRIVATE_KEY.replace('0x', '')}`);
+
+  console.log(`🔑 Backend Account (BACKEND_ROLE): ${backendAccount.address}\n`);
+
+  // Create wallet client with backend account
+  const walletClient = createWalletClient({
+    account: backendAccount,
+    chain: polygonAmoy,
+    transport: http(AMOY_RPC_URL)
+  });
+
+  // Create Biconomy Smart Account client for backend
+  console.log('🔧 Creating Biconomy Smart Account client...');
+
+  const smartAccountClient = await createSmartAccountClient({
+    signer: walletClient,
+    bundlerUrl: BICONOMY_BUNDLER_URL,
+    biconomyPaymasterApiKey: BICONOMY_PAYMASTER_API_KEY,
+    rpcUrl: AMOY_RPC_URL,
+    chainId: polygonAmoy.id
+  });
+
+  const smartAccountAddress = await smartAccountClient.getAccountAddress();
+  console.log(`✅ Backend Smart Account: ${smartAccountAddress}\n`);
+
+  // Important: The backend smart account must have BACKEND_ROLE
+  console.log('⚠️  NOTE: Ensure this smart account has BACKEND_ROLE on RedemptionSystem');
+  console.log(`   If not, run: grantRole(BACKEND_ROLE, ${smartAccountAddress})\n`);
+
+  return { smartAccountClient, smartAccountAddress };
+}
+
+/**
+ * Execute batch reconciliation via Biconomy Smart Account
+ */
+export async function batchReconcile(config) {
+  console.log('🚀 Starting ERC-4337 batch points reconciliation...\n');
+
+  const { AMOY_RPC_URL, REDEMPTION_ADDRESS } = process.env;
+
+  if (!REDEMPTION_ADDRESS) {
+    throw new Error('Missing REDEMPTION_ADDRESS');
+  }
+
   console.log('📋 Configuration:');
   console.log(`   Users: ${config.users.length}`);
   console.log(`   Total Points: ${config.points.reduce((a, b) => BigInt(a) + BigInt(b), 0n).toString()}`);
@@ -94,24 +171,6 @@ async function batchReconcile(config) {
   // Convert points to BigInt array
   const pointsBigInt = config.points.map(p => BigInt(p));
 
-  // Create backend account (has BACKEND_ROLE on RedemptionSystem)
-  const backendAccount = privateKeyToAccount(`0x${OWNER_PRIVATE_KEY.replace('0x', '')}`);
-
-  console.log(`🔑 Backend Account (BACKEND_ROLE): ${backendAccount.address}\n`);
-
-  // Create public client
-  const publicClient = createPublicClient({
-    chain: polygonAmoy,
-    transport: http(AMOY_RPC_URL)
-  });
-
-  // Create wallet client with backend account
-  const walletClient = createWalletClient({
-    account: backendAccount,
-    chain: polygonAmoy,
-    transport: http(AMOY_RPC_URL)
-  });
-
   // Encode batchReconcile function call
   const batchReconcileCallData = encodeFunctionData({
     abi: REDEMPTION_SYSTEM_ABI,
@@ -133,23 +192,7 @@ async function batchReconcile(config) {
 
   console.log('📞 Transaction prepared\n');
 
-  // Create Biconomy Smart Account client for backend
-  console.log('🔧 Creating Biconomy Smart Account client...');
-
-  const smartAccountClient = await createSmartAccountClient({
-    signer: walletClient,
-    bundlerUrl: BICONOMY_BUNDLER_URL,
-    biconomyPaymasterApiKey: BICONOMY_PAYMASTER_API_KEY,
-    rpcUrl: AMOY_RPC_URL,
-    chainId: polygonAmoy.id
-  });
-
-  const smartAccountAddress = await smartAccountClient.getAccountAddress();
-  console.log(`✅ Backend Smart Account: ${smartAccountAddress}\n`);
-
-  // Important: The backend smart account must have BACKEND_ROLE
-  console.log('⚠️  NOTE: Ensure this smart account has BACKEND_ROLE on RedemptionSystem');
-  console.log(`   If not, run: grantRole(BACKEND_ROLE, ${smartAccountAddress})\n`);
+  const { smartAccountClient, smartAccountAddress } = await getSmartAccountClient();
 
   // Send transaction via smart account (gasless - Paymaster pays)
   console.log('📤 Sending gasless UserOperation...');
@@ -227,16 +270,37 @@ async function batchReconcile(config) {
   };
 }
 
+/**
+ * Read the whole of stdin (batch config piped in by the caller)
+ */
+async function readStdin() {
+  const chunks = [];
+  for await (const chunk of process.stdin) {
+    chunks.push(chunk);
+  }
+  return Buffer.concat(chunks).toString('utf8');
+}
+
 /**
  * Main execution
+ *
+ * Result JSON is written to stdout. With --stdin the config is read from
+ * stdin and stdout carries only the result (logs go to stderr), so callers
+ * can pipe in and parse out without any temp files.
  */
 async function main() {
-  try {
-    // Get config file path from command line
-    const configPath = process.argv[2];
+  const configArg = process.argv[2];
+  const useStdin = configArg === '--stdin';
 
-    if (!configPath) {
+  if (useStdin) {
+    // Keep stdout for the result JSON only
+    console.log = console.error;
+  }
+
+  try {
+    if (!configArg) {
       console.error('❌ Usage: node batch-reconcile.js <batch-config.json>');
+      console.error('       node batch-reconcile.js --stdin < batch-config.json');
       console.error('   Example: node batch-reconcile.js /tmp/reconcile-batch.json');
       console.error('');
       console.error('Config format:');
@@ -249,35 +313,19 @@ async function main() {
     }
 
     // Load environment from parent directory's smartaccount.env
-    const envPath = new URL('../smartaccount.env', import.meta.url);
-    const envContent = await fs.readFile(envPath, 'utf8');
-
-    // Parse environment variables
-    envContent.split('\n').forEach(line => {
-      const trimmed = line.trim();
-      if (trimmed && !trimmed.startsWith('#')) {
-        const [key, ...valueParts] = trimmed.split('=');
-        const value = valueParts.join('=');
-        if (key && value) {
-          process.env[key] = value;
-        }
-      }
-    });
+    await loadEnv();
 
     // Load batch configuration
-    const config = await loadBatchConfig(configPath);
+    const config = useStdin ? JSON.parse(await readStdin()) : await loadBatchConfig(configArg);
 
     // Execute batch reconciliation
     const result = await batchReconcile(config);
 
     // Write result as JSON for structured parsing
-    console.log('\n📝 Final Result JSON:');
-    console.log(JSON.stringify(result, null, 2));
-
-    // Write result to file for Python to read
-    const resultPath = configPath.replace('.json', '-result.json');
-    await fs.writeFile(resultPath, JSON.stringify(result, null, 2));
-    console.log(`\n💾 Result saved to: ${resultPath}`);
+    if (!useStdin) {
+      console.log('\n📝 Final Result JSON:');
+    }
+    process.stdout.write(JSON.stringify(result) + '\n');
 
     exit(0);
 
@@ -286,22 +334,19 @@ async function main() {
     console.error(error.message);
     console.error(error.stack);
 
-    // Write error to result file
+    // Write error as result JSON
     const errorResult = {
       success: false,
       error: error.message,
       stack: error.stack
     };
-
-    const configPath = process.argv[2];
-    if (configPath) {
-      const resultPath = configPath.replace('.json', '-result.json');
-      await fs.writeFile(resultPath, JSON.stringify(errorResult, null, 2));
-    }
+    process.stdout.write(JSON.stringify(errorResult) + '\n');
 
     exit(1);
   }
 }
 
-// Run main function
-main();
+// Run main function only when executed directly (batch-reconcile-server.js imports this module)
+if (process.argv[1] === fileURLToPath(import.meta.url)) {
+  main();
+}
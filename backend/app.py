@@ -8,6 +8,9 @@ import logging
 import os
 from config import ALLOWED_ORIGINS, settings
 from models import init_database
+from services.push_notifications import get_client as get_push_client, close_client as close_push_client
+from services.reconcile_worker import reconcile_worker
+from services.defender_relayer_client import close_relayer_client
 from routers.core import router as core_router
 from routers.biconomy import router as biconomy_router
 from routers.tasks import router as tasks_router
@@ -16,7 +19,7 @@ from routers.lighthouse import router as lighthouse_router
 from routers.rewards import router as rewards_router
 from routers.challenges import router as challenges_router
 from routers.calendar import router as calendar_router
-from routers.relayer import router as relayer_router
+from routers.relayer import router as relayer_router, reconcile_batcher
 from routers.reconciliation import router as reconciliation_router
 from routers.notifications import router as notifications_router
 
@@ -54,6 +57,9 @@ async def on_startup():
     """
     init_database()
 
+    # Warm the shared Expo push client so the first notification skips setup
+    await get_push_client()
+
     # Start scheduled jobs for backend operations
     try:
         from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -115,6 +121,7 @@ async def on_shutdown():
     """
     Application shutdown event
     - Stop scheduled jobs gracefully
+    - Close shared HTTP clients, the reconcile worker and the relayer batcher
     """
     if hasattr(app.state, 'scheduler'):
         try:
@@ -123,6 +130,11 @@ async def on_shutdown():
         except Exception as e:
             logger.error(f"Error stopping scheduler: {e}")
 
+    await close_push_client()
+    await reconcile_worker.stop()
+    await reconcile_batcher.stop()
+    await close_relayer_client()
+
 # CORS configuration
 origins = ALLOWED_ORIGINS or [
     "http://localhost:3000",      # React development
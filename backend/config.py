@@ -26,6 +26,10 @@ class Settings:
         self.SUPABASE_PROJECT_REF = os.getenv("SUPABASE_PROJECT_REF", "")  # 项目引用（URL 中的子域名）
         self.SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL", "")
         self.DATABASE_URL = os.getenv("DATABASE_URL", "")
+        # SQLAlchemy pool per worker process; keep workers x (size + overflow)
+        # under the Supabase session pooler's client limit
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
         self.ALLOWED_EMAIL_DOMAIN = os.getenv("ALLOWED_EMAIL_DOMAIN", ".edu.my")
         self.FRONTEND_RESET_URL = os.getenv("FRONTEND_RESET_URL", "http://localhost:3000/reset")
 
@@ -63,12 +67,18 @@ class Settings:
         self.DEFENDER_API_KEY = os.getenv("DEFENDER_API_KEY", "")
         self.DEFENDER_API_SECRET = os.getenv("DEFENDER_API_SECRET", "")
         self.DEFENDER_API_URL = os.getenv("DEFENDER_API_URL", "https://api.defender.openzeppelin.com")
+        # Comma-separated relayer pool; reconcile batches are spread across them
+        self.DEFENDER_RELAYER_IDS = [
+            rid.strip() for rid in os.getenv("DEFENDER_RELAYER_IDS", "unimate-polygon-amoy").split(",") if rid.strip()
+        ]
         self.MAX_PER_MINT = int(os.getenv("MAX_PER_MINT", "10"))
         self.RATE_LIMIT_PER_MIN = int(os.getenv("RATE_LIMIT_PER_MIN", "5"))
 
         # Biconomy Configuration
         self.BICONOMY_PAYMASTER_API_KEY = os.getenv("BICONOMY_PAYMASTER_API_KEY", "")
         self.BICONOMY_BUNDLER_URL = os.getenv("BICONOMY_BUNDLER_URL")
+        # Gasless UserOps (mint/redeem) in flight per process; bursts wait for a slot
+        self.BICONOMY_MAX_CONCURRENCY = int(os.getenv("BICONOMY_MAX_CONCURRENCY", "8"))
         self.CHAIN_ID = int(os.getenv("CHAIN_ID", "80002"))  # Polygon Amoy testnet
 
         # CORS Configuration
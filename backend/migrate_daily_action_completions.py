@@ -0,0 +1,83 @@
+"""
+Database Migration: daily_action_completions
+============================================
+Creates the table award_daily_action_points() uses to decide whether a
+daily action (login, add_task, add_reminder, ...) was already awarded
+today: one row per user, action and Malaysia day, claimed with
+INSERT ... ON CONFLICT DO NOTHING against a unique constraint instead of
+scanning the day's activity_logs.
+
+Backfills today's completions from activity_logs so nothing already
+awarded today is awarded again after the switch.
+
+Usage:
+    python migrate_daily_action_completions.py
+"""
+
+from sqlalchemy import create_engine, text
+from config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Get database URL
+DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
+if not DB_URL:
+    raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
+
+def migrate():
+    """Create daily_action_completions and backfill today's awards"""
+    engine = create_engine(DB_URL)
+
+    try:
+        with engine.connect() as conn:
+            logger.info("🔧 Creating daily_action_completions table...")
+
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS daily_action_completions (
+                    id BIGSERIAL PRIMARY KEY,
+                    profile_id VARCHAR(36) NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+                    action_id VARCHAR(50) NOT NULL,
+                    date VARCHAR(10) NOT NULL,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    CONSTRAINT uq_daily_action_completion UNIQUE (profile_id, action_id, date)
+                )
+            """))
+
+            logger.info("📥 Backfilling today's completions from activity_logs...")
+
+            result = conn.execute(text("""
+                INSERT INTO daily_action_completions (profile_id, action_id, date, created_at)
+                SELECT
+                    profile_id,
+                    substring(details->>'source' FROM 14),
+                    to_char(created_at AT TIME ZONE 'Asia/Kuala_Lumpur', 'YYYY-MM-DD'),
+                    MIN(created_at)
+                FROM activity_logs
+                WHERE activity_type = 'points_earned'
+                  AND details->>'source' LIKE 'daily\\_action\\_%'
+                  AND created_at >= date_trunc('day', NOW() AT TIME ZONE 'Asia/Kuala_Lumpur') AT TIME ZONE 'Asia/Kuala_Lumpur'
+                GROUP BY 1, 2, 3
+                ON CONFLICT ON CONSTRAINT uq_daily_action_completion DO NOTHING
+            """))
+
+            conn.commit()
+
+            logger.info("✅ Migration completed successfully!")
+            logger.info("   - Added daily_action_completions (unique per user/action/day)")
+            logger.info(f"   - Backfilled {result.rowcount} completions from today's activity logs")
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting daily action completions migration...")
+    logger.info(f"Database: {DB_URL.split('@')[1] if '@' in DB_URL else 'local'}")
+
+    confirm = input("\nProceed with migration? (yes/no): ")
+    if confirm.lower() in ['yes', 'y']:
+        migrate()
+    else:
+        logger.info("Migration cancelled")
@@ -0,0 +1,55 @@
+"""
+Database Migration: Case-insensitive profile email index
+========================================================
+Adds an expression index on lower(profiles.email), so the emergency alert
+task can match trusted contacts to UniMate accounts with
+lower(email) IN (...) without a sequential scan of profiles.
+
+Built CONCURRENTLY so profiles stays writable while it runs.
+
+Usage:
+    python migrate_profile_email_lower_index.py
+"""
+
+from sqlalchemy import create_engine, text
+from config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Get database URL
+DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
+if not DB_URL:
+    raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
+
+def migrate():
+    """Create the lower(email) index on profiles"""
+    engine = create_engine(DB_URL)
+
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            logger.info("📑 Creating idx_profiles_email_lower...")
+
+            conn.execute(text("""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_profiles_email_lower
+                ON profiles(lower(email))
+            """))
+
+            logger.info("✅ Migration completed successfully!")
+            logger.info("   - Added lower(email) index for trusted contact matching")
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting profile email index migration...")
+    logger.info(f"Database: {DB_URL.split('@')[1] if '@' in DB_URL else 'local'}")
+
+    confirm = input("\nProceed with migration? (yes/no): ")
+    if confirm.lower() in ['yes', 'y']:
+        migrate()
+    else:
+        logger.info("Migration cancelled")
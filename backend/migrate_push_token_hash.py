@@ -0,0 +1,82 @@
+"""
+Database Migration: Hash-keyed push_tokens
+==========================================
+Adds push_tokens.push_token_hash (generated BIGINT from md5(push_token)) and
+moves the unique index / register-token UPSERT target onto it, so the
+conflict check walks an 8-byte key instead of the full Expo token text.
+
+Run this once after migrate_push_tokens.py.
+
+Usage:
+    python migrate_push_token_hash.py
+"""
+
+from sqlalchemy import create_engine, text
+from config import settings
+from models import PUSH_TOKEN_HASH_SQL
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Get database URL
+DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
+if not DB_URL:
+    raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
+
+def migrate():
+    """Add push_token_hash and re-key the unique index on it"""
+    engine = create_engine(DB_URL)
+
+    try:
+        with engine.connect() as conn:
+            logger.info("🔧 Adding push_token_hash column...")
+
+            conn.execute(text(f"""
+                ALTER TABLE push_tokens
+                ADD COLUMN IF NOT EXISTS push_token_hash BIGINT
+                GENERATED ALWAYS AS {PUSH_TOKEN_HASH_SQL} STORED
+            """))
+
+            logger.info("📑 Creating unique index on push_token_hash...")
+
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_push_tokens_push_token_hash
+                ON push_tokens(push_token_hash)
+            """))
+
+            # push_token stays as plain stored text; drop its unique constraint and index
+            logger.info("🧹 Dropping full-text push_token indexes...")
+
+            conn.execute(text("""
+                ALTER TABLE push_tokens
+                DROP CONSTRAINT IF EXISTS push_tokens_push_token_key
+            """))
+
+            conn.execute(text("""
+                DROP INDEX IF EXISTS idx_push_tokens_push_token
+            """))
+
+            conn.execute(text("""
+                DROP INDEX IF EXISTS ix_push_tokens_push_token
+            """))
+
+            conn.commit()
+
+            logger.info("✅ Migration completed successfully!")
+            logger.info("   - Added push_token_hash generated column")
+            logger.info("   - Unique index now on push_token_hash")
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting push_token_hash migration...")
+    logger.info(f"Database: {DB_URL.split('@')[1] if '@' in DB_URL else 'local'}")
+
+    confirm = input("\nProceed with migration? (yes/no): ")
+    if confirm.lower() in ['yes', 'y']:
+        migrate()
+    else:
+        logger.info("Migration cancelled")
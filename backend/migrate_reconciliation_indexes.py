@@ -0,0 +1,57 @@
+"""
+Database Migration: Reconciliation indexes
+==========================================
+Adds a partial index on user_points covering only users with unreconciled
+points, so the pending-reconciliation queries (/reconciliation/status,
+/trigger and the daily job) scan just the pending rows and join them to
+smart_account_info through its existing unique index on user_id.
+
+Built CONCURRENTLY so user_points stays writable while it runs.
+
+Usage:
+    python migrate_reconciliation_indexes.py
+"""
+
+from sqlalchemy import create_engine, text
+from config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Get database URL
+DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
+if not DB_URL:
+    raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
+
+def migrate():
+    """Create the pending-reconciliation partial index"""
+    engine = create_engine(DB_URL)
+
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            logger.info("📑 Creating idx_user_points_pending...")
+
+            conn.execute(text("""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_points_pending
+                ON user_points(profile_id)
+                WHERE total_points > points_reconciled
+            """))
+
+            logger.info("✅ Migration completed successfully!")
+            logger.info("   - Added partial index for pending reconciliations")
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting reconciliation index migration...")
+    logger.info(f"Database: {DB_URL.split('@')[1] if '@' in DB_URL else 'local'}")
+
+    confirm = input("\nProceed with migration? (yes/no): ")
+    if confirm.lower() in ['yes', 'y']:
+        migrate()
+    else:
+        logger.info("Migration cancelled")
@@ -0,0 +1,101 @@
+"""
+Database Migration: get_user_points_summary() RPC
+=================================================
+Creates a SQL function returning everything the Supabase fallback of
+GET /rewards/points needs for one user and one Malaysia day in a single
+round-trip: the user_points total, points of challenges completed in the
+day and since the start of the week (wellness_challenges.points_reward),
+and the number of tasks and reminders created in the day.
+
+Written against the models.py schema: user_challenges is keyed by
+profile_id and stores completed_at as a BIGINT epoch, so it is converted
+with to_timestamp() before comparing with the TIMESTAMPTZ bounds.
+
+Called via supabase.rpc("get_user_points_summary", {...}) instead of two
+REST queries plus a separate SQLAlchemy session.
+
+Usage:
+    python migrate_user_points_summary.py
+"""
+
+from sqlalchemy import create_engine, text
+from config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Get database URL
+DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
+if not DB_URL:
+    raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
+
+def migrate():
+    """Create (or replace) get_user_points_summary"""
+    engine = create_engine(DB_URL)
+
+    try:
+        with engine.connect() as conn:
+            logger.info("🔧 Creating get_user_points_summary()...")
+
+            conn.execute(text("""
+                CREATE OR REPLACE FUNCTION get_user_points_summary(
+                    p_user_id TEXT,
+                    day_start TIMESTAMPTZ,
+                    day_end TIMESTAMPTZ,
+                    week_start TIMESTAMPTZ
+                )
+                RETURNS TABLE (
+                    total_points BIGINT,
+                    challenges_today BIGINT,
+                    challenges_this_week BIGINT,
+                    task_count_today BIGINT,
+                    reminder_count_today BIGINT
+                )
+                LANGUAGE sql STABLE
+                AS $$
+                    SELECT
+                        (SELECT COALESCE(MAX(total_points), 0) FROM user_points
+                         WHERE profile_id = p_user_id)::BIGINT,
+                        c.today,
+                        c.week,
+                        (SELECT COUNT(*) FROM tasks
+                         WHERE user_id = p_user_id
+                           AND created_at >= day_start AND created_at < day_end),
+                        (SELECT COUNT(*) FROM reminders
+                         WHERE user_id = p_user_id
+                           AND created_at >= day_start AND created_at < day_end)
+                    FROM (
+                        SELECT
+                            COALESCE(SUM(wc.points_reward) FILTER (
+                                WHERE to_timestamp(uc.completed_at) >= day_start
+                            ), 0)::BIGINT AS today,
+                            COALESCE(SUM(wc.points_reward), 0)::BIGINT AS week
+                        FROM user_challenges uc
+                        JOIN wellness_challenges wc ON wc.id = uc.challenge_id
+                        WHERE uc.profile_id = p_user_id
+                          AND uc.status = 'completed'
+                          AND to_timestamp(uc.completed_at) >= LEAST(week_start, day_start)
+                          AND to_timestamp(uc.completed_at) < day_end
+                    ) c
+                $$
+            """))
+
+            conn.commit()
+
+            logger.info("✅ Migration completed successfully!")
+            logger.info("   - Added get_user_points_summary(user_id, day_start, day_end, week_start)")
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting user points summary migration...")
+    logger.info(f"Database: {DB_URL.split('@')[1] if '@' in DB_URL else 'local'}")
+
+    confirm = input("\nProceed with migration? (yes/no): ")
+    if confirm.lower() in ['yes', 'y']:
+        migrate()
+    else:
+        logger.info("Migration cancelled")
@@ -8,18 +8,19 @@ of truth for the database schema.
 
 Tables:
 - Core User Management: profiles, tasks, reminders
-- Emergency & Wellness: trusted_contacts, emergency_alerts, wellness_checkins
+- Emergency & Wellness: trusted_contacts, emergency_alerts, emergency_notifications, wellness_checkins
 - Blockchain: user_operations, vouchers, smart_account_info
-- Rewards & Challenges: wellness_challenges, user_challenges, user_points
+- Rewards & Challenges: wellness_challenges, user_challenges, user_points, daily_action_completions
 - Vouchers & Rewards: vouchers_catalog, user_vouchers
 - Activity Tracking: activity_logs
 """
 
-from sqlalchemy import create_engine, Column, String, BigInteger, Text, DateTime, Boolean, Integer, ForeignKey, DECIMAL, JSON, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy import create_engine, Column, String, BigInteger, Text, DateTime, Boolean, Integer, ForeignKey, DECIMAL, JSON, Enum as SQLEnum, UniqueConstraint, Index, Computed
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.sql import text
 from datetime import datetime
+import hashlib
 import logging
 
 from config import settings
@@ -31,7 +32,11 @@ DB_URL = settings.SUPABASE_DB_URL or settings.DATABASE_URL
 if not DB_URL:
     raise RuntimeError("Set SUPABASE_DB_URL or DATABASE_URL in .env")
 
-engine = create_engine(DB_URL, echo=False, future=True, pool_pre_ping=True)
+# pool_recycle retires connections before the Supabase pooler drops idle ones
+engine = create_engine(
+    DB_URL, echo=False, future=True, pool_pre_ping=True, pool_recycle=1800,
+    pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
+)
 Base = declarative_base()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -43,6 +48,11 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 class Profile(Base):
     """User profiles - stores personal and medical information"""
     __tablename__ = "profiles"
+    __table_args__ = (
+        # Trusted contacts are matched to profiles case-insensitively
+        # (same definition as migrate_profile_email_lower_index.py)
+        Index('idx_profiles_email_lower', text('lower(email)')),
+    )
 
     id = Column(String, primary_key=True)  # UUID from Supabase auth
     name = Column(String(60), nullable=False)
@@ -128,13 +138,30 @@ class Reminder(Base):
     owner = relationship("Profile", back_populates="reminders")
 
 
+# Server-side definition of PushToken.push_token_hash: first 8 bytes of md5 as a signed bigint
+PUSH_TOKEN_HASH_SQL = "(('x' || substr(md5(push_token), 1, 16))::bit(64)::bigint)"
+
+
+def push_token_hash(push_token: str) -> int:
+    """Python mirror of PUSH_TOKEN_HASH_SQL, for lookups by push_token_hash"""
+    value = int(hashlib.md5(push_token.encode()).hexdigest()[:16], 16)
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
 class PushToken(Base):
     """Push notification tokens for mobile devices"""
     __tablename__ = "push_tokens"
+    __table_args__ = (
+        # Every lookup is "active tokens for this profile"; partial index keeps
+        # deactivated rows out of it (same definition as migrate_push_tokens.py)
+        Index('idx_push_tokens_active', 'profile_id', 'is_active', postgresql_where=text("is_active = TRUE")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     profile_id = Column(String, ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False, index=True)
-    push_token = Column(String(255), nullable=False, unique=True, index=True)  # Expo push token
+    push_token = Column(String(255), nullable=False)  # Expo push token
+    # 8-byte key for the unique index / UPSERT target instead of the full token text
+    push_token_hash = Column(BigInteger, Computed(PUSH_TOKEN_HASH_SQL, persisted=True), nullable=False, unique=True)
     device_type = Column(String(20))  # 'ios' or 'android'
     device_name = Column(String(100))  # Optional: Device model/name
     is_active = Column(Boolean, nullable=False, default=True)
@@ -187,6 +214,22 @@ class EmergencyAlert(Base):
 
     # Relationships
     user = relationship("Profile", back_populates="emergency_alerts")
+    notifications = relationship("EmergencyNotification", back_populates="alert", cascade="all, delete-orphan")
+
+
+class EmergencyNotification(Base):
+    """Per-contact delivery record for an emergency alert"""
+    __tablename__ = "emergency_notifications"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("emergency_alerts.id", ondelete="CASCADE"), nullable=False, index=True)
+    contact_id = Column(UUID(as_uuid=True), ForeignKey("trusted_contacts.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending, sent, failed
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("NOW()"))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=text("NOW()"))
+
+    # Relationships
+    alert = relationship("EmergencyAlert", back_populates="notifications")
 
 
 class WellnessCheckin(Base):
@@ -295,6 +338,11 @@ class UserChallenge(Base):
 class UserPoints(Base):
     """User points balance and daily tracking with reconciliation support"""
     __tablename__ = "user_points"
+    __table_args__ = (
+        # Reconciliation scans "total_points > points_reconciled"; the partial index
+        # only holds pending users (same definition as migrate_reconciliation_indexes.py)
+        Index('idx_user_points_pending', 'profile_id', postgresql_where=text("total_points > points_reconciled")),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     profile_id = Column(String(36), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
@@ -312,6 +360,21 @@ class UserPoints(Base):
     profile = relationship("Profile", back_populates="user_points")
 
 
+class DailyActionCompletion(Base):
+    """Daily actions already awarded (login, add_task, ...), one row per user/action/Malaysia day"""
+    __tablename__ = "daily_action_completions"
+    __table_args__ = (
+        # Claimed with INSERT ... ON CONFLICT DO NOTHING; no row inserted = already awarded today
+        UniqueConstraint('profile_id', 'action_id', 'date', name='uq_daily_action_completion'),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    profile_id = Column(String(36), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    action_id = Column(String(50), nullable=False)
+    date = Column(String(10), nullable=False)  # YYYY-MM-DD format (Malaysia day)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("NOW()"))
+
+
 # ===================================================================
 # SMART ACCOUNT MANAGEMENT MODELS
 # ===================================================================
@@ -38,7 +38,12 @@ DEMO_USER_PK = os.getenv("DEMO_USER_PRIVATE_KEY", "")
 DEMO_USER_ADDR = os.getenv("DEMO_USER_ADDRESS", "")
 DB_URL = settings.SUPABASE_DB_URL
 
+# HMAC for request signatures, keyed once at import; each sign/verify
+# copies it instead of re-deriving the HMAC pads
+_api_hmac = hmac.new(API_SECRET.encode(), digestmod=hashlib.sha256)
+
 from routers.core_supabase import get_authenticated_user
+from services.points_cache import invalidate_points
 from models import db, SmartAccountInfo
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -789,8 +794,9 @@ def check_idempotent(key: str):
 
 def verify_sig(msg: str, sig_hex: str) -> bool:
     """Verify HMAC signature for request authentication"""
-    mac = hmac.new(API_SECRET.encode(), msg.encode(), hashlib.sha256).hexdigest()
-    return hmac.compare_digest(mac, sig_hex)
+    mac = _api_hmac.copy()
+    mac.update(msg.encode())
+    return hmac.compare_digest(mac.hexdigest(), sig_hex)
 
 # Health Check System
 class ServiceHealth(str, Enum):
@@ -2175,15 +2181,11 @@ async def aa_wellness_redeem(body: WellnessRedeemBody, http_request: Request):
 
         # Create signature for batch transaction
         # Format: smart_account_address|calls_data|chain_id|timestamp
-        import hmac
-        import hashlib
         calls_str = "|".join([f"{call.to}:{call.data}:{call.value}" for call in calls])
         batch_raw = f"{body.smart_account_address}|{calls_str}|80002|{body.ts}"
-        batch_sig = hmac.new(
-            API_SECRET.encode(),
-            batch_raw.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        batch_mac = _api_hmac.copy()
+        batch_mac.update(batch_raw.encode())
+        batch_sig = batch_mac.hexdigest()
 
         # Execute batch
         batch_request = BatchExecuteRequest(
@@ -3415,6 +3417,7 @@ async def complete_challenge(
             session.add(user_points)
 
         session.commit()
+        invalidate_points(user.user_id)
 
         return {
             "message": f"Challenge '{challenge.name}' completed successfully!",
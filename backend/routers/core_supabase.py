@@ -5,23 +5,46 @@ Provides shared authentication dependencies and utilities.
 
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer
+from cachetools import TTLCache
 from typing import Dict, Any
+import hashlib
 import logging
+import time
 
 from services.supabase_client import supabase_service
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Verified users keyed by token digest, so repeat requests skip JWT verification.
+# Entries never outlive the token's own exp claim (checked on every hit).
+_auth_cache = TTLCache(maxsize=10000, ttl=60)
+
+def _token_key(credentials: str) -> bytes:
+    return hashlib.blake2b(credentials.encode(), digest_size=16).digest()
+
+def forget_authenticated_user(credentials: str) -> None:
+    """Drop a token from the auth cache (e.g. on logout)."""
+    _auth_cache.pop(_token_key(credentials), None)
+
 async def get_authenticated_user(token: str = Depends(security)) -> Dict[str, Any]:
     """Get current authenticated user from Supabase JWT token."""
+    key = _token_key(token.credentials)
+    cached = _auth_cache.get(key)
+    if cached is not None:
+        user_info, exp = cached
+        if exp is None or exp > time.time():
+            return dict(user_info)
+        _auth_cache.pop(key, None)
+
     try:
         user_info = await supabase_service.verify_jwt_token(token.credentials)
         if not user_info or "sub" not in user_info:
             raise HTTPException(status_code=401, detail="Invalid token")
         # Add the raw token to the user info for service calls
         user_info["token"] = token.credentials
-        return user_info
+        _auth_cache[key] = (user_info, user_info["claims"].get("exp"))
+        return dict(user_info)
     except Exception as e:
         logger.error(f"Authentication failed: {e}")
         raise HTTPException(status_code=401, detail="Authentication failed")
@@ -6,14 +6,18 @@ MIGRATED TO SQLALCHEMY for better performance (10-20x faster than REST API)
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+import asyncio
 import logging
 from enum import Enum
+from sqlalchemy import select, insert, update, delete, func
 
-from models import db, TrustedContact as TrustedContactModel, EmergencyAlert as EmergencyAlertModel, WellnessCheckin as WellnessCheckinModel, Profile as ProfileModel
+from models import db, TrustedContact as TrustedContactModel, EmergencyAlert as EmergencyAlertModel, EmergencyNotification as EmergencyNotificationModel, WellnessCheckin as WellnessCheckinModel, Profile as ProfileModel
 from routers.core_supabase import get_authenticated_user
+from services.push_notifications import broadcast_push
 
 router = APIRouter(prefix="/lighthouse", tags=["lighthouse"])
 logger = logging.getLogger("unimate-lighthouse")
@@ -48,6 +52,9 @@ class WellnessStatus(str, Enum):
 
 # --- Schemas ---
 
+# Shared by create/update schemas; Pydantic compiles it once at class build time
+PHONE_PATTERN = r"^[+]?[0-9\s()-]+$"
+
 class LocationData(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
@@ -56,7 +63,7 @@ class LocationData(BaseModel):
 
 class TrustedContactBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
-    phone: str = Field(..., pattern="^[+]?[0-9\\s()-]+$", max_length=20)
+    phone: str = Field(..., pattern=PHONE_PATTERN, max_length=20)
     email: Optional[str] = None
     relation: ContactRelation
     is_primary: bool = False
@@ -67,7 +74,7 @@ class TrustedContactCreate(TrustedContactBase):
 
 class TrustedContactUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    phone: Optional[str] = Field(None, pattern="^[+]?[0-9\\s()-]+$", max_length=20)
+    phone: Optional[str] = Field(None, pattern=PHONE_PATTERN, max_length=20)
     email: Optional[str] = None
     relation: Optional[ContactRelation] = None
     is_primary: Optional[bool] = None
@@ -139,6 +146,102 @@ class EmergencyResource(BaseModel):
     is_local: bool = False
 
 
+# --- Emergency Notifications ---
+
+def _set_notification_status(session, alert_id, contact_ids: List[Any], status: str):
+    """Set the delivery status for a group of contacts with one UPDATE."""
+    if not contact_ids:
+        return
+    session.execute(
+        update(EmergencyNotificationModel)
+        .where(
+            EmergencyNotificationModel.alert_id == alert_id,
+            EmergencyNotificationModel.contact_id.in_(contact_ids)
+        )
+        .values(status=status, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _record_pending_notifications(session, alert_id, contacts: List[tuple]) -> Dict[Any, Any]:
+    """
+    Insert a 'pending' delivery row per contact and match contacts to
+    UniMate profiles by email (case-insensitive).
+
+    Returns {profile_id: contact_id} for contacts that have an account.
+    """
+    # One multi-row INSERT regardless of how many contacts the user has
+    session.execute(
+        insert(EmergencyNotificationModel).values([
+            {"alert_id": alert_id, "contact_id": contact_id, "status": "pending"}
+            for contact_id, _ in contacts
+        ])
+    )
+    session.commit()
+
+    contact_by_email = {email.lower(): contact_id for contact_id, email in contacts if email}
+    if not contact_by_email:
+        return {}
+
+    linked_profiles = session.execute(
+        select(ProfileModel.id, ProfileModel.email)
+        .where(func.lower(ProfileModel.email).in_(list(contact_by_email)))
+    ).all()
+    return {profile_id: contact_by_email[email.lower()] for profile_id, email in linked_profiles}
+
+
+def _record_delivery(session, alert_id, sent: List[Any], failed: List[Any]):
+    """Mark delivered and failed contacts in one transaction."""
+    _set_notification_status(session, alert_id, sent, "sent")
+    _set_notification_status(session, alert_id, failed, "failed")
+    session.commit()
+
+
+async def send_emergency_notifications(alert_id, contacts: List[tuple], message: str):
+    """
+    Background task: record a delivery row per trusted contact and push the
+    alert to contacts who have a UniMate account (matched by email).
+
+    Contacts without an account stay 'pending' for an SMS/email channel.
+    The session is synchronous, so its work runs via asyncio.to_thread and
+    only the push itself is awaited on the event loop.
+    """
+    if not contacts:
+        return
+
+    session = db()
+    try:
+        contact_by_profile = await asyncio.to_thread(_record_pending_notifications, session, alert_id, contacts)
+        if not contact_by_profile:
+            return
+
+        # One token query and one Expo POST per 100 devices for all linked contacts
+        delivered_by_profile = await broadcast_push(
+            session,
+            list(contact_by_profile),
+            title="🚨 Emergency Alert",
+            body=message,
+            data={"type": "emergency_alert", "alert_id": str(alert_id), "screen": "Lighthouse"}
+        )
+
+        delivered = {
+            contact_by_profile[profile_id]
+            for profile_id, ok in delivered_by_profile.items() if ok
+        }
+        sent = list(delivered)
+        failed = list(set(contact_by_profile.values()) - delivered)
+
+        await asyncio.to_thread(_record_delivery, session, alert_id, sent, failed)
+
+        logger.info("Emergency alert %s: %s contact(s) notified, %s failed", alert_id, len(sent), len(failed))
+
+    except Exception as e:
+        await asyncio.to_thread(session.rollback)
+        logger.error("Failed to send emergency notifications for alert %s: %s", alert_id, e)
+    finally:
+        await asyncio.to_thread(session.close)
+
+
 # --- Emergency Endpoints ---
 
 @router.post("/emergency", response_model=EmergencyAlert)
@@ -153,9 +256,12 @@ def trigger_emergency_alert(
         user_id = user["sub"]
         now = datetime.utcnow()
 
-        # Get user's medical conditions from profile
-        profile = session.query(ProfileModel).filter(ProfileModel.id == user_id).first()
-        medical_info = emergency.medical_conditions or (profile.emergency_conditions if profile else None)
+        # Fall back to the profile's medical conditions (only that column is fetched)
+        medical_info = emergency.medical_conditions
+        if not medical_info:
+            medical_info = session.execute(
+                select(ProfileModel.emergency_conditions).where(ProfileModel.id == user_id)
+            ).scalar_one_or_none()
 
         # Create emergency alert
         alert = EmergencyAlertModel(
@@ -172,47 +278,58 @@ def trigger_emergency_alert(
         )
 
         session.add(alert)
-        session.commit()
-        session.refresh(alert)
+        session.flush()  # assigns alert.id; committed together with contacts_notified below
+        alert_id = alert.id
 
         # Get trusted contacts for notification
+        contact_list = []
+        contact_targets = []
         if emergency.notify_contacts:
             contacts = session.query(TrustedContactModel).filter(
                 TrustedContactModel.user_id == user_id
             ).all()
 
             contact_list = [c.phone for c in contacts]
+            contact_targets = [(c.id, c.email) for c in contacts]
             alert.contacts_notified = contact_list
-            session.commit()
-
-            # TODO: Send actual notifications via background task
-            # background_tasks.add_task(send_emergency_notifications, alert, contacts)
-
-        logger.info(f"Emergency alert created: {alert.id} for user {user_id}")
-        return EmergencyAlert(
-            id=str(alert.id),
-            user_id=alert.user_id,
-            emergency_type=EmergencyType(alert.emergency_type),
-            priority=EmergencyPriority(alert.priority),
-            message=alert.message,
-            location=LocationData(**alert.location) if alert.location else None,
-            status=alert.status,
-            contacts_notified=alert.contacts_notified or [],
-            authorities_notified=alert.authorities_notified,
-            medical_conditions=alert.medical_conditions,
-            created_at=alert.created_at,
-            resolved_at=alert.resolved_at
+
+        session.commit()
+
+        if contact_targets:
+            background_tasks.add_task(
+                send_emergency_notifications,
+                alert_id,
+                contact_targets,
+                emergency.message
+            )
+
+        logger.info("Emergency alert created: %s for user %s", alert_id, user_id)
+        # Every field is server-generated or already validated on the request,
+        # so skip a second validation pass (and a post-commit refresh)
+        return EmergencyAlert.model_construct(
+            id=str(alert_id),
+            user_id=user_id,
+            emergency_type=emergency.emergency_type,
+            priority=emergency.priority,
+            message=emergency.message,
+            location=emergency.location,
+            status="active",
+            contacts_notified=contact_list,
+            authorities_notified=emergency.notify_authorities,
+            medical_conditions=medical_info,
+            created_at=now,
+            resolved_at=None
         )
 
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to create emergency alert: {e}")
+        logger.error("Failed to create emergency alert: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create emergency alert")
     finally:
         session.close()
 
 
-@router.get("/emergency", response_model=List[EmergencyAlert])
+@router.get("/emergency", response_model=List[EmergencyAlert], response_class=ORJSONResponse)
 def get_emergency_alerts(
     status: Optional[str] = Query(None, regex="^(active|resolved|cancelled)$"),
     user: Dict[str, Any] = Depends(get_authenticated_user)
@@ -229,26 +346,28 @@ def get_emergency_alerts(
 
         alerts = query.order_by(EmergencyAlertModel.created_at.desc()).all()
 
+        # Plain dicts, validated and filtered against response_model by FastAPI,
+        # then rendered by orjson (response_class)
         return [
-            EmergencyAlert(
-                id=str(a.id),
-                user_id=a.user_id,
-                emergency_type=EmergencyType(a.emergency_type),
-                priority=EmergencyPriority(a.priority),
-                message=a.message,
-                location=LocationData(**a.location) if a.location else None,
-                status=a.status,
-                contacts_notified=a.contacts_notified or [],
-                authorities_notified=a.authorities_notified,
-                medical_conditions=a.medical_conditions,
-                created_at=a.created_at,
-                resolved_at=a.resolved_at
-            )
+            {
+                "id": str(a.id),
+                "user_id": a.user_id,
+                "emergency_type": a.emergency_type,
+                "priority": a.priority,
+                "message": a.message,
+                "location": a.location or None,
+                "status": a.status,
+                "contacts_notified": a.contacts_notified or [],
+                "authorities_notified": a.authorities_notified,
+                "medical_conditions": a.medical_conditions,
+                "created_at": a.created_at,
+                "resolved_at": a.resolved_at
+            }
             for a in alerts
         ]
 
     except Exception as e:
-        logger.error(f"Failed to get emergency alerts: {e}")
+        logger.error("Failed to get emergency alerts: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve alerts")
     finally:
         session.close()
@@ -264,26 +383,29 @@ def resolve_emergency_alert(
     try:
         user_id = user["sub"]
 
-        alert = session.query(EmergencyAlertModel).filter(
-            EmergencyAlertModel.id == alert_id,
-            EmergencyAlertModel.user_id == user_id
-        ).first()
-
-        if not alert:
+        # Single UPDATE ... RETURNING: ownership check and write in one round-trip
+        stmt = (
+            update(EmergencyAlertModel)
+            .where(
+                EmergencyAlertModel.id == alert_id,
+                EmergencyAlertModel.user_id == user_id
+            )
+            .values(status="resolved", resolved_at=func.now())
+            .returning(EmergencyAlertModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        if session.execute(stmt).first() is None:
             raise HTTPException(status_code=404, detail="Alert not found")
-
-        alert.status = "resolved"
-        alert.resolved_at = datetime.utcnow()
         session.commit()
 
-        logger.info(f"Resolved emergency alert {alert_id}")
+        logger.info("Resolved emergency alert %s", alert_id)
         return {"message": "Alert resolved successfully", "alert_id": alert_id}
 
     except HTTPException:
         raise
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to resolve alert: {e}")
+        logger.error("Failed to resolve alert: %s", e)
         raise HTTPException(status_code=500, detail="Failed to resolve alert")
     finally:
         session.close()
@@ -303,7 +425,7 @@ def get_trusted_contacts(user: Dict[str, Any] = Depends(get_authenticated_user))
         ).order_by(TrustedContactModel.is_primary.desc(), TrustedContactModel.created_at).all()
 
         return [
-            TrustedContact(
+            TrustedContact.model_construct(
                 id=str(c.id),
                 user_id=c.user_id,
                 name=c.name,
@@ -319,7 +441,7 @@ def get_trusted_contacts(user: Dict[str, Any] = Depends(get_authenticated_user))
         ]
 
     except Exception as e:
-        logger.error(f"Failed to get trusted contacts: {e}")
+        logger.error("Failed to get trusted contacts: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve contacts")
     finally:
         session.close()
@@ -349,26 +471,28 @@ def create_trusted_contact(
         )
 
         session.add(new_contact)
-        session.commit()
-        session.refresh(new_contact)
+        session.flush()  # assigns new_contact.id
 
-        logger.info(f"Created trusted contact for user {user_id}")
-        return TrustedContact(
+        result = TrustedContact.model_construct(
             id=str(new_contact.id),
-            user_id=new_contact.user_id,
-            name=new_contact.name,
-            phone=new_contact.phone,
-            email=new_contact.email,
-            relation=ContactRelation(new_contact.relation),
-            is_primary=new_contact.is_primary,
-            notes=new_contact.notes,
-            created_at=new_contact.created_at,
-            updated_at=new_contact.updated_at
+            user_id=user_id,
+            name=contact.name,
+            phone=contact.phone,
+            email=contact.email,
+            relation=contact.relation,
+            is_primary=contact.is_primary,
+            notes=contact.notes,
+            created_at=now,
+            updated_at=now
         )
+        session.commit()
+
+        logger.info("Created trusted contact for user %s", user_id)
+        return result
 
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to create contact: {e}")
+        logger.error("Failed to create contact: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create contact")
     finally:
         session.close()
@@ -385,34 +509,30 @@ def update_trusted_contact(
     try:
         user_id = user["sub"]
 
-        contact = session.query(TrustedContactModel).filter(
-            TrustedContactModel.id == contact_id,
-            TrustedContactModel.user_id == user_id
-        ).first()
+        # Only fields the client actually sent (nulls still mean "leave unchanged")
+        values = contact_update.model_dump(exclude_unset=True, exclude_none=True)
+        if "relation" in values:
+            values["relation"] = ContactRelation(values["relation"]).value
+        values["updated_at"] = func.now()
+
+        # Single UPDATE ... RETURNING instead of SELECT + dirty-tracked flush + refresh
+        stmt = (
+            update(TrustedContactModel)
+            .where(
+                TrustedContactModel.id == contact_id,
+                TrustedContactModel.user_id == user_id
+            )
+            .values(**values)
+            .returning(TrustedContactModel)
+            .execution_options(synchronize_session=False)
+        )
+        contact = session.execute(stmt).scalar_one_or_none()
 
         if not contact:
             raise HTTPException(status_code=404, detail="Contact not found")
 
-        # Update fields
-        if contact_update.name is not None:
-            contact.name = contact_update.name
-        if contact_update.phone is not None:
-            contact.phone = contact_update.phone
-        if contact_update.email is not None:
-            contact.email = contact_update.email
-        if contact_update.relation is not None:
-            contact.relation = contact_update.relation.value
-        if contact_update.is_primary is not None:
-            contact.is_primary = contact_update.is_primary
-        if contact_update.notes is not None:
-            contact.notes = contact_update.notes
-
-        contact.updated_at = datetime.utcnow()
-        session.commit()
-        session.refresh(contact)
-
-        logger.info(f"Updated contact {contact_id}")
-        return TrustedContact(
+        # Build the response from the RETURNING row before commit expires it
+        result = TrustedContact.model_construct(
             id=str(contact.id),
             user_id=contact.user_id,
             name=contact.name,
@@ -424,12 +544,16 @@ def update_trusted_contact(
             created_at=contact.created_at,
             updated_at=contact.updated_at
         )
+        session.commit()
+
+        logger.info("Updated contact %s", contact_id)
+        return result
 
     except HTTPException:
         raise
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to update contact: {e}")
+        logger.error("Failed to update contact: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update contact")
     finally:
         session.close()
@@ -445,25 +569,27 @@ def delete_trusted_contact(
     try:
         user_id = user["sub"]
 
-        contact = session.query(TrustedContactModel).filter(
-            TrustedContactModel.id == contact_id,
-            TrustedContactModel.user_id == user_id
-        ).first()
-
-        if not contact:
+        stmt = (
+            delete(TrustedContactModel)
+            .where(
+                TrustedContactModel.id == contact_id,
+                TrustedContactModel.user_id == user_id
+            )
+            .returning(TrustedContactModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        if session.execute(stmt).first() is None:
             raise HTTPException(status_code=404, detail="Contact not found")
-
-        session.delete(contact)
         session.commit()
 
-        logger.info(f"Deleted contact {contact_id}")
+        logger.info("Deleted contact %s", contact_id)
         return {"message": "Contact deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to delete contact: {e}")
+        logger.error("Failed to delete contact: %s", e)
         raise HTTPException(status_code=500, detail="Failed to delete contact")
     finally:
         session.close()
@@ -499,7 +625,7 @@ def create_wellness_checkin(
         session.commit()
         session.refresh(new_checkin)
 
-        logger.info(f"Created wellness check-in for user {user_id}: mood={checkin.mood}, stress={checkin.stress_level}")
+        logger.info("Created wellness check-in for user %s: mood=%s, stress=%s", user_id, checkin.mood, checkin.stress_level)
 
         # Return plain dict to avoid Pydantic validation issues
         return {
@@ -516,13 +642,13 @@ def create_wellness_checkin(
 
     except Exception as e:
         session.rollback()
-        logger.error(f"Failed to create wellness check-in: {e}")
+        logger.error("Failed to create wellness check-in: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create check-in")
     finally:
         session.close()
 
 
-@router.get("/wellness-history")
+@router.get("/wellness-history", response_class=ORJSONResponse)
 def get_wellness_history(
     days: int = Query(30, ge=1, le=365),
     user: Dict[str, Any] = Depends(get_authenticated_user)
@@ -546,17 +672,17 @@ def get_wellness_history(
                 "sleep_hours": float(c.sleep_hours) if c.sleep_hours else None,
                 "notes": c.notes,
                 "location": c.location,
-                "timestamp": c.timestamp.isoformat() if c.timestamp else None,
-                "created_at": c.created_at.isoformat() if c.created_at else None
+                "timestamp": c.timestamp,
+                "created_at": c.created_at
             }
             for c in checkins
         ]
 
-        logger.info(f"Retrieved {len(result)} wellness check-ins for user {user_id}")
-        return result
+        logger.info("Retrieved %s wellness check-ins for user %s", len(result), user_id)
+        return ORJSONResponse(result)
 
     except Exception as e:
-        logger.error(f"Failed to get wellness history: {e}")
+        logger.error("Failed to get wellness history: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve history")
     finally:
         session.close()
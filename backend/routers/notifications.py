@@ -10,27 +10,50 @@ Endpoints:
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
-from models import db, PushToken, Profile
-from routers.core_supabase import get_authenticated_user
-from services.push_notifications import send_push_notification
+from pydantic import BaseModel, validator
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, Literal
+from cachetools import TTLCache
+from models import get_db, PushToken, Profile, push_token_hash
+from routers.core_supabase import get_authenticated_user, forget_authenticated_user
+from services.push_notifications import send_batch_notifications, single_flight, expo_retry_after
+from services.pushtoken_cache import get_active_tokens, invalidate_active_tokens, prune_dead_tokens
+from services.redis_service import get_redis_client
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/notifications", tags=["Push Notifications"])
 
+TEST_NOTIFICATIONS_PER_MINUTE = 5
+
+# Last test-notification response per (user_id, title, body); a repeat press
+# within the window gets it back without another DB + Expo round-trip
+_recent_test_results = TTLCache(maxsize=10000, ttl=30)
+
 
 # ===================================================================
 # REQUEST/RESPONSE MODELS
 # ===================================================================
 
+EXPO_PUSH_TOKEN_RE = re.compile(r"^ExponentPushToken\[[A-Za-z0-9_-]{1,64}\]$")
+
+
 class RegisterPushTokenRequest(BaseModel):
     """Request to register a push notification token"""
     push_token: str
-    device_type: str  # 'ios' or 'android'
+    device_type: Literal["ios", "android"]
     device_name: Optional[str] = None  # Optional device name/model
 
+    @validator('push_token')
+    def validate_push_token(cls, v):
+        # Rejected during request parsing, before the handler touches the database
+        if not EXPO_PUSH_TOKEN_RE.match(v):
+            raise ValueError("Invalid Expo push token format")
+        return v
+
 
 class TestNotificationRequest(BaseModel):
     """Request to send a test notification"""
@@ -45,7 +68,8 @@ class TestNotificationRequest(BaseModel):
 @router.post("/register-token")
 async def register_push_token(
     request: RegisterPushTokenRequest,
-    user: Dict[str, Any] = Depends(get_authenticated_user)
+    user: Dict[str, Any] = Depends(get_authenticated_user),
+    session: Session = Depends(get_db)
 ):
     """
     Register or update user's push notification token.
@@ -56,42 +80,43 @@ async def register_push_token(
     - Push token changes (rare but possible)
     """
     user_id = user["sub"]
-    session = db()
 
     try:
-        # Validate token format
-        if not request.push_token.startswith("ExponentPushToken["):
-            raise HTTPException(400, "Invalid Expo push token format")
-
-        # Validate device type
-        if request.device_type not in ["ios", "android"]:
-            raise HTTPException(400, "device_type must be 'ios' or 'android'")
-
-        # Check if this exact token already exists
-        existing_token = session.query(PushToken).filter(
-            PushToken.push_token == request.push_token
-        ).first()
-
-        if existing_token:
-            # Update existing token (user might have logged in on same device)
-            existing_token.profile_id = user_id
-            existing_token.device_type = request.device_type
-            existing_token.device_name = request.device_name
-            existing_token.is_active = True
-            logger.info(f"✅ Updated existing push token for user {user_id}")
-        else:
-            # Create new token
-            new_token = PushToken(
-                profile_id=user_id,
-                push_token=request.push_token,
-                device_type=request.device_type,
-                device_name=request.device_name,
-                is_active=True
-            )
-            session.add(new_token)
-            logger.info(f"✅ Registered new push token for user {user_id} ({request.device_type})")
-
+        # Previous owner of this token, if any; the row lock holds it until the
+        # upsert below commits. Its cached token list must be dropped too, or
+        # it keeps pushing to this device until the cache entry expires
+        previous_owner = session.execute(
+            select(PushToken.profile_id).where(
+                PushToken.push_token_hash == push_token_hash(request.push_token)
+            ).with_for_update()
+        ).scalar_one_or_none()
+
+        # Insert the token, or re-point an existing one at this user
+        # (user might have logged in on same device) - one atomic statement
+        stmt = pg_insert(PushToken).values(
+            profile_id=user_id,
+            push_token=request.push_token,
+            device_type=request.device_type,
+            device_name=request.device_name,
+            is_active=True
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PushToken.push_token_hash],
+            set_={
+                "profile_id": stmt.excluded.profile_id,
+                "device_type": stmt.excluded.device_type,
+                "device_name": stmt.excluded.device_name,
+                "is_active": True,
+                "updated_at": func.now()
+            }
+        )
+        session.execute(stmt)
         session.commit()
+        invalidate_active_tokens(user_id)
+        if previous_owner and previous_owner != user_id:
+            invalidate_active_tokens(previous_owner)
+
+        logger.info("✅ Registered push token for user %s (%s)", user_id, request.device_type)
 
         return {
             "success": True,
@@ -103,15 +128,14 @@ async def register_push_token(
         raise
     except Exception as e:
         session.rollback()
-        logger.error(f"❌ Failed to register push token: {e}")
+        logger.error("❌ Failed to register push token: %s", e)
         raise HTTPException(500, "Failed to register push token")
-    finally:
-        session.close()
 
 
 @router.delete("/unregister-token")
 async def unregister_push_token(
-    user: Dict[str, Any] = Depends(get_authenticated_user)
+    user: Dict[str, Any] = Depends(get_authenticated_user),
+    session: Session = Depends(get_db)
 ):
     """
     Unregister/deactivate all push notification tokens for the current user.
@@ -121,18 +145,28 @@ async def unregister_push_token(
     - User disables notifications in settings
     """
     user_id = user["sub"]
-    session = db()
 
     try:
-        # Deactivate all tokens for this user
-        updated_count = session.query(PushToken).filter(
-            PushToken.profile_id == user_id,
-            PushToken.is_active == True
-        ).update({"is_active": False})
+        # Deactivate all tokens for this user (single server-side UPDATE, no ORM hydration)
+        stmt = (
+            update(PushToken)
+            .where(PushToken.profile_id == user_id, PushToken.is_active.is_(True))
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        updated_count = session.execute(stmt).rowcount
+
+        if updated_count:
+            session.commit()
+            invalidate_active_tokens(user_id)
+        else:
+            # Already logged out - nothing to commit or invalidate
+            session.rollback()
 
-        session.commit()
+        # Logout: stop serving this token from the auth cache
+        forget_authenticated_user(user["token"])
 
-        logger.info(f"✅ Unregistered {updated_count} push tokens for user {user_id}")
+        logger.info("✅ Unregistered %s push tokens for user %s", updated_count, user_id)
 
         return {
             "success": True,
@@ -142,36 +176,36 @@ async def unregister_push_token(
 
     except Exception as e:
         session.rollback()
-        logger.error(f"❌ Failed to unregister push tokens: {e}")
+        logger.error("❌ Failed to unregister push tokens: %s", e)
         raise HTTPException(500, "Failed to unregister push tokens")
-    finally:
-        session.close()
 
 
 @router.get("/registered-devices")
 async def get_registered_devices(
-    user: Dict[str, Any] = Depends(get_authenticated_user)
+    user: Dict[str, Any] = Depends(get_authenticated_user),
+    session: Session = Depends(get_db)
 ):
     """
     Get list of registered devices for the current user.
     """
     user_id = user["sub"]
-    session = db()
 
     try:
-        tokens = session.query(PushToken).filter(
-            PushToken.profile_id == user_id,
-            PushToken.is_active == True
+        # Only the columns we return - no ORM instances to hydrate
+        rows = session.execute(
+            select(PushToken.id, PushToken.device_type, PushToken.device_name, PushToken.created_at)
+            .where(PushToken.profile_id == user_id, PushToken.is_active.is_(True))
         ).all()
 
-        devices = []
-        for token in tokens:
-            devices.append({
-                "id": str(token.id),
-                "device_type": token.device_type,
-                "device_name": token.device_name,
-                "registered_at": token.created_at.isoformat() if token.created_at else None
-            })
+        devices = [
+            {
+                "id": str(token_id),
+                "device_type": device_type,
+                "device_name": device_name,
+                "registered_at": created_at.isoformat() if created_at else None
+            }
+            for token_id, device_type, device_name, created_at in rows
+        ]
 
         return {
             "success": True,
@@ -180,67 +214,103 @@ async def get_registered_devices(
         }
 
     except Exception as e:
-        logger.error(f"❌ Failed to get registered devices: {e}")
+        logger.error("❌ Failed to get registered devices: %s", e)
         raise HTTPException(500, "Failed to retrieve registered devices")
-    finally:
-        session.close()
 
 
 @router.post("/test")
 async def send_test_notification(
     request: TestNotificationRequest,
-    user: Dict[str, Any] = Depends(get_authenticated_user)
+    user: Dict[str, Any] = Depends(get_authenticated_user),
+    session: Session = Depends(get_db)
 ):
     """
     Send a test notification to the current user's registered devices.
 
     **Development/Testing only** - helps verify notification setup.
+    Limited to TEST_NOTIFICATIONS_PER_MINUTE per user; an identical request
+    within 30 seconds of one that reached a device returns the previous result.
     """
     user_id = user["sub"]
-    session = db()
+
+    dedup_key = (user_id, request.title, request.body)
+    recent = _recent_test_results.get(dedup_key)
+    if recent is not None:
+        return recent
+
+    allowed, _, retry_after = get_redis_client().check_sliding_window(
+        f"notifications_test:{user_id}", limit=TEST_NOTIFICATIONS_PER_MINUTE, window=60
+    )
+    if not allowed:
+        raise HTTPException(
+            429,
+            f"Too many test notifications. Max {TEST_NOTIFICATIONS_PER_MINUTE} per minute.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    # Don't spend Expo quota on tests while Expo is telling us to back off
+    expo_wait = expo_retry_after()
+    if expo_wait:
+        raise HTTPException(
+            429,
+            "Push service is throttling requests. Please try again later.",
+            headers={"Retry-After": str(expo_wait)}
+        )
 
     try:
-        # Get user's active push tokens
-        push_tokens = session.query(PushToken).filter(
-            PushToken.profile_id == user_id,
-            PushToken.is_active == True
-        ).all()
+        # Get user's active push tokens (cached, invalidated on register/unregister)
+        push_tokens = get_active_tokens(session, user_id)
 
         if not push_tokens:
             raise HTTPException(404, "No registered devices found. Please register a push token first.")
 
-        # Send test notification to all devices
-        results = []
-        for token in push_tokens:
-            result = await send_push_notification(
-                push_token=token.push_token,
-                title=request.title,
-                body=request.body,
-                data={
+        # Send test notification to all devices in one Expo batch request;
+        # identical presses that arrive mid-send share the same dispatch
+        messages = [
+            {
+                "to": token["push_token"],
+                "title": request.title,
+                "body": request.body,
+                "data": {
                     "type": "test",
-                    "timestamp": str(token.created_at)
+                    "timestamp": token["created_at"]
                 }
-            )
+            }
+            for token in push_tokens
+        ]
+        send_results = await single_flight(
+            ("test", user_id, request.title, request.body),
+            lambda: send_batch_notifications(messages)
+        )
+
+        # Drop tokens for uninstalled apps now rather than resending to them forever
+        prune_dead_tokens(session, [t["push_token"] for t in push_tokens], send_results)
+
+        results = []
+        for token, result in zip(push_tokens, send_results):
             results.append({
-                "device_type": token.device_type,
+                "device_type": token["device_type"],
                 "success": result["success"],
                 "error": result.get("error")
             })
 
         success_count = sum(1 for r in results if r["success"])
 
-        logger.info(f"✅ Sent test notification to {success_count}/{len(results)} devices for user {user_id}")
+        logger.info("✅ Sent test notification to %s/%s devices for user %s", success_count, len(results), user_id)
 
-        return {
+        response = {
             "success": True,
             "message": f"Test notification sent to {success_count} device(s)",
             "results": results
         }
+        # Only remember a send that reached a device, so a retry after a
+        # total failure really sends again
+        if success_count > 0:
+            _recent_test_results[dedup_key] = response
+        return response
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Failed to send test notification: {e}")
+        logger.error("❌ Failed to send test notification: %s", e)
         raise HTTPException(500, "Failed to send test notification")
-    finally:
-        session.close()
@@ -7,24 +7,31 @@ Reconciles off-chain points from Supabase to on-chain WELL tokens daily
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
 import logging
-import subprocess
-import json
-import tempfile
 import os
+import time
+from operator import itemgetter
 from datetime import datetime, timedelta
 
+from sqlalchemy import select, update, func
+
 from routers.core_supabase import get_authenticated_user
+from services.reconcile_worker import reconcile_worker
 from services.supabase_client import supabase_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reconciliation", tags=["reconciliation", "points"])
 
 # Configuration
+RECONCILIATION_ENABLED = os.getenv("RECONCILIATION_ENABLED", "true").lower() == "true"
 POINTS_TO_WELL_RATE = int(os.getenv("POINTS_TO_WELL_RATE", "100"))  # 100 points = 1 WELL
 MAX_BATCH_SIZE = 200  # Gas limit optimization
-NODE_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "aa-test", "batch-reconcile.js")
+RECONCILE_CONCURRENCY = int(os.getenv("RECONCILE_CONCURRENCY", "2"))  # Batches in flight in the daily job
+MARK_RECONCILED_CHUNK_SIZE = 5000  # user_ids per UPDATE (stays under bind-parameter limits)
+RECONCILE_TIMEOUT = 300  # seconds a running batch may take before it is logged as overdue (never dropped)
+STATUS_CACHE_TTL = 30  # seconds; pending totals only move when a batch runs
 
 # === Models ===
 
@@ -53,62 +60,164 @@ class ReconciliationStatus(BaseModel):
     pending_users: int
     total_pending_points: int
 
+# (monotonic timestamp, status) of the last /status computation
+_status_cache: Optional[Tuple[float, "ReconciliationStatus"]] = None
+
 # === Helper Functions ===
 
-async def get_pending_reconciliations() -> List[Dict[str, Any]]:
+def _invalidate_status_cache():
+    """Drop the cached /status so the next poll sees fresh pending totals"""
+    global _status_cache
+    _status_cache = None
+
+_batch_fields = itemgetter("wallet_address", "pending_points", "user_id")
+
+def _split_batch(batch: List[Dict[str, Any]]) -> Tuple[List[str], List[int], List[str]]:
+    """Split a non-empty batch into (users, points, user_ids) in one pass"""
+    users, points, user_ids = map(list, zip(*map(_batch_fields, batch)))
+    return users, points, user_ids
+
+def _history_entries(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reconciliation history entries for a profiles row (see /history)"""
+    date = profile.get("last_reconciliation_date")
+    if not date:
+        return []
+
+    tx = profile.get("last_reconciliation_tx")
+    return [{
+        "date": date,
+        "transaction_hash": tx,
+        "explorer_url": f"https://amoy.polygonscan.com/tx/{tx}" if tx else None
+    }]
+
+def _pending_filter():
+    """WHERE clause shared by the pending list and summary queries"""
+    from models import UserPoints, SmartAccountInfo
+
+    return (
+        UserPoints.total_points > UserPoints.points_reconciled,
+        SmartAccountInfo.smart_account_address.isnot(None)
+    )
+
+async def get_pending_reconciliations(
+    limit: Optional[int] = None,
+    after_user_id: Optional[str] = None,
+    *,
+    session=None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Query database for users with pending points that need reconciliation
+
+    Runs the blocking query on a worker thread so the event loop keeps serving
+    other requests. See _get_pending_reconciliations_impl.
+    """
+    return await asyncio.to_thread(_get_pending_reconciliations_impl, limit, after_user_id, session)
+
+def _get_pending_reconciliations_impl(
+    limit: Optional[int] = None,
+    after_user_id: Optional[str] = None,
+    session=None
+) -> Tuple[List[Dict[str, Any]], int]:
     """
     Query database for users with pending points that need reconciliation
 
     Pending points = total_points - points_reconciled
 
-    Returns list of {user_id, wallet_address, pending_points, total_points, reconciled_points}
+    Args:
+        limit: Max rows to fetch (applied in SQL, ordered by profile_id)
+        after_user_id: Only return users after this profile_id (keyset page)
+        session: Caller's session to reuse; a new one is opened (and closed) if None
+
+    Returns (pending_users, total_pending_points), where pending_users is a list of
+    {user_id, wallet_address, pending_points, total_points, reconciled_points}
     """
     try:
         from models import db, UserPoints, SmartAccountInfo
 
-        session = db()
+        own_session = session is None
+        if own_session:
+            session = db()
         try:
-            # Query users with pending points (total > reconciled)
-            # Join with smart_account_info to get wallet addresses
-            results = session.query(
-                UserPoints.profile_id,
-                SmartAccountInfo.smart_account_address,
-                UserPoints.total_points,
-                UserPoints.points_reconciled
-            ).join(
-                SmartAccountInfo,
-                UserPoints.profile_id == SmartAccountInfo.profile_id
-            ).filter(
-                UserPoints.total_points > UserPoints.points_reconciled,
-                SmartAccountInfo.smart_account_address.isnot(None)
-            ).all()
+            # Query users with pending points (total > reconciled), pending computed
+            # server-side; join with smart_account_info to get wallet addresses
+            stmt = (
+                select(
+                    UserPoints.profile_id,
+                    SmartAccountInfo.smart_account_address,
+                    (UserPoints.total_points - UserPoints.points_reconciled).label("pending"),
+                    UserPoints.total_points,
+                    UserPoints.points_reconciled
+                )
+                .join(SmartAccountInfo, UserPoints.profile_id == SmartAccountInfo.user_id)
+                .where(*_pending_filter())
+                .order_by(UserPoints.profile_id)
+            )
+            if after_user_id is not None:
+                stmt = stmt.where(UserPoints.profile_id > after_user_id)
+            if limit is not None:
+                stmt = stmt.limit(limit)
 
+            results = session.execute(stmt)
+
+            # Build the rows and the points total in the same pass
             pending_users = []
-            for profile_id, wallet_address, total_points, points_reconciled in results:
-                pending_points = total_points - points_reconciled
-
-                if pending_points > 0:
-                    pending_users.append({
-                        "user_id": profile_id,
-                        "wallet_address": wallet_address,
-                        "pending_points": pending_points,
-                        "total_points": total_points,
-                        "reconciled_points": points_reconciled
-                    })
-
-            logger.info(f"Found {len(pending_users)} users with pending points")
+            total_pending = 0
+            for profile_id, wallet_address, pending_points, total_points, points_reconciled in results:
+                pending_users.append({
+                    "user_id": profile_id,
+                    "wallet_address": wallet_address,
+                    "pending_points": pending_points,
+                    "total_points": total_points,
+                    "reconciled_points": points_reconciled
+                })
+                total_pending += pending_points
+
+            logger.info("Found %s users with pending points", len(pending_users))
             if pending_users:
-                total_pending = sum(u["pending_points"] for u in pending_users)
-                logger.info(f"Total pending points to reconcile: {total_pending}")
+                logger.info("Total pending points to reconcile: %s", total_pending)
 
-            return pending_users
+            return pending_users, total_pending
 
         finally:
-            session.close()
+            if own_session:
+                session.close()
+            else:
+                # End the read transaction so a shared session doesn't sit
+                # idle-in-transaction while the batch waits on-chain
+                session.rollback()
 
     except Exception as e:
-        logger.error(f"Failed to get pending reconciliations: {e}")
-        return []
+        logger.error("Failed to get pending reconciliations: %s", e)
+        return [], 0
+
+async def get_pending_summary() -> Tuple[int, int]:
+    """
+    Count pending users and sum their pending points in the database
+
+    Used by /status, which only needs the aggregates - no per-user rows
+    are transferred or turned into dicts.
+
+    Returns (pending_users, total_pending_points)
+    """
+    return await asyncio.to_thread(_get_pending_summary_impl)
+
+def _get_pending_summary_impl() -> Tuple[int, int]:
+    from models import db, UserPoints, SmartAccountInfo
+
+    session = db()
+    try:
+        pending_users, total_pending_points = session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(UserPoints.total_points - UserPoints.points_reconciled), 0)
+            )
+            .select_from(UserPoints)
+            .join(SmartAccountInfo, UserPoints.profile_id == SmartAccountInfo.user_id)
+            .where(*_pending_filter())
+        ).one()
+        return pending_users, int(total_pending_points)
+    finally:
+        session.close()
 
 async def execute_batch_reconciliation(
     users: List[str],
@@ -116,7 +225,7 @@ async def execute_batch_reconciliation(
     points_to_well_rate: int = 100
 ) -> ReconciliationResult:
     """
-    Execute batch reconciliation via Node.js script (Biconomy)
+    Execute batch reconciliation via the Node.js reconcile worker (Biconomy)
 
     Args:
         users: List of user wallet addresses
@@ -142,54 +251,17 @@ async def execute_batch_reconciliation(
         "points_to_well_rate": points_to_well_rate
     }
 
-    # Write to temporary file
-    with tempfile.NamedTemporaryFile(
-        mode='w',
-        suffix='.json',
-        delete=False,
-        prefix='reconcile-batch-'
-    ) as f:
-        json.dump(batch_config, f)
-        config_path = f.name
-
     try:
-        logger.info(f"Executing batch reconciliation for {len(users)} users...")
-        logger.info(f"Config file: {config_path}")
-
-        # Execute Node.js script
-        result = subprocess.run(
-            ['node', NODE_SCRIPT_PATH, config_path],
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minutes timeout
-            cwd=os.path.dirname(NODE_SCRIPT_PATH)
-        )
-
-        # Check for errors
-        if result.returncode != 0:
-            logger.error(f"Batch reconciliation script failed:")
-            logger.error(f"STDOUT: {result.stdout}")
-            logger.error(f"STDERR: {result.stderr}")
-            raise Exception(f"Script failed with code {result.returncode}: {result.stderr}")
-
-        # Read result file
-        result_path = config_path.replace('.json', '-result.json')
-
-        if not os.path.exists(result_path):
-            logger.error(f"Result file not found: {result_path}")
-            logger.error(f"STDOUT: {result.stdout}")
-            raise Exception("Reconciliation completed but result file not found")
+        logger.info("Executing batch reconciliation for %d users...", len(users))
 
-        with open(result_path, 'r') as f:
-            result_data = json.load(f)
-
-        # Clean up result file
-        os.unlink(result_path)
+        # Hand the batch to the warm Node worker (no per-batch process start-up)
+        result_data = await reconcile_worker.submit(batch_config, timeout=RECONCILE_TIMEOUT)
+        _invalidate_status_cache()
 
         # Parse result
         if not result_data.get('success'):
             error_msg = result_data.get('error', 'Unknown error')
-            logger.error(f"Batch reconciliation failed: {error_msg}")
+            logger.error("Batch reconciliation failed: %s", error_msg)
             return ReconciliationResult(
                 success=False,
                 users_reconciled=0,
@@ -198,46 +270,35 @@ async def execute_batch_reconciliation(
                 error=error_msg
             )
 
-        logger.info(f"✅ Batch reconciliation successful!")
-        logger.info(f"   Tx Hash: {result_data.get('transactionHash')}")
-        logger.info(f"   Users: {result_data.get('usersReconciled')}")
-        logger.info(f"   Points: {result_data.get('totalPoints')}")
-        logger.info(f"   WELL: {result_data.get('totalWELL')}")
-
-        return ReconciliationResult(
-            success=True,
-            transaction_hash=result_data.get('transactionHash'),
-            userOp_hash=result_data.get('userOpHash'),
-            users_reconciled=result_data.get('usersReconciled', len(users)),
-            total_points=result_data.get('totalPoints', sum(points)),
-            total_well=result_data.get('totalWELL', sum(points) / points_to_well_rate),
-            block_number=result_data.get('blockNumber')
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ Batch reconciliation successful!")
+            logger.info("   Tx Hash: %s", result_data.get('transactionHash'))
+            logger.info("   Users: %s", result_data.get('usersReconciled'))
+            logger.info("   Points: %s", result_data.get('totalPoints'))
+            logger.info("   WELL: %s", result_data.get('totalWELL'))
+
+        # Node's output crosses a process boundary - keep full validation here
+        return ReconciliationResult.model_validate({
+            "success": True,
+            "transaction_hash": result_data.get('transactionHash'),
+            "userOp_hash": result_data.get('userOpHash'),
+            "users_reconciled": result_data.get('usersReconciled', len(users)),
+            "total_points": result_data.get('totalPoints', sum(points)),
+            "total_well": result_data.get('totalWELL', sum(points) / points_to_well_rate),
+            "block_number": result_data.get('blockNumber')
+        })
 
-    except subprocess.TimeoutExpired:
-        logger.error("Batch reconciliation timeout (5 minutes)")
-        return ReconciliationResult(
-            success=False,
-            users_reconciled=0,
-            total_points=0,
-            total_well=0.0,
-            error="Reconciliation timeout after 5 minutes"
-        )
     except Exception as e:
-        logger.error(f"Batch reconciliation error: {e}")
-        return ReconciliationResult(
+        logger.error("Batch reconciliation error: %s", e)
+        return ReconciliationResult.model_construct(
             success=False,
             users_reconciled=0,
             total_points=0,
             total_well=0.0,
             error=str(e)
         )
-    finally:
-        # Clean up config file
-        if os.path.exists(config_path):
-            os.unlink(config_path)
 
-async def mark_users_reconciled(user_ids: List[str], transaction_hash: str):
+async def mark_users_reconciled(user_ids: List[str], transaction_hash: str, *, session=None):
     """
     Mark users as reconciled in database
 
@@ -246,37 +307,51 @@ async def mark_users_reconciled(user_ids: List[str], transaction_hash: str):
     - total_points stays the same (user can still see their points!)
     - points_reconciled = total_points (nothing pending)
     - pending_points = total_points - points_reconciled = 0
+
+    The UPDATE runs on a worker thread, off the event loop. Pass session to
+    reuse the caller's session instead of opening a new one.
     """
+    await asyncio.to_thread(_mark_users_reconciled_impl, user_ids, transaction_hash, session)
+    _invalidate_status_cache()
+
+def _mark_users_reconciled_impl(user_ids: List[str], transaction_hash: str, session=None):
     try:
         from models import db, UserPoints
 
-        session = db()
+        own_session = session is None
+        if own_session:
+            session = db()
         try:
-            for user_id in user_ids:
-                # Update user_points - set points_reconciled = total_points
-                user_points = session.query(UserPoints).filter(
-                    UserPoints.profile_id == user_id
-                ).first()
-
-                if user_points:
-                    # Set reconciled to match total (all points now on-chain)
-                    user_points.points_reconciled = user_points.total_points
-                    user_points.last_reconciliation_date = datetime.utcnow()
-                    user_points.last_reconciliation_tx = transaction_hash
+            reconciled_at = datetime.utcnow()
+
+            # One server-side UPDATE per slice: points_reconciled = total_points
+            # is evaluated per row by Postgres, no SELECT or Python round-trip
+            for i in range(0, len(user_ids), MARK_RECONCILED_CHUNK_SIZE):
+                session.execute(
+                    update(UserPoints)
+                    .where(UserPoints.profile_id.in_(user_ids[i:i + MARK_RECONCILED_CHUNK_SIZE]))
+                    .values(
+                        points_reconciled=UserPoints.total_points,
+                        last_reconciliation_date=reconciled_at,
+                        last_reconciliation_tx=transaction_hash
+                    )
+                    .execution_options(synchronize_session=False)
+                )
 
             session.commit()
-            logger.info(f"✅ Marked {len(user_ids)} users as reconciled")
-            logger.info(f"   Transaction: {transaction_hash}")
+            logger.info("✅ Marked %s users as reconciled", len(user_ids))
+            logger.info("   Transaction: %s", transaction_hash)
 
         except Exception as db_error:
             session.rollback()
-            logger.error(f"Database error marking users reconciled: {db_error}")
+            logger.error("Database error marking users reconciled: %s", db_error)
             raise
         finally:
-            session.close()
+            if own_session:
+                session.close()
 
     except Exception as e:
-        logger.error(f"Failed to mark users as reconciled: {e}")
+        logger.error("Failed to mark users as reconciled: %s", e)
         # Don't raise - reconciliation succeeded on-chain, DB update is secondary
 
 # === API Endpoints ===
@@ -292,27 +367,45 @@ async def get_reconciliation_status():
         - next_run: Next scheduled run
         - pending_users: Number of users awaiting reconciliation
         - total_pending_points: Total points to reconcile
+
+    Cached for STATUS_CACHE_TTL seconds; reconciliation runs invalidate it.
     """
-    try:
-        # Get pending users
-        pending_users = await get_pending_reconciliations()
+    global _status_cache
+
+    # Switched off: nothing is pending by definition, so skip the DB entirely
+    if not RECONCILIATION_ENABLED:
+        return ReconciliationStatus.model_construct(
+            enabled=False,
+            last_run=None,
+            next_run=None,
+            pending_users=0,
+            total_pending_points=0
+        )
 
-        pending_count = len(pending_users)
-        total_points = sum(u["pending_points"] for u in pending_users)
+    # Dashboards poll this; serve a recent result instead of re-running the aggregate
+    cached = _status_cache
+    if cached is not None and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+        return cached[1]
+
+    try:
+        # Aggregates only - /status never needs the per-user rows
+        pending_count, total_points = await get_pending_summary()
 
         # TODO: Get last_run and next_run from scheduler/database
         # For now, return placeholder values
 
-        return ReconciliationStatus(
+        status = ReconciliationStatus.model_construct(
             enabled=True,
             last_run=None,  # TODO: Get from database
             next_run="Daily at 00:00 UTC",  # TODO: Get from scheduler
             pending_users=pending_count,
             total_pending_points=total_points
         )
+        _status_cache = (time.monotonic(), status)
+        return status
 
     except Exception as e:
-        logger.error(f"Failed to get reconciliation status: {e}")
+        logger.error("Failed to get reconciliation status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/trigger", response_model=ReconciliationResult)
@@ -332,13 +425,13 @@ async def trigger_manual_reconciliation(
         ReconciliationResult with transaction details
     """
     try:
-        logger.info(f"🔧 Manual reconciliation triggered by user {user.get('sub')}")
+        logger.info("🔧 Manual reconciliation triggered by user %s", user.get('sub'))
 
-        # Get pending reconciliations
-        pending_users = await get_pending_reconciliations()
+        # Only the first batch (max 200 users) is fetched - the daily job handles the rest
+        batch, _ = await get_pending_reconciliations(limit=MAX_BATCH_SIZE)
 
-        if not pending_users:
-            return ReconciliationResult(
+        if not batch:
+            return ReconciliationResult.model_construct(
                 success=True,
                 users_reconciled=0,
                 total_points=0,
@@ -346,17 +439,9 @@ async def trigger_manual_reconciliation(
                 error="No pending reconciliations"
             )
 
-        logger.info(f"📊 Found {len(pending_users)} users with pending points")
+        users, points, user_ids = _split_batch(batch)
 
-        # For now, process first batch only (max 200 users)
-        # TODO: Implement multi-batch processing
-        batch = pending_users[:MAX_BATCH_SIZE]
-
-        users = [u["wallet_address"] for u in batch]
-        points = [u["pending_points"] for u in batch]
-        user_ids = [u["user_id"] for u in batch]
-
-        logger.info(f"Processing batch of {len(users)} users...")
+        logger.info("Processing batch of %s users...", len(users))
 
         # Execute batch reconciliation
         result = await execute_batch_reconciliation(
@@ -368,14 +453,14 @@ async def trigger_manual_reconciliation(
         # If successful, mark users as reconciled
         if result.success and result.transaction_hash:
             await mark_users_reconciled(user_ids, result.transaction_hash)
-            logger.info(f"✅ Reconciliation completed successfully!")
+            logger.info("✅ Reconciliation completed successfully!")
         else:
-            logger.error(f"❌ Reconciliation failed: {result.error}")
+            logger.error("❌ Reconciliation failed: %s", result.error)
 
         return result
 
     except Exception as e:
-        logger.error(f"Manual reconciliation failed: {e}")
+        logger.error("Manual reconciliation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/daily-job")
@@ -384,83 +469,120 @@ async def daily_reconciliation_job():
     Daily reconciliation job - called by APScheduler at midnight UTC
 
     This job:
-    1. Queries all pending reconciliations
-    2. Batches users into groups of 200
-    3. Executes batch reconciliation for each group
-    4. Updates database with results
+    1. Fetches pending reconciliations 200 users at a time
+    2. Executes batch reconciliation for each group
+    3. Updates database with results
 
     NOTE: This is called internally by the scheduler, not exposed publicly
     """
-    try:
-        logger.info("🕐 Starting daily reconciliation job...")
-
-        # Get pending reconciliations
-        pending_users = await get_pending_reconciliations()
+    if not RECONCILIATION_ENABLED:
+        logger.info("Reconciliation disabled (RECONCILIATION_ENABLED=false) - skipping job")
+        return
 
-        if not pending_users:
-            logger.info("✅ No pending reconciliations - skipping job")
-            return {"success": True, "message": "No pending reconciliations"}
+    from models import db
 
-        logger.info(f"📊 Found {len(pending_users)} users with pending points")
+    # One session for the whole job instead of one per helper call. Helpers run
+    # on worker threads and batches overlap, so use of it is serialized.
+    session = db()
+    db_lock = asyncio.Lock()
 
-        # Batch users into groups of 200
-        batches = [
-            pending_users[i:i + MAX_BATCH_SIZE]
-            for i in range(0, len(pending_users), MAX_BATCH_SIZE)
-        ]
-
-        logger.info(f"📦 Processing {len(batches)} batches...")
+    try:
+        logger.info("🕐 Starting daily reconciliation job...")
 
+        # Up to RECONCILE_CONCURRENCY batches in flight: while one waits for its
+        # on-chain confirmation the next page is fetched and queued, and finished
+        # batches are marked reconciled. reconcile_worker hands the Node worker
+        # one batch at a time (single backend smart account nonce) and queues the
+        # rest, so a queued batch's wait never counts against RECONCILE_TIMEOUT.
+        sem = asyncio.Semaphore(RECONCILE_CONCURRENCY)
+
+        async def _run(batch_num: int, batch: List[Dict[str, Any]], batch_points: int) -> ReconciliationResult:
+            try:
+                users, points, user_ids = _split_batch(batch)
+
+                logger.info("Batch %d: %d users, %d points", batch_num, len(users), batch_points)
+
+                # Execute batch reconciliation
+                result = await execute_batch_reconciliation(
+                    users=users,
+                    points=points,
+                    points_to_well_rate=POINTS_TO_WELL_RATE
+                )
+
+                if result.success and result.transaction_hash:
+                    # Mark users as reconciled
+                    async with db_lock:
+                        await mark_users_reconciled(user_ids, result.transaction_hash, session=session)
+                    logger.info("✅ Batch %s completed: %s", batch_num, result.transaction_hash)
+                else:
+                    logger.error("❌ Batch %s failed: %s", batch_num, result.error)
+
+                return result
+            finally:
+                sem.release()
+
+        # Walk pending users one batch (200) at a time with keyset pagination on
+        # profile_id. Reconciled users drop out of the pending set as we go, so an
+        # OFFSET would skip rows; "profile_id > last seen" never does.
+        tasks = []
+        last_user_id = None
+
+        while True:
+            await sem.acquire()
+            async with db_lock:
+                batch, batch_points = await get_pending_reconciliations(
+                    limit=MAX_BATCH_SIZE, after_user_id=last_user_id, session=session
+                )
+            if not batch:
+                sem.release()
+                break
+
+            last_user_id = batch[-1]["user_id"]
+            tasks.append(asyncio.create_task(_run(len(tasks) + 1, batch, batch_points)))
+
+            # A short page means this was the last one
+            if len(batch) < MAX_BATCH_SIZE:
+                break
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        batch_num = len(tasks)
         successful_batches = 0
         failed_batches = 0
         total_users_reconciled = 0
 
-        for batch_num, batch in enumerate(batches, 1):
-            users = [u["wallet_address"] for u in batch]
-            points = [u["pending_points"] for u in batch]
-            user_ids = [u["user_id"] for u in batch]
-
-            logger.info(f"Batch {batch_num}/{len(batches)}: {len(users)} users, {sum(points)} points")
-
-            # Execute batch reconciliation
-            result = await execute_batch_reconciliation(
-                users=users,
-                points=points,
-                points_to_well_rate=POINTS_TO_WELL_RATE
-            )
-
-            if result.success and result.transaction_hash:
-                # Mark users as reconciled
-                await mark_users_reconciled(user_ids, result.transaction_hash)
+        for result in results:
+            if isinstance(result, ReconciliationResult) and result.success and result.transaction_hash:
                 successful_batches += 1
                 total_users_reconciled += result.users_reconciled
-                logger.info(f"✅ Batch {batch_num} completed: {result.transaction_hash}")
             else:
+                if isinstance(result, Exception):
+                    logger.error("❌ Batch raised: %s", result)
                 failed_batches += 1
-                logger.error(f"❌ Batch {batch_num} failed: {result.error}")
 
-            # Small delay between batches to avoid nonce conflicts
-            if batch_num < len(batches):
-                import asyncio
-                await asyncio.sleep(5)
+        if batch_num == 0:
+            logger.info("✅ No pending reconciliations - skipping job")
+            return {"success": True, "message": "No pending reconciliations"}
 
-        logger.info(f"🎉 Daily reconciliation completed!")
-        logger.info(f"   Successful batches: {successful_batches}/{len(batches)}")
-        logger.info(f"   Failed batches: {failed_batches}")
-        logger.info(f"   Users reconciled: {total_users_reconciled}")
+        logger.info("🎉 Daily reconciliation completed!")
+        logger.info("   Successful batches: %s/%s", successful_batches, batch_num)
+        logger.info("   Failed batches: %s", failed_batches)
+        logger.info("   Users reconciled: %s", total_users_reconciled)
 
         return {
             "success": True,
-            "batches_processed": len(batches),
+            "batches_processed": batch_num,
             "successful_batches": successful_batches,
             "failed_batches": failed_batches,
             "users_reconciled": total_users_reconciled
         }
 
     except Exception as e:
-        logger.error(f"❌ Daily reconciliation job failed: {e}")
+        logger.error("❌ Daily reconciliation job failed: %s", e)
         # TODO: Send alert to admin
         raise
+    finally:
+        session.close()
 
 @router.get("/history")
 async def get_reconciliation_history(
@@ -475,25 +597,17 @@ async def get_reconciliation_history(
     try:
         user_id = user.get("sub")
 
-        # Get user's reconciliation history from profile
+        # Get user's reconciliation history from profile; at most one row, so
+        # ask PostgREST for a single object instead of a one-element array
         response = supabase_service.client.table("profiles").select(
             "last_reconciliation_date, last_reconciliation_tx"
-        ).eq("user_id", user_id).execute()
-
-        if not response.data:
-            return []
-
-        profile = response.data[0]
+        ).eq("user_id", user_id).maybe_single().execute()
 
-        if not profile.get("last_reconciliation_date"):
+        if not response or not response.data:
             return []
 
-        return [{
-            "date": profile["last_reconciliation_date"],
-            "transaction_hash": profile.get("last_reconciliation_tx"),
-            "explorer_url": f"https://amoy.polygonscan.com/tx/{profile.get('last_reconciliation_tx')}" if profile.get("last_reconciliation_tx") else None
-        }]
+        return _history_entries(response.data)
 
     except Exception as e:
-        logger.error(f"Failed to get reconciliation history: {e}")
+        logger.error("Failed to get reconciliation history: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,13 +4,30 @@ Receives transaction status updates from Relayer service
 Provides endpoints for admin/backend operations via Relayer
 """
 
-from fastapi import APIRouter, HTTPException, Header, Request, Depends
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Header, Request, Depends, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, conint, field_validator, model_validator
+from typing import Any, AsyncIterator, Dict, Optional, List, TypedDict
+import asyncio
 import hmac
 import hashlib
 import logging
 import os
+import uuid
+
+from cachetools import TTLCache
+
+from config import settings
+from services.defender_relayer_client import (
+    get_relayer_client,
+    encode_no_arg_call,
+    encode_with_selector,
+    function_selector,
+    RelayerError,
+    RelayerTimeoutError
+)
+from services.reconcile_batcher import ReconcileBatcher, MAX_RECONCILE_BATCH
+from services.redis_service import get_redis_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/relayer", tags=["relayer", "backend-operations"])
@@ -20,6 +37,47 @@ WEBHOOK_SIGNING_KEY = os.getenv("WEBHOOK_SIGNING_KEY", "unimate_webhook_key_1234
 REDEMPTION_SYSTEM_ADDRESS = os.getenv("REDEMPTION_SYSTEM_ADDRESS", "0x06CD3f30bbD1765415eE5B3C84D34c5eaaDCa635")
 WELL_TOKEN_ADDRESS = os.getenv("WELL_TOKEN_ADDRESS", "0x2AaBE1C44a3122776f84C22eB3E9EBcb881c2651")
 
+ADDRESS_PATTERN = r"^0x[0-9a-fA-F]{40}$"
+
+DEFAULT_RELAYER_ID = "unimate-polygon-amoy"
+DAILY_JOB_CONCURRENCY = 8  # relayer submissions in flight during the daily job
+DEFENDER_ENABLED = settings.DEFENDER_ENABLED  # settings are fixed at startup
+
+# Status of background submissions, keyed by the transaction_id we returned. Kept
+# in Redis so the ID still resolves after a restart or on another worker
+SUBMISSION_TTL = 3600  # seconds
+
+
+def _submission_key(submission_id: str) -> str:
+    return f"relayer_submission:{submission_id}"
+
+
+def _record_submission(submission_id: str, record: Dict[str, Any]) -> None:
+    get_redis_client().set_json(_submission_key(submission_id), record, ttl=SUBMISSION_TTL)
+
+
+def _get_submission(submission_id: str) -> Optional[Dict[str, Any]]:
+    return get_redis_client().get_json(_submission_key(submission_id))
+
+# Relayer status lookups keyed by (relayer_id, transaction_id); UI/cron polling
+# of the same transaction collapses onto one relayer call
+TX_STATUS_CACHE_TTL = 0.5  # seconds
+_tx_status_cache = TTLCache(maxsize=4096, ttl=TX_STATUS_CACHE_TTL)
+_tx_status_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Coalesces concurrent reconcile-points calls and spreads them over the relayer pool
+reconcile_batcher = ReconcileBatcher(settings.DEFENDER_RELAYER_IDS, REDEMPTION_SYSTEM_ADDRESS)
+
+# pause()/unpause() take no arguments, so their call data is a constant selector
+_PAUSE_DATA = encode_no_arg_call("pause()")  # 0x8456cb59
+_UNPAUSE_DATA = encode_no_arg_call("unpause()")  # 0x3f4ba83a
+
+# Daily job encodes batchReconcile locally; only the arguments change per batch
+_BATCH_RECONCILE_SELECTOR = function_selector("batchReconcile(address[],uint256[])")
+
+# Keyed once at import; each verification copies it instead of re-deriving the HMAC pads
+_webhook_hmac = hmac.new(WEBHOOK_SIGNING_KEY.encode(), digestmod=hashlib.sha256)
+
 class RelayerWebhookEvent(BaseModel):
     """Relayer webhook event payload"""
     transaction_id: str
@@ -50,11 +108,9 @@ async def verify_webhook_signature(
         logger.warning("Missing webhook signature header")
         raise HTTPException(status_code=403, detail="Missing signature")
 
-    expected_sig = hmac.new(
-        WEBHOOK_SIGNING_KEY.encode(),
-        raw_body,
-        hashlib.sha256
-    ).hexdigest()
+    mac = _webhook_hmac.copy()
+    mac.update(raw_body)
+    expected_sig = mac.hexdigest()
 
     # Use constant-time comparison to prevent timing attacks
     if not hmac.compare_digest(x_webhook_signature, expected_sig):
@@ -76,13 +132,11 @@ async def relayer_webhook(
     Using FastAPI Depends pattern to properly handle body reading and signature verification
     """
     try:
-        # Parse the verified body
-        import json
-        event_data = json.loads(raw_body)
-        event = RelayerWebhookEvent(**event_data)
+        # Parse and validate the verified bytes in one step (no intermediate dict)
+        event = RelayerWebhookEvent.model_validate_json(raw_body)
 
         # Log event
-        logger.info(f"Relayer webhook: {event.transaction_id} - {event.status}")
+        logger.info("Relayer webhook: %s - %s", event.transaction_id, event.status)
 
         # Handle different statuses
         if event.status == "confirmed":
@@ -95,16 +149,16 @@ async def relayer_webhook(
         return {"received": True, "transaction_id": event.transaction_id}
 
     except Exception as e:
-        logger.error(f"Webhook processing error: {e}")
+        logger.error("Webhook processing error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 async def handle_confirmed_transaction(event: RelayerWebhookEvent):
     """Process confirmed transaction"""
     # TODO: Update database based on transaction type
     # Example: Mark point reconciliation as complete
-    logger.info(f"✅ Transaction confirmed: {event.hash}")
-    logger.info(f"   Gas used: {event.gas_used}")
-    logger.info(f"   Block: {event.block_number}")
+    logger.info("✅ Transaction confirmed: %s", event.hash)
+    logger.info("   Gas used: %s", event.gas_used)
+    logger.info("   Block: %s", event.block_number)
 
     # Future implementation: Update database
     # from services.supabase_client import get_supabase_service
@@ -114,8 +168,8 @@ async def handle_confirmed_transaction(event: RelayerWebhookEvent):
 async def handle_failed_transaction(event: RelayerWebhookEvent):
     """Process failed transaction"""
     # TODO: Handle failure (retry, alert admin, etc.)
-    logger.error(f"❌ Transaction failed: {event.transaction_id}")
-    logger.error(f"   Error: {event.error}")
+    logger.error("❌ Transaction failed: %s", event.transaction_id)
+    logger.error("   Error: %s", event.error)
 
     # Future implementation: Alert admin, retry logic
     # await notify_admin_of_failure(event)
@@ -127,11 +181,8 @@ async def relayer_health():
     Check if relayer integration is healthy
     """
     try:
-        from services.defender_relayer_client import get_relayer_client
-        from config import settings
-
         # Check if Defender is enabled
-        if not settings.DEFENDER_ENABLED:
+        if not DEFENDER_ENABLED:
             return {
                 "status": "disabled",
                 "message": "OpenZeppelin Defender is not configured",
@@ -167,7 +218,7 @@ async def relayer_health():
             "webhook_endpoint": "/relayer/webhook"
         }
     except Exception as e:
-        logger.error(f"Relayer health check failed: {e}")
+        logger.error("Relayer health check failed: %s", e)
         return {
             "status": "unhealthy",
             "error": str(e)
@@ -178,36 +229,70 @@ async def relayer_health():
 # BACKEND OPERATIONS ENDPOINTS (Admin/Relayer Operations)
 # ============================================================================
 
+# 503 body for backend-ops while Defender is disabled (a fresh HTTPException is
+# raised each time - reusing one instance would keep growing its traceback)
+_DEFENDER_DISABLED_DETAIL = {
+    "error": "Service Unavailable",
+    "message": "OpenZeppelin Defender backend relayer is not configured",
+    "reason": "Defender service discontinued for new users",
+    "alternative": "Use Biconomy-powered endpoints for user-initiated transactions",
+    "working_endpoints": [
+        "/mint_gasless - User gasless minting",
+        "/aa/get-address - Smart account creation",
+        "/aa/execute-batch - Batch transactions"
+    ]
+}
+
 def check_defender_available():
     """Helper to check if Defender is available, raises HTTPException if not"""
-    from config import settings
-
-    if not settings.DEFENDER_ENABLED:
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "error": "Service Unavailable",
-                "message": "OpenZeppelin Defender backend relayer is not configured",
-                "reason": "Defender service discontinued for new users",
-                "alternative": "Use Biconomy-powered endpoints for user-initiated transactions",
-                "working_endpoints": [
-                    "/mint_gasless - User gasless minting",
-                    "/aa/get-address - Smart account creation",
-                    "/aa/execute-batch - Batch transactions"
-                ]
-            }
-        )
+    if not DEFENDER_ENABLED:
+        raise HTTPException(status_code=503, detail=_DEFENDER_DISABLED_DETAIL)
 
 class BatchReconcileRequest(BaseModel):
     """Request to reconcile points for multiple users"""
-    user_addresses: List[str]
-    points: List[int]
+    user_addresses: List[str] = Field(..., min_length=1, max_length=MAX_RECONCILE_BATCH)
+    # uint256 range, checked here so a bad value is a 422 instead of an
+    # OverflowError that fails every request batched into the same tx
+    points: List[conint(ge=0, lt=2**256)]
+
+    @field_validator("user_addresses")
+    @classmethod
+    def _check_addresses(cls, addresses: List[str]) -> List[str]:
+        # Same rule as ADDRESS_PATTERN, checked for the whole batch with string
+        # slicing and one bytes.fromhex instead of a regex match per element
+        n = len(addresses)
+        joined = "".join(addresses)
+        valid = set(map(len, addresses)) == {42} and joined[0::42] == "0" * n and joined[1::42] == "x" * n
+        if valid:
+            try:
+                valid = len(bytes.fromhex(joined.replace("0x", ""))) == 20 * n
+            except ValueError:
+                valid = False
+        if not valid:
+            raise ValueError("user_addresses must be 0x-prefixed 40 hex digit addresses")
+        return addresses
+
+    @model_validator(mode="after")
+    def _check_lengths(self):
+        if len(self.user_addresses) != len(self.points):
+            raise ValueError("user_addresses and points arrays must have same length")
+        return self
 
 class PauseContractRequest(BaseModel):
     """Request to pause a contract"""
-    contract_address: str
+    contract_address: str = Field(..., pattern=ADDRESS_PATTERN)
     reason: Optional[str] = "Emergency pause by admin"
 
+class ReconcilePointsResponse(TypedDict):
+    """reconcile-points response body (plain dict, rendered by orjson)"""
+    success: bool
+    transaction_id: str
+    status: str
+    users_count: int
+    total_points: int
+    contract: str
+    message: str
+
 class TransactionStatusResponse(BaseModel):
     """Response for transaction status"""
     transaction_id: str
@@ -217,15 +302,41 @@ class TransactionStatusResponse(BaseModel):
     gas_used: Optional[int] = None
 
 
-@router.post("/backend-ops/reconcile-points")
-async def reconcile_points_batch(request: BatchReconcileRequest):
+async def _send_in_background(submission_id: str, action: str, send):
+    """
+    Run a relayer submission after the response has gone out
+
+    Records the outcome under submission_id so get_transaction_status can
+    answer for it before (and after) the relayer knows the transaction.
+    """
+    try:
+        result = await send()
+        _record_submission(submission_id, {
+            "status": "submitted",
+            "relayer_id": result.get("relayer_id", DEFAULT_RELAYER_ID),
+            "relayer_transaction_id": result["transaction_id"]
+        })
+        logger.info("[OK] event=%s_submitted id=%s relayer_tx=%s", action, submission_id, result["transaction_id"])
+    except RelayerError as e:
+        # Expected upstream failures (timeout, auth, rejected tx): no traceback
+        _record_submission(submission_id, {"status": "failed", "error": str(e)})
+        logger.error("[FAIL] event=%s_failed id=%s error=%s", action, submission_id, e)
+    except Exception as e:
+        _record_submission(submission_id, {"status": "failed", "error": str(e)})
+        logger.exception("[FAIL] event=%s_failed id=%s error=%s", action, submission_id, e)
+
+
+@router.post("/backend-ops/reconcile-points", status_code=202, response_class=ORJSONResponse)
+async def reconcile_points_batch(request: BatchReconcileRequest, background: BackgroundTasks) -> ORJSONResponse:
     """
     Batch reconcile points to WELL tokens via Defender Relayer
 
     This endpoint:
-    1. Encodes batchReconcile() function call
-    2. Sends transaction via Relayer (gasless for backend)
-    3. Returns transaction ID for tracking
+    1. Queues the batch on reconcile_batcher, which merges calls arriving
+       together into one batchReconcile() call (max 200 users per tx)
+    2. Sends the transaction via the least busy Relayer (gasless for backend)
+       after responding - the 500k-gas tx won't finalize within the request anyway
+    3. Returns a transaction ID for tracking via /backend-ops/transaction/{id}
 
     Called by:
     - Cron job (nightly reconciliation)
@@ -236,76 +347,41 @@ async def reconcile_points_batch(request: BatchReconcileRequest):
     # Check if Defender is available
     check_defender_available()
 
-    try:
-        from services.defender_relayer_client import get_relayer_client
-
-        # Validate input
-        if len(request.user_addresses) != len(request.points):
-            raise HTTPException(
-                status_code=400,
-                detail="user_addresses and points arrays must have same length"
-            )
-
-        if len(request.user_addresses) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Cannot reconcile empty batch"
-            )
-
-        if len(request.user_addresses) > 200:
-            raise HTTPException(
-                status_code=400,
-                detail="Batch too large (max 200 users)"
-            )
+    users_count = len(request.user_addresses)
+    total_points = sum(request.points)
 
-        # Get relayer client
-        relayer = get_relayer_client()
+    submission_id = str(uuid.uuid4())
+    _record_submission(submission_id, {"status": "pending"})
 
-        # Encode batchReconcile function call
-        function_signature = "batchReconcile(address[],uint256[])"
-        data = await relayer.encode_function_call(
-            function_signature,
-            ["address[]", "uint256[]"],
-            [request.user_addresses, request.points]
-        )
+    # Concurrent calls within a short window share one batchReconcile tx
+    background.add_task(
+        _send_in_background, submission_id, "reconcile",
+        lambda: reconcile_batcher.submit(request.user_addresses, request.points)
+    )
 
-        logger.info(f"Encoded batchReconcile for {len(request.user_addresses)} users")
+    logger.info("[QUEUED] event=reconcile_queued id=%s users=%d", submission_id, users_count)
 
-        # Send transaction via Relayer
-        result = await relayer.send_transaction(
-            relayer_id="unimate-polygon-amoy",
-            to=REDEMPTION_SYSTEM_ADDRESS,
-            data=data,
-            gas_limit=500000,  # ~3k gas per user
-            speed="fast"
-        )
+    body: ReconcilePointsResponse = {
+        "success": True,
+        "transaction_id": submission_id,
+        "status": "pending",
+        "users_count": users_count,
+        "total_points": total_points,
+        "contract": REDEMPTION_SYSTEM_ADDRESS,
+        "message": "Batch reconciliation accepted for submission to Relayer"
+    }
+    return ORJSONResponse(body, status_code=202)
 
-        logger.info(f"✅ Reconciliation submitted: {result.get('transaction_id')}")
 
-        return {
-            "success": True,
-            "transaction_id": result["transaction_id"],
-            "status": result["status"],
-            "users_count": len(request.user_addresses),
-            "total_points": sum(request.points),
-            "contract": REDEMPTION_SYSTEM_ADDRESS,
-            "message": "Batch reconciliation submitted to Relayer"
-        }
-
-    except Exception as e:
-        logger.error(f"❌ Reconciliation failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.post("/backend-ops/pause-contract")
-async def pause_contract(request: PauseContractRequest):
+@router.post("/backend-ops/pause-contract", status_code=202, response_class=ORJSONResponse)
+async def pause_contract(request: PauseContractRequest, background: BackgroundTasks):
     """
     Emergency pause a contract via Defender Relayer
 
     This endpoint:
-    1. Encodes pause() function call
-    2. Sends transaction via Relayer with FASTEST speed
-    3. Returns transaction ID
+    1. Uses the precomputed pause() call data
+    2. Responds immediately with a transaction ID
+    3. Sends the transaction via Relayer with FASTEST speed in the background
 
     Called by:
     - Admin action (manual emergency response)
@@ -316,132 +392,145 @@ async def pause_contract(request: PauseContractRequest):
     # Check if Defender is available
     check_defender_available()
 
-    try:
-        from services.defender_relayer_client import get_relayer_client
+    logger.warning("[PAUSE] event=pause_requested contract=%s reason=%s", request.contract_address, request.reason)
 
-        # Validate contract address
-        if not request.contract_address.startswith("0x") or len(request.contract_address) != 42:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid contract address format"
-            )
+    submission_id = str(uuid.uuid4())
+    _record_submission(submission_id, {"status": "pending"})
 
-        # Get relayer client
-        relayer = get_relayer_client()
-
-        # Encode pause() function call
-        function_signature = "pause()"
-        data = await relayer.encode_function_call(
-            function_signature,
-            [],
-            []
-        )
-
-        logger.warning(f"⚠️  PAUSE REQUEST: {request.contract_address}")
-        logger.warning(f"   Reason: {request.reason}")
-
-        # Send transaction via Relayer (FASTEST speed for emergency)
-        result = await relayer.send_transaction(
-            relayer_id="unimate-polygon-amoy",
+    # Send transaction via Relayer (FASTEST speed for emergency) without holding the response
+    background.add_task(
+        _send_in_background, submission_id, "pause",
+        lambda: get_relayer_client().send_transaction(
+            relayer_id=DEFAULT_RELAYER_ID,
             to=request.contract_address,
-            data=data,
+            data=_PAUSE_DATA,
             gas_limit=100000,
             speed="fastest"  # Emergency - use fastest
         )
+    )
 
-        logger.warning(f"🚨 Pause transaction submitted: {result.get('transaction_id')}")
-
-        return {
-            "success": True,
-            "transaction_id": result["transaction_id"],
-            "contract": request.contract_address,
-            "action": "pause",
-            "reason": request.reason,
-            "message": "Emergency pause submitted to Relayer"
-        }
-
-    except Exception as e:
-        logger.error(f"❌ Pause failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse({
+        "success": True,
+        "transaction_id": submission_id,
+        "status": "pending",
+        "contract": request.contract_address,
+        "action": "pause",
+        "reason": request.reason,
+        "message": "Emergency pause accepted for submission to Relayer"
+    }, status_code=202)
 
 
-@router.post("/backend-ops/unpause-contract")
-async def unpause_contract(contract_address: str):
+@router.post("/backend-ops/unpause-contract", response_class=ORJSONResponse)
+async def unpause_contract(contract_address: str = Query(..., pattern=ADDRESS_PATTERN)):
     """
     Unpause a previously paused contract via Defender Relayer
 
     Note: Requires PAUSER_ROLE on target contract
     """
     try:
-        from services.defender_relayer_client import get_relayer_client
-
-        # Validate contract address
-        if not contract_address.startswith("0x") or len(contract_address) != 42:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid contract address format"
-            )
-
         # Get relayer client
         relayer = get_relayer_client()
 
-        # Encode unpause() function call
-        function_signature = "unpause()"
-        data = await relayer.encode_function_call(
-            function_signature,
-            [],
-            []
-        )
+        # unpause() call data is precomputed at import
+        data = _UNPAUSE_DATA
 
-        logger.info(f"⏯️  UNPAUSE REQUEST: {contract_address}")
+        logger.info("[UNPAUSE] event=unpause_requested contract=%s", contract_address)
 
         # Send transaction via Relayer
         result = await relayer.send_transaction(
-            relayer_id="unimate-polygon-amoy",
+            relayer_id=DEFAULT_RELAYER_ID,
             to=contract_address,
             data=data,
             gas_limit=100000,
             speed="fast"
         )
 
-        logger.info(f"✅ Unpause transaction submitted: {result.get('transaction_id')}")
+        logger.info("[OK] event=unpause_submitted relayer_tx=%s", result.get('transaction_id'))
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "transaction_id": result["transaction_id"],
             "contract": contract_address,
             "action": "unpause",
             "message": "Unpause submitted to Relayer"
-        }
-
+        })
+
+    except RelayerTimeoutError as e:
+        logger.error("[FAIL] event=unpause_failed error=%s", e)
+        raise HTTPException(status_code=504, detail=str(e))
+    except RelayerError as e:
+        # Auth and other upstream rejections are the relayer's failure, not ours
+        logger.error("[FAIL] event=unpause_failed error=%s", e)
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
-        logger.error(f"❌ Unpause failed: {e}")
+        logger.exception("[FAIL] event=unpause_failed error=%s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/backend-ops/transaction/{transaction_id}")
+async def _fetch_status(relayer_id: str, transaction_id: str) -> Dict[str, Any]:
+    """
+    Relayer transaction status, shared between concurrent and rapid polls
+
+    A result is reused for TX_STATUS_CACHE_TTL seconds, and polls that arrive
+    while a lookup for the same transaction is in flight await that lookup
+    instead of issuing their own.
+    """
+    key = (relayer_id, transaction_id)
+    cached = _tx_status_cache.get(key)
+    if cached is not None:
+        return cached
+
+    inflight = _tx_status_inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    inflight = asyncio.ensure_future(
+        get_relayer_client().get_transaction_status(relayer_id=relayer_id, transaction_id=transaction_id)
+    )
+    _tx_status_inflight[key] = inflight
+    try:
+        status = await asyncio.shield(inflight)
+        _tx_status_cache[key] = status
+        return status
+    finally:
+        _tx_status_inflight.pop(key, None)
+
+
+@router.get("/backend-ops/transaction/{transaction_id}", response_class=ORJSONResponse)
 async def get_transaction_status(transaction_id: str):
     """
     Get status of a Relayer transaction
 
     Returns current status, hash (if mined), gas used, etc.
     """
-    try:
-        from services.defender_relayer_client import get_relayer_client
+    # IDs handed out by the background-submitting endpoints resolve locally first
+    submission = _get_submission(transaction_id)
+    if submission is not None and submission["status"] != "submitted":
+        return ORJSONResponse({
+            "success": True,
+            "transaction": {"transaction_id": transaction_id, **submission}
+        })
 
-        relayer = get_relayer_client()
-        status = await relayer.get_transaction_status(
-            relayer_id="unimate-polygon-amoy",
-            transaction_id=transaction_id
-        )
+    try:
+        if submission is not None:
+            status = await _fetch_status(submission["relayer_id"], submission["relayer_transaction_id"])
+        else:
+            status = await _fetch_status(DEFAULT_RELAYER_ID, transaction_id)
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "transaction": status
-        }
-
+        })
+
+    except RelayerTimeoutError as e:
+        logger.error("[FAIL] event=tx_status_failed id=%s error=%s", transaction_id, e)
+        raise HTTPException(status_code=504, detail=str(e))
+    except RelayerError as e:
+        # Auth and other upstream rejections are the relayer's failure, not ours
+        logger.error("[FAIL] event=tx_status_failed id=%s error=%s", transaction_id, e)
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to get transaction status: {e}")
+        logger.exception("[FAIL] event=tx_status_failed id=%s error=%s", transaction_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -449,21 +538,15 @@ async def get_transaction_status(transaction_id: str):
 # SCHEDULED JOBS (Cron Jobs)
 # ============================================================================
 
-async def daily_reconciliation_job():
+async def _pending_reconciliation_pages(page_size: int = MAX_RECONCILE_BATCH) -> AsyncIterator[List[Dict[str, Any]]]:
     """
-    Daily point reconciliation job - runs at midnight UTC
+    Yield users with pending point reconciliations, one batch-sized page at a time
 
-    This job:
-    1. Queries database for users with pending point reconciliations
-    2. Batches users into groups of 200 (gas limit optimization)
-    3. Submits batch reconciliation via Defender Relayer
-    4. Updates database with transaction IDs
-
-    Called by: APScheduler (scheduled in app.py)
+    Pages are keyed on user_address rather than offset, so marking earlier
+    pages reconciled while the job runs does not shift later pages.
     """
-    try:
-        logger.info("🕐 Starting daily point reconciliation...")
-
+    last_address = ""
+    while True:
         # TODO: Implement database query for pending reconciliations
         # For now, this is a placeholder structure
 
@@ -471,71 +554,115 @@ async def daily_reconciliation_job():
         # from services.supabase_client import get_supabase_service
         # supabase = get_supabase_service()
         #
-        # pending_users = await supabase.client
+        # page = (await supabase.client
         #     .from_("point_reconciliation")
         #     .select("user_address, total_points")
         #     .eq("reconciled", False)
-        #     .execute()
+        #     .gt("user_address", last_address)
+        #     .order("user_address")
+        #     .limit(page_size)
+        #     .execute()).data
 
         # Placeholder: Simulate pending reconciliations
-        pending_users = []
+        page: List[Dict[str, Any]] = []
 
-        if not pending_users:
-            logger.info("✅ No pending reconciliations - skipping job")
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
             return
+        last_address = page[-1]["user_address"]
 
-        logger.info(f"📊 Found {len(pending_users)} users with pending points")
+async def daily_reconciliation_job():
+    """
+    Daily point reconciliation job - runs at midnight UTC
 
-        # Batch users into groups of 200 (gas limit optimization)
-        batch_size = 200
-        batches = [
-            pending_users[i:i + batch_size]
-            for i in range(0, len(pending_users), batch_size)
-        ]
+    This job:
+    1. Pages through users with pending point reconciliations
+    2. Submits each page of up to 200 users (gas limit optimization) as a
+       batch reconciliation via Defender Relayer as soon as it arrives
+    3. Updates database with transaction IDs
 
-        logger.info(f"📦 Processing {len(batches)} batches...")
+    Only DAILY_JOB_CONCURRENCY pages are held at once, so memory stays
+    O(batch) however many users are pending.
+
+    Called by: APScheduler (scheduled in app.py)
+    """
+    try:
+        logger.info("🕐 Starting daily point reconciliation...")
 
-        from services.defender_relayer_client import get_relayer_client
         relayer = get_relayer_client()
 
-        transaction_ids = []
+        # The Defender relayer assigns nonces server-side, so batches can be in
+        # flight together; the semaphore caps concurrent submissions and, being
+        # acquired before the next page is fetched, the pages held in memory
+        # (at most DAILY_JOB_CONCURRENCY)
+        sem = asyncio.Semaphore(DAILY_JOB_CONCURRENCY)
+
+        async def submit_batch(batch_num: int, batch: List[Dict[str, Any]]) -> str:
+            try:
+                # Extract addresses and points from batch
+                addresses = [user["user_address"] for user in batch]
+                points = [user["total_points"] for user in batch]
+
+                # Encode batchReconcile function call
+                data = encode_with_selector(
+                    _BATCH_RECONCILE_SELECTOR,
+                    ["address[]", "uint256[]"],
+                    [addresses, points]
+                )
+
+                # Submit transaction via Relayer
+                result = await relayer.send_transaction(
+                    relayer_id=DEFAULT_RELAYER_ID,
+                    to=REDEMPTION_SYSTEM_ADDRESS,
+                    data=data,
+                    gas_limit=500000,
+                    speed="average"  # Not urgent, save gas
+                )
+
+                logger.info(
+                    "✅ Batch %d submitted: %s (%d users)",
+                    batch_num, result['transaction_id'], len(addresses)
+                )
+
+                return result["transaction_id"]
+            finally:
+                sem.release()
+
+        submissions: List[asyncio.Task] = []
+        total_users = 0
+        pages = _pending_reconciliation_pages()
+        while True:
+            await sem.acquire()
+            try:
+                batch = await pages.__anext__()
+            except StopAsyncIteration:
+                sem.release()
+                break
+            total_users += len(batch)
+            submissions.append(asyncio.create_task(submit_batch(len(submissions) + 1, batch)))
+
+        if not submissions:
+            logger.info("✅ No pending reconciliations - skipping job")
+            return
+
+        results = await asyncio.gather(*submissions, return_exceptions=True)
 
-        for batch_num, batch in enumerate(batches, 1):
-            # Extract addresses and points from batch
-            addresses = [user["user_address"] for user in batch]
-            points = [user["total_points"] for user in batch]
-
-            # Encode batchReconcile function call
-            data = await relayer.encode_function_call(
-                "batchReconcile(address[],uint256[])",
-                ["address[]", "uint256[]"],
-                [addresses, points]
-            )
-
-            # Submit transaction via Relayer
-            result = await relayer.send_transaction(
-                relayer_id="unimate-polygon-amoy",
-                to=REDEMPTION_SYSTEM_ADDRESS,
-                data=data,
-                gas_limit=500000,
-                speed="average"  # Not urgent, save gas
-            )
-
-            transaction_ids.append(result["transaction_id"])
-
-            logger.info(
-                f"✅ Batch {batch_num}/{len(batches)} submitted: "
-                f"{result['transaction_id']} ({len(addresses)} users)"
-            )
-
-            # Small delay between batches to avoid nonce conflicts
-            import asyncio
-            await asyncio.sleep(2)
-
-        logger.info(f"🎉 Daily reconciliation completed successfully!")
-        logger.info(f"   Total batches: {len(batches)}")
-        logger.info(f"   Total users: {len(pending_users)}")
-        logger.info(f"   Transaction IDs: {', '.join(transaction_ids)}")
+        transaction_ids = []
+        failed_batches = 0
+        for batch_num, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                logger.error("❌ Batch %d failed: %s", batch_num, result)
+                failed_batches += 1
+            else:
+                transaction_ids.append(result)
+
+        logger.info("🎉 Daily reconciliation completed!")
+        logger.info("   Successful batches: %s/%s", len(transaction_ids), len(submissions))
+        logger.info("   Failed batches: %s", failed_batches)
+        logger.info("   Total users: %s", total_users)
+        logger.info("   Transaction IDs: %s", ', '.join(transaction_ids))
 
         # TODO: Update database to mark reconciliations as submitted
         # await supabase.client
@@ -545,7 +672,7 @@ async def daily_reconciliation_job():
         #     .execute()
 
     except Exception as e:
-        logger.error(f"❌ Daily reconciliation failed: {e}")
+        logger.error("❌ Daily reconciliation failed: %s", e)
         # TODO: Send alert to admin
         raise
 
@@ -572,5 +699,5 @@ async def trigger_manual_reconciliation():
         }
 
     except Exception as e:
-        logger.error(f"Manual reconciliation failed: {e}")
+        logger.error("Manual reconciliation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -5,21 +5,44 @@ Integrates with existing blockchain.py gasless infrastructure
 
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
+import asyncio
 import logging
+import hmac
+import hashlib
 from datetime import datetime, date, time as dt_time, timedelta
 import time
 import secrets
 from zoneinfo import ZoneInfo
 
+from config import settings
 from routers.core_supabase import get_authenticated_user
 from services.supabase_client import get_supabase_service
+from services.points_cache import get_cached_points, cache_points, invalidate_points
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/rewards", tags=["rewards"])
 
 # Define Malaysia timezone for consistent date/time handling
 MALAYSIA_TZ = ZoneInfo("Asia/Kuala_Lumpur")
+UTC = ZoneInfo("UTC")
+
+@lru_cache(maxsize=2)
+def _day_bounds_utc(day: date) -> Tuple[str, datetime, datetime]:
+    """(YYYY-MM-DD, start, end) of a Malaysia calendar day, start/end in UTC"""
+    start = datetime.combine(day, dt_time.min, tzinfo=MALAYSIA_TZ)
+    return day.isoformat(), start.astimezone(UTC), (start + timedelta(days=1)).astimezone(UTC)
+
+def _today_bounds_utc() -> Tuple[str, datetime, datetime]:
+    """Today's Malaysia date string and its UTC range; computed once per day"""
+    return _day_bounds_utc(datetime.now(MALAYSIA_TZ).date())
+
+@lru_cache(maxsize=2)
+def _week_start_utc(day: date) -> datetime:
+    """Monday 00:00 Malaysia time of the week containing day, in UTC"""
+    monday = day - timedelta(days=day.weekday())
+    return datetime.combine(monday, dt_time.min, tzinfo=MALAYSIA_TZ).astimezone(UTC)
 
 # Import activity logging helpers
 try:
@@ -42,14 +65,36 @@ try:
         UserPoints as BlockchainUserPoints,
         Profile,
         Voucher as BlockchainVoucher,
-        SmartAccountInfo
+        SmartAccountInfo,
+        ActivityLog,
+        DailyActionCompletion,
+        Task,
+        Reminder,
+        UserChallenge
+    )
+    from sqlalchemy import func, update
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+    from web3 import Web3
+    from routers.blockchain import (
+        verify_sig,
+        API_SECRET,
+        mint_gasless,
+        MintGaslessBody,
+        aa_wellness_redeem,
+        WellnessRedeemBody
     )
-    from routers.blockchain import verify_sig, API_SECRET
+    # Keyed once at import; each signature copies it instead of re-deriving the HMAC pads
+    _api_hmac = hmac.new(API_SECRET.encode(), digestmod=hashlib.sha256)
     BLOCKCHAIN_INTEGRATION = True
 except ImportError:
     logger.warning("Blockchain integration not available")
     BLOCKCHAIN_INTEGRATION = False
 
+# Caps gasless UserOps (mints and redemptions) submitted to the Biconomy
+# bundler at once, so a burst of redeems queues here instead of coming back
+# from the bundler as 429s
+_biconomy_slots = asyncio.Semaphore(settings.BICONOMY_MAX_CONCURRENCY)
+
 # === Unified Biconomy Gasless Minting Helper ===
 
 async def mint_tokens_gasless(
@@ -72,22 +117,14 @@ async def mint_tokens_gasless(
         Dict with tx_hash, user_op_hash, explorer URL, and success status
     """
     try:
-        from routers.blockchain import mint_gasless, MintGaslessBody
-        from config import API_SECRET
-        import hmac, hashlib
-        from web3 import Web3
-
         # Ensure address is properly checksummed
         wallet_address = Web3.to_checksum_address(smart_account_address)
 
         # Create HMAC signature for gasless minting
         current_time = int(time.time())
-        raw_message = f"{wallet_address}|{token_amount}|{current_time}"
-        signature = hmac.new(
-            API_SECRET.encode(),
-            raw_message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        mac = _api_hmac.copy()
+        mac.update(f"{wallet_address}|{token_amount}|{current_time}".encode())
+        signature = mac.hexdigest()
 
         # Create gasless mint request
         mint_request = MintGaslessBody(
@@ -98,7 +135,8 @@ async def mint_tokens_gasless(
         )
 
         # Execute TRUE gasless mint via Biconomy ERC-4337
-        mint_result = await mint_gasless(mint_request, request)
+        async with _biconomy_slots:
+            mint_result = await mint_gasless(mint_request, request)
 
         logger.info(f"✅ Biconomy gasless mint successful for user {user_id}: {token_amount} WELL → {wallet_address}")
         logger.info(f"   Tx Hash: {mint_result.get('tx_hash')}")
@@ -159,6 +197,140 @@ class PointsTransaction(BaseModel):
     description: str
     created_at: datetime
 
+def _load_user_blockchain_state(session, user_id: str) -> Tuple[Any, Any, Any]:
+    """(Profile, SmartAccountInfo, UserPoints) for a user in one joined query; None where missing"""
+    row = session.query(Profile, SmartAccountInfo, BlockchainUserPoints).outerjoin(
+        SmartAccountInfo, SmartAccountInfo.user_id == Profile.id
+    ).outerjoin(
+        BlockchainUserPoints, BlockchainUserPoints.profile_id == Profile.id
+    ).filter(
+        Profile.id == user_id
+    ).first()
+    return tuple(row) if row else (None, None, None)
+
+def _deduct_points(session, user_id: str, amount: int) -> Optional[int]:
+    """
+    Take amount points from a user in one UPDATE ... RETURNING, only if they have enough
+
+    The balance check is part of the UPDATE's WHERE clause, so concurrent
+    deductions cannot both pass it. Returns the new total, or None if the
+    user has no points row or too few points. The caller commits.
+    """
+    return session.execute(
+        update(BlockchainUserPoints).where(
+            BlockchainUserPoints.profile_id == user_id,
+            BlockchainUserPoints.total_points >= amount
+        ).values(
+            total_points=BlockchainUserPoints.total_points - amount,
+            last_updated=int(time.time())
+        ).returning(BlockchainUserPoints.total_points)
+    ).scalar_one_or_none()
+
+def _refund_points(session, user_id: str, amount: int) -> None:
+    """Give back points taken by _deduct_points (in SQL, so concurrent writes are kept)"""
+    session.execute(
+        update(BlockchainUserPoints).where(
+            BlockchainUserPoints.profile_id == user_id
+        ).values(
+            total_points=BlockchainUserPoints.total_points + amount,
+            last_updated=int(time.time())
+        )
+    )
+
+# Sync DB blocks of the redeem/earn/exchange endpoints. The session is
+# synchronous, so these run via asyncio.to_thread and only the Biconomy
+# awaits stay on the event loop.
+
+def _smart_account_address_impl(user_id: str) -> Tuple[bool, Optional[str]]:
+    """(profile exists, smart account address or None) for a user"""
+    with blockchain_db() as session:
+        profile, smart_account, _ = _load_user_blockchain_state(session, user_id)
+        address = smart_account.smart_account_address if smart_account else None
+        return profile is not None, address or None
+
+def _ensure_profile_impl(user_id: str, email: str) -> Optional[str]:
+    """Create the user's profile if missing; returns their smart account address or None"""
+    with blockchain_db() as session:
+        profile, smart_account, _ = _load_user_blockchain_state(session, user_id)
+
+        if not profile:
+            now = int(time.time())
+            session.add(Profile(id=user_id, email=email, created_at=now, updated_at=now))
+            session.commit()
+            logger.info(f"Created blockchain user record for {user_id}")
+
+        address = smart_account.smart_account_address if smart_account else None
+        return address or None
+
+def _deduct_points_impl(user_id: str, amount: int) -> Tuple[bool, int]:
+    """
+    _deduct_points in its own transaction
+
+    Returns (deducted, points): the new total if deducted, otherwise the
+    user's current balance for the error message.
+    """
+    with blockchain_db() as session:
+        remaining = _deduct_points(session, user_id, amount)
+
+        if remaining is None:
+            session.rollback()
+            current = session.query(BlockchainUserPoints.total_points).filter(
+                BlockchainUserPoints.profile_id == user_id
+            ).scalar() or 0
+            return False, current
+
+        session.commit()
+        invalidate_points(user_id)
+        return True, remaining
+
+def _refund_points_impl(user_id: str, amount: int) -> None:
+    """_refund_points in its own transaction"""
+    with blockchain_db() as session:
+        _refund_points(session, user_id, amount)
+        session.commit()
+        invalidate_points(user_id)
+
+def _add_points_impl(user_id: str, amount: int) -> Tuple[int, int]:
+    """Add earned points, resetting earned_today on a new Malaysia day; returns (total, earned_today)"""
+    with blockchain_db() as session:
+        user_points = session.query(BlockchainUserPoints).filter(
+            BlockchainUserPoints.profile_id == user_id
+        ).first()
+
+        # Use Malaysia timezone for daily reset logic
+        today_str_malaysia = _today_bounds_utc()[0]
+
+        if user_points:
+            # ✅ Check if we need to reset daily points (Malaysia timezone)
+            if user_points.last_daily_reset != today_str_malaysia:
+                user_points.earned_today = 0
+                user_points.last_daily_reset = today_str_malaysia
+                logger.info(f"Reset earned_today for user {user_id} (new day in MYT: {today_str_malaysia})")
+
+            user_points.total_points += amount
+            user_points.earned_today += amount
+            user_points.last_updated = int(time.time())
+        else:
+            # 创建新的积分记录 (Use Malaysia timezone)
+            user_points = BlockchainUserPoints(
+                profile_id=user_id,
+                total_points=amount,
+                earned_today=amount,
+                last_updated=int(time.time()),
+                last_daily_reset=today_str_malaysia
+            )
+            session.add(user_points)
+
+        total, earned_today = user_points.total_points, user_points.earned_today
+        session.commit()
+        invalidate_points(user_id)
+        return total, earned_today
+
+def _remember_points(user_id: str, points: UserPoints) -> UserPoints:
+    """Cache a computed /points response (see services/points_cache.py) and return it"""
+    cache_points(user_id, points.model_dump())
+    return points
+
 # === User-friendly Endpoints ===
 
 @router.get("/points", response_model=UserPoints)
@@ -166,81 +338,71 @@ async def get_user_points(user: Dict[str, Any] = Depends(get_authenticated_user)
     """获取用户积分信息 - 从区块链系统获取真实数据"""
     try:
         user_id = user["sub"]
-        
+
+        # Repeat polls within POINTS_CACHE_TTL are served from Redis; point
+        # writes invalidate the entry
+        cached = get_cached_points(user_id)
+        if cached is not None:
+            return UserPoints.model_construct(**cached)
+
         if not BLOCKCHAIN_INTEGRATION:
             # Get points from Supabase instead of mock data
             try:
                 supabase_service = get_supabase_service()
 
-                # Get user profile with points
-                response = supabase_service.client.table("profiles").select("points").eq("user_id", user_id).execute()
-
-                total_points = 0
-                if response.data:
-                    total_points = response.data[0].get("points", 0)
-
-                # Get today's earned points from user_challenges
                 # Use Malaysia timezone for accurate "today" calculation
-                today_malaysia = datetime.now(MALAYSIA_TZ).date()
-                start_of_today = datetime.combine(today_malaysia, dt_time.min, tzinfo=MALAYSIA_TZ)
-                start_of_tomorrow = start_of_today + timedelta(days=1)
-
-                today_response = supabase_service.client.table("user_challenges").select("points_earned").eq("user_id", user_id).gte("completed_at", start_of_today.isoformat()).lt("completed_at", start_of_tomorrow.isoformat()).execute()
-
-                earned_today_challenges = sum([challenge.get("points_earned", 0) for challenge in (today_response.data or [])])
+                today_malaysia, start_of_today, start_of_tomorrow = _today_bounds_utc()
+                start_of_week = _week_start_utc(date.fromisoformat(today_malaysia))
+
+                # One round-trip for the points total, today's and this week's challenge
+                # points and today's task/reminder counts (see migrate_user_points_summary.py)
+                response = supabase_service.client.rpc("get_user_points_summary", {
+                    "p_user_id": user_id,
+                    "day_start": start_of_today.isoformat(),
+                    "day_end": start_of_tomorrow.isoformat(),
+                    "week_start": start_of_week.isoformat()
+                }).execute()
+                summary = response.data[0] if response.data else {}
+
+                total_points = summary.get("total_points", 0)
+                earned_today_challenges = summary.get("challenges_today", 0)
+                earned_week_challenges = summary.get("challenges_this_week", earned_today_challenges)
+                task_count = summary.get("task_count_today", 0)
+                reminder_count = summary.get("reminder_count_today", 0)
 
                 # ✅ Also count Daily Habits points completed today
-                daily_habits_points = 0
-                try:
-                    from models import Task as TaskModel, Reminder as ReminderModel, db as blockchain_db_func
-                    session_temp = blockchain_db_func()
-
-                    # Convert Malaysia timezone to UTC for database comparison
-                    # Database stores timestamps in UTC
-                    start_of_today_utc = start_of_today.astimezone(ZoneInfo("UTC"))
-                    start_of_tomorrow_utc = start_of_tomorrow.astimezone(ZoneInfo("UTC"))
+                logger.debug("🕐 Checking Daily Habits for Malaysia date: %s", today_malaysia)
 
-                    logger.info(f"🕐 Checking Daily Habits for Malaysia date: {today_malaysia}")
-                    logger.info(f"🕐 UTC range: {start_of_today_utc} to {start_of_tomorrow_utc}")
+                # Login: 5 points (if they're calling this API, they logged in today)
+                daily_habits_points = 5
+                logger.debug("✅ Daily habits: Login +5 points")
 
-                    # Login: 5 points (if they're calling this API, they logged in today)
+                # Add a task: 5 points
+                logger.debug("📋 Found %s tasks created today", task_count)
+                if task_count > 0:
                     daily_habits_points += 5
-                    logger.info(f"✅ Daily habits: Login +5 points")
-
-                    # Add a task: 5 points
-                    task_count = session_temp.query(TaskModel).filter(
-                        TaskModel.user_id == user_id,
-                        TaskModel.created_at >= start_of_today_utc,
-                        TaskModel.created_at < start_of_tomorrow_utc
-                    ).count()
-                    logger.info(f"📋 Found {task_count} tasks created today")
-                    if task_count > 0:
-                        daily_habits_points += 5
-                        logger.info(f"✅ Daily habits: Added {task_count} tasks +5 points")
-
-                    # Add a reminder: 10 points
-                    reminder_count = session_temp.query(ReminderModel).filter(
-                        ReminderModel.user_id == user_id,
-                        ReminderModel.created_at >= start_of_today_utc,
-                        ReminderModel.created_at < start_of_tomorrow_utc
-                    ).count()
-                    logger.info(f"🔔 Found {reminder_count} reminders created today")
-                    if reminder_count > 0:
-                        daily_habits_points += 10
-                        logger.info(f"✅ Daily habits: Added {reminder_count} reminders +10 points")
-
-                    session_temp.close()
-                    logger.info(f"💰 Total daily habits points: {daily_habits_points}")
-                except Exception as e:
-                    logger.error(f"❌ Failed to calculate daily habits points: {e}", exc_info=True)
+                    logger.debug("✅ Daily habits: Added %s tasks +5 points", task_count)
+
+                # Add a reminder: 10 points
+                logger.debug("🔔 Found %s reminders created today", reminder_count)
+                if reminder_count > 0:
+                    daily_habits_points += 10
+                    logger.debug("✅ Daily habits: Added %s reminders +10 points", reminder_count)
+
+                logger.debug("💰 Total daily habits points: %s", daily_habits_points)
 
                 earned_today = earned_today_challenges + daily_habits_points
 
-                logger.info(f"🎯 FINAL CALCULATION: Challenges={earned_today_challenges} + Daily Habits={daily_habits_points} = Total={earned_today}")
+                logger.info(
+                    "🎯 Points for %s: challenges=%s + daily habits=%s = %s today",
+                    user_id, earned_today_challenges, daily_habits_points, earned_today
+                )
 
-                # Calculate this week's points (simplified)
-                earned_this_week = earned_today  # Can be enhanced to calculate weekly
+                # This week's challenge points; daily habits are only tracked for today
+                earned_this_week = earned_week_challenges + daily_habits_points
 
+                # Not cached: task, reminder and challenge writes don't invalidate
+                # the points cache in this mode
                 return UserPoints(
                     total_points=total_points,
                     available_points=total_points,
@@ -258,45 +420,57 @@ async def get_user_points(user: Dict[str, Any] = Depends(get_authenticated_user)
                 )
         
         # 从blockchain.py的数据库获取积分信息
-        session = blockchain_db()
-        try:
+        # The with-block returns the connection to the pool on every exit path
+        with blockchain_db() as session:
             # ✅ FIX: Make this endpoint STRICTLY READ-ONLY
             # No database writes, no point calculations
             # Points are awarded by background tasks only
 
             # user_id from JWT is already the profile UUID
-            user_points = session.query(BlockchainUserPoints).filter(
+            # This week's points_earned log total rides along as a scalar subquery,
+            # so the endpoint stays at one query
+            week_start = _week_start_utc(datetime.now(MALAYSIA_TZ).date())
+            row = session.query(
+                BlockchainUserPoints,
+                session.query(func.coalesce(func.sum(ActivityLog.amount), 0)).filter(
+                    ActivityLog.profile_id == user_id,
+                    ActivityLog.activity_type == "points_earned",
+                    ActivityLog.created_at >= week_start
+                ).scalar_subquery()
+            ).filter(
                 BlockchainUserPoints.profile_id == user_id
             ).first()
+            user_points, earned_week_logged = row if row else (None, 0)
 
             # If no record exists, return zeros
             # Records are created by award_daily_action_points() when points are awarded
             if not user_points:
-                logger.info(f"📊 No points record for user {user_id} - returning zeros")
-                return UserPoints(
+                logger.info("📊 No points record for user %s - returning zeros", user_id)
+                return _remember_points(user_id, UserPoints(
                     total_points=0,
                     available_points=0,
                     earned_today=0,
                     earned_this_week=0
-                )
+                ))
 
             # ✅ READ-ONLY: Just return database values
             # No calculations, no detection logic
             # Points are awarded in real-time by background tasks
-            logger.info(f"📊 READ-ONLY: total_points={user_points.total_points}, earned_today={user_points.earned_today}")
+            logger.info(
+                "📊 Points for %s: total_points=%s, earned_today=%s",
+                user_id, user_points.total_points, user_points.earned_today
+            )
 
-            # 计算本周积分 (简化实现)
-            earned_this_week = user_points.earned_today * 7  # 简化计算
+            # 本周积分: points_earned activity logs since Monday (Malaysia time);
+            # never less than today's total if some awards were not logged
+            earned_this_week = max(int(earned_week_logged), user_points.earned_today)
 
-            return UserPoints(
+            return _remember_points(user_id, UserPoints(
                 total_points=user_points.total_points,
                 available_points=user_points.total_points,
                 earned_today=user_points.earned_today,  # ✅ Use database value (source of truth)
                 earned_this_week=earned_this_week
-            )
-
-        finally:
-            session.close()
+            ))
         
     except Exception as e:
         logger.error(f"Failed to get user points: {e}")
@@ -337,6 +511,139 @@ async def get_points_history(
         logger.error(f"Failed to get points history: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve points history")
 
+# 真实的Reward Market券列表 - 马来西亚本地商家
+# The catalog is static: built once at import, already sorted by points required
+_VOUCHER_CATALOG: Tuple[Voucher, ...] = tuple(sorted((
+    # 食物类
+    Voucher(
+        id="food_starbucks_10",
+        title="Starbucks Malaysia RM10 Voucher",
+        description="Enjoy premium coffee and beverages at any Starbucks Malaysia outlet",
+        points_required=500,
+        category="food",
+        image_url="https://1000logos.net/wp-content/uploads/2020/05/Starbucks-Logo.png",
+        terms_conditions="Valid for 30 days from redemption. Cannot be combined with other promotions."
+    ),
+    Voucher(
+        id="food_kfc_15",
+        title="KFC Malaysia RM15 Voucher",
+        description="Finger lickin' good! Valid at all KFC Malaysia restaurants",
+        points_required=750,
+        category="food",
+        image_url="https://logos-world.net/wp-content/uploads/2020/04/KFC-Logo.png",
+        terms_conditions="Valid for 30 days. Not applicable for delivery charges."
+    ),
+    Voucher(
+        id="food_mcd_12",
+        title="McDonald's Malaysia RM12 Voucher",
+        description="I'm lovin' it! Use at any McDonald's Malaysia outlet",
+        points_required=600,
+        category="food",
+        image_url="https://logos-world.net/wp-content/uploads/2020/04/McDonalds-Logo.png"
+    ),
+    
+    # 健康类
+    Voucher(
+        id="wellness_guardian_20",
+        title="Guardian Malaysia RM20 Voucher",
+        description="Health, beauty and wellness products at Guardian pharmacies",
+        points_required=1000,
+        category="wellness",
+        image_url="https://www.guardian.com.my/images/guardian-logo.png",
+        terms_conditions="Valid for health and beauty products only. Prescription medicines excluded."
+    ),
+    Voucher(
+        id="wellness_fitness_first_trial",
+        title="Fitness First - 3 Day Trial Pass",
+        description="Experience premium fitness facilities with a 3-day trial membership",
+        points_required=400,
+        category="wellness",
+        image_url="https://www.fitnessfirst.com.my/images/ff-logo.png"
+    ),
+    Voucher(
+        id="wellness_yoga_class",
+        title="Pure Yoga - Single Class Pass",
+        description="Join a yoga session at Pure Yoga studios across Malaysia",
+        points_required=350,
+        category="wellness",
+        image_url="https://pureyoga.com.my/images/pure-yoga-logo.png"
+    ),
+    
+    # 购物类
+    Voucher(
+        id="shopping_grab_10",
+        title="Grab Malaysia RM10 Credit",
+        description="Use for GrabFood, GrabCar or GrabMart services",
+        points_required=500,
+        category="shopping",
+        image_url="https://logos-world.net/wp-content/uploads/2020/11/Grab-Logo.png",
+        terms_conditions="Valid for 60 days from redemption date."
+    ),
+    Voucher(
+        id="shopping_shopee_15",
+        title="Shopee Malaysia RM15 Voucher",
+        description="Shop online with Malaysia's leading e-commerce platform",
+        points_required=750,
+        category="shopping",
+        image_url="https://logos-world.net/wp-content/uploads/2020/11/Shopee-Logo.png",
+        terms_conditions="Minimum spend RM30. Valid for 30 days."
+    ),
+    Voucher(
+        id="shopping_lazada_12",
+        title="Lazada Malaysia RM12 Voucher",
+        description="Discover millions of products on Lazada Malaysia",
+        points_required=600,
+        category="shopping",
+        image_url="https://logos-world.net/wp-content/uploads/2020/11/Lazada-Logo.png"
+    ),
+    
+    # 教育类
+    Voucher(
+        id="education_coursera_month",
+        title="Coursera Plus - 1 Month Free",
+        description="Access thousands of courses from top universities and companies",
+        points_required=800,
+        category="education",
+        image_url="https://logos-world.net/wp-content/uploads/2021/11/Coursera-Logo.png",
+        terms_conditions="New subscribers only. Auto-renewal can be cancelled anytime."
+    ),
+    Voucher(
+        id="education_udemy_discount",
+        title="Udemy - 50% Discount Coupon",
+        description="Learn new skills with 50% off any Udemy course",
+        points_required=300,
+        category="education",
+        image_url="https://logos-world.net/wp-content/uploads/2021/11/Udemy-Logo.png"
+    ),
+    
+    # 娱乐类
+    Voucher(
+        id="entertainment_tgv_ticket",
+        title="TGV Cinemas - Movie Ticket",
+        description="Enjoy the latest movies at TGV Cinemas nationwide",
+        points_required=900,
+        category="entertainment",
+        image_url="https://www.tgv.com.my/images/tgv-logo.png",
+        terms_conditions="Valid for regular 2D movies only. Surcharge applies for 3D/IMAX."
+    ),
+    Voucher(
+        id="entertainment_spotify_premium",
+        title="Spotify Premium - 1 Month",
+        description="Enjoy ad-free music streaming with Spotify Premium",
+        points_required=450,
+        category="entertainment",
+        image_url="https://logos-world.net/wp-content/uploads/2020/06/Spotify-Logo.png"
+    )
+), key=lambda x: x.points_required))
+
+_VOUCHERS_BY_ID: Dict[str, Voucher] = {v.id: v for v in _VOUCHER_CATALOG}
+
+MY_VOUCHERS_LIMIT = 200  # most recent redemptions returned by /vouchers/my-vouchers
+VOUCHER_VALIDITY_SECONDS = 30 * 24 * 60 * 60  # 30天过期
+_VOUCHERS_BY_CATEGORY: Dict[str, Tuple[Voucher, ...]] = {}
+for _v in _VOUCHER_CATALOG:
+    _VOUCHERS_BY_CATEGORY[_v.category] = _VOUCHERS_BY_CATEGORY.get(_v.category, ()) + (_v,)
+
 @router.get("/vouchers/available", response_model=List[Voucher])
 async def get_available_vouchers(
     category: Optional[str] = None,
@@ -344,138 +651,10 @@ async def get_available_vouchers(
 ):
     """获取可兑换的券 - Reward Market"""
     try:
-        # 真实的Reward Market券列表 - 马来西亚本地商家
-        vouchers = [
-            # 食物类
-            Voucher(
-                id="food_starbucks_10",
-                title="Starbucks Malaysia RM10 Voucher",
-                description="Enjoy premium coffee and beverages at any Starbucks Malaysia outlet",
-                points_required=500,
-                category="food",
-                image_url="https://1000logos.net/wp-content/uploads/2020/05/Starbucks-Logo.png",
-                terms_conditions="Valid for 30 days from redemption. Cannot be combined with other promotions."
-            ),
-            Voucher(
-                id="food_kfc_15",
-                title="KFC Malaysia RM15 Voucher",
-                description="Finger lickin' good! Valid at all KFC Malaysia restaurants",
-                points_required=750,
-                category="food",
-                image_url="https://logos-world.net/wp-content/uploads/2020/04/KFC-Logo.png",
-                terms_conditions="Valid for 30 days. Not applicable for delivery charges."
-            ),
-            Voucher(
-                id="food_mcd_12",
-                title="McDonald's Malaysia RM12 Voucher",
-                description="I'm lovin' it! Use at any McDonald's Malaysia outlet",
-                points_required=600,
-                category="food",
-                image_url="https://logos-world.net/wp-content/uploads/2020/04/McDonalds-Logo.png"
-            ),
-            
-            # 健康类
-            Voucher(
-                id="wellness_guardian_20",
-                title="Guardian Malaysia RM20 Voucher",
-                description="Health, beauty and wellness products at Guardian pharmacies",
-                points_required=1000,
-                category="wellness",
-                image_url="https://www.guardian.com.my/images/guardian-logo.png",
-                terms_conditions="Valid for health and beauty products only. Prescription medicines excluded."
-            ),
-            Voucher(
-                id="wellness_fitness_first_trial",
-                title="Fitness First - 3 Day Trial Pass",
-                description="Experience premium fitness facilities with a 3-day trial membership",
-                points_required=400,
-                category="wellness",
-                image_url="https://www.fitnessfirst.com.my/images/ff-logo.png"
-            ),
-            Voucher(
-                id="wellness_yoga_class",
-                title="Pure Yoga - Single Class Pass",
-                description="Join a yoga session at Pure Yoga studios across Malaysia",
-                points_required=350,
-                category="wellness",
-                image_url="https://pureyoga.com.my/images/pure-yoga-logo.png"
-            ),
-            
-            # 购物类
-            Voucher(
-                id="shopping_grab_10",
-                title="Grab Malaysia RM10 Credit",
-                description="Use for GrabFood, GrabCar or GrabMart services",
-                points_required=500,
-                category="shopping",
-                image_url="https://logos-world.net/wp-content/uploads/2020/11/Grab-Logo.png",
-                terms_conditions="Valid for 60 days from redemption date."
-            ),
-            Voucher(
-                id="shopping_shopee_15",
-                title="Shopee Malaysia RM15 Voucher",
-                description="Shop online with Malaysia's leading e-commerce platform",
-                points_required=750,
-                category="shopping",
-                image_url="https://logos-world.net/wp-content/uploads/2020/11/Shopee-Logo.png",
-                terms_conditions="Minimum spend RM30. Valid for 30 days."
-            ),
-            Voucher(
-                id="shopping_lazada_12",
-                title="Lazada Malaysia RM12 Voucher",
-                description="Discover millions of products on Lazada Malaysia",
-                points_required=600,
-                category="shopping",
-                image_url="https://logos-world.net/wp-content/uploads/2020/11/Lazada-Logo.png"
-            ),
-            
-            # 教育类
-            Voucher(
-                id="education_coursera_month",
-                title="Coursera Plus - 1 Month Free",
-                description="Access thousands of courses from top universities and companies",
-                points_required=800,
-                category="education",
-                image_url="https://logos-world.net/wp-content/uploads/2021/11/Coursera-Logo.png",
-                terms_conditions="New subscribers only. Auto-renewal can be cancelled anytime."
-            ),
-            Voucher(
-                id="education_udemy_discount",
-                title="Udemy - 50% Discount Coupon",
-                description="Learn new skills with 50% off any Udemy course",
-                points_required=300,
-                category="education",
-                image_url="https://logos-world.net/wp-content/uploads/2021/11/Udemy-Logo.png"
-            ),
-            
-            # 娱乐类
-            Voucher(
-                id="entertainment_tgv_ticket",
-                title="TGV Cinemas - Movie Ticket",
-                description="Enjoy the latest movies at TGV Cinemas nationwide",
-                points_required=900,
-                category="entertainment",
-                image_url="https://www.tgv.com.my/images/tgv-logo.png",
-                terms_conditions="Valid for regular 2D movies only. Surcharge applies for 3D/IMAX."
-            ),
-            Voucher(
-                id="entertainment_spotify_premium",
-                title="Spotify Premium - 1 Month",
-                description="Enjoy ad-free music streaming with Spotify Premium",
-                points_required=450,
-                category="entertainment",
-                image_url="https://logos-world.net/wp-content/uploads/2020/06/Spotify-Logo.png"
-            )
-        ]
-        
-        # 按类别筛选
-        if category:
-            vouchers = [v for v in vouchers if v.category == category]
-            
-        # 按积分要求排序
-        vouchers.sort(key=lambda x: x.points_required)
+        # 按类别筛选 (catalog is pre-sorted by points required)
+        vouchers = list(_VOUCHERS_BY_CATEGORY.get(category, ()) if category else _VOUCHER_CATALOG)
         
-        logger.info(f"Retrieved {len(vouchers)} available vouchers for category: {category or 'all'}")
+        logger.info("Retrieved %d available vouchers for category: %s", len(vouchers), category or 'all')
         return vouchers
         
     except Exception as e:
@@ -496,161 +675,135 @@ async def redeem_voucher(
             raise HTTPException(status_code=503, detail="Blockchain system not available")
         
         # 1. 获取券信息
-        available_vouchers = await get_available_vouchers(user=user)
-        voucher = next((v for v in available_vouchers if v.id == voucher_id), None)
+        voucher = _VOUCHERS_BY_ID.get(voucher_id)
         
         if not voucher:
             raise HTTPException(status_code=404, detail="Voucher not found")
         
-        # 2. 检查用户积分是否足够
-        user_points = await get_user_points(user)
-        if user_points.available_points < voucher.points_required:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Insufficient points. Required: {voucher.points_required}, Available: {user_points.available_points}"
-            )
-        
-        # 3. Convert points to WELL tokens first (if not already minted)
-        # Then use blockchain.py's gasless redemption system
+        # 2./3. Reserve the points, then convert them to WELL tokens and
+        # redeem via blockchain.py's gasless redemption system
         redeem_result = None
         wallet_address = None
+        reserved = False
 
         try:
-            from config import API_SECRET
-            import hmac, hashlib
-            from web3 import Web3
-
             # 获取用户的Smart Account地址
-            session = blockchain_db()
-            try:
-                # user_id from JWT is already the profile UUID
-                blockchain_user = session.query(Profile).filter(
-                    Profile.id == user_id
-                ).first()
+            # user_id from JWT is already the profile UUID; the sync query runs off the event loop
+            has_profile, smart_account_address = await asyncio.to_thread(_smart_account_address_impl, user_id)
 
-                if not blockchain_user:
-                    raise HTTPException(status_code=400, detail="User blockchain account not found")
+            if not has_profile:
+                raise HTTPException(status_code=400, detail="User blockchain account not found")
 
-                # Get user's smart account address
-                smart_account = session.query(SmartAccountInfo).filter(
-                    SmartAccountInfo.user_id == user_id
-                ).first()
-
-                if not smart_account or not smart_account.smart_account_address:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="No smart account found. Please create a wallet first."
-                    )
+            # Get user's smart account address
+            if not smart_account_address:
+                raise HTTPException(
+                    status_code=400,
+                    detail="No smart account found. Please create a wallet first."
+                )
 
-                wallet_address = Web3.to_checksum_address(smart_account.smart_account_address)
+            wallet_address = Web3.to_checksum_address(smart_account_address)
 
-                # STEP 1: Mint WELL tokens to user's wallet via TRUE Biconomy gasless (coins → tokens conversion)
-                amount_in_tokens = voucher.points_required / 100  # 100 points = 1 WELL
+            # 检查并预扣积分: the balance check is the UPDATE's WHERE clause
+            # (total_points >= n) and RETURNING gives the balance for the response
+            reserved, remaining_points = await asyncio.to_thread(
+                _deduct_points_impl, user_id, voucher.points_required
+            )
 
-                try:
-                    # ✅ Use unified Biconomy gasless minting helper (ERC-4337)
-                    mint_result = await mint_tokens_gasless(
-                        user_id=user_id,
-                        smart_account_address=wallet_address,
-                        token_amount=amount_in_tokens,
-                        request=request
-                    )
+            if not reserved:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient points. Required: {voucher.points_required}, Available: {remaining_points}"
+                )
 
-                    logger.info(f"✅ Biconomy gasless mint for voucher redemption: {amount_in_tokens} WELL → {wallet_address}")
-                    logger.info(f"   UserOp Hash: {mint_result.get('user_op_hash')}")
-                    logger.info(f"   Tx Hash: {mint_result.get('tx_hash')}")
+            # STEP 1: Mint WELL tokens to user's wallet via TRUE Biconomy gasless (coins → tokens conversion)
+            amount_in_tokens = voucher.points_required / 100  # 100 points = 1 WELL
 
-                    # Note: Biconomy handles transaction confirmation internally
-                    # No need to wait for confirmation like old direct minting
+            try:
+                # ✅ Use unified Biconomy gasless minting helper (ERC-4337)
+                mint_result = await mint_tokens_gasless(
+                    user_id=user_id,
+                    smart_account_address=wallet_address,
+                    token_amount=amount_in_tokens,
+                    request=request
+                )
 
-                except Exception as mint_error:
-                    logger.error(f"❌ Biconomy gasless mint failed for voucher redemption: {mint_error}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to convert points to WELL tokens: {str(mint_error)}"
-                    )
+                logger.info(f"✅ Biconomy gasless mint for voucher redemption: {amount_in_tokens} WELL → {wallet_address}")
+                logger.info(f"   UserOp Hash: {mint_result.get('user_op_hash')}")
+                logger.info(f"   Tx Hash: {mint_result.get('tx_hash')}")
 
-                # STEP 2: Now redeem the voucher using the minted WELL tokens
-                # Use ERC-4337 smart account batch execution for gasless redemption
-                redeem_time = int(time.time())
-                redeem_raw_message = f"{wallet_address}|{amount_in_tokens}|{voucher_id}|{redeem_time}"
-                redeem_signature = hmac.new(
-                    API_SECRET.encode(),
-                    redeem_raw_message.encode(),
-                    hashlib.sha256
-                ).hexdigest()
+                # Note: Biconomy handles transaction confirmation internally
+                # No need to wait for confirmation like old direct minting
 
-                redeem_result = None
-                redemption_method = "ERC-4337"
+            except Exception as mint_error:
+                logger.error(f"❌ Biconomy gasless mint failed for voucher redemption: {mint_error}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to convert points to WELL tokens: {str(mint_error)}"
+                )
 
-                # Execute ERC-4337 gasless redemption via smart account
-                try:
-                    from routers.blockchain import aa_wellness_redeem, WellnessRedeemBody
-
-                    redeem_request = WellnessRedeemBody(
-                        smart_account_address=wallet_address,
-                        amount=amount_in_tokens,
-                        reward_id=voucher_id,
-                        ts=redeem_time,
-                        sig=redeem_signature
-                    )
+            # STEP 2: Now redeem the voucher using the minted WELL tokens
+            # Use ERC-4337 smart account batch execution for gasless redemption
+            redeem_time = int(time.time())
+            redeem_mac = _api_hmac.copy()
+            redeem_mac.update(f"{wallet_address}|{amount_in_tokens}|{voucher_id}|{redeem_time}".encode())
+            redeem_signature = redeem_mac.hexdigest()
 
-                    # Execute ERC-4337 gasless redemption via smart account
-                    redeem_result = await aa_wellness_redeem(redeem_request, request)
+            redeem_result = None
+            redemption_method = "ERC-4337"
 
-                    # ✅ CRITICAL: Verify the redemption was actually successful on blockchain
-                    if not redeem_result or not isinstance(redeem_result, dict) or not redeem_result.get("success"):
-                        error_msg = redeem_result.get("error") if isinstance(redeem_result, dict) else "Unknown error"
-                        logger.error(f"❌ Blockchain redemption failed: {error_msg}")
+            # Execute ERC-4337 gasless redemption via smart account
+            try:
+                redeem_request = WellnessRedeemBody(
+                    smart_account_address=wallet_address,
+                    amount=amount_in_tokens,
+                    reward_id=voucher_id,
+                    ts=redeem_time,
+                    sig=redeem_signature
+                )
 
-                        # Redemption failed - don't proceed with point deduction or code generation
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Blockchain redemption failed: {error_msg}. Please contact support."
-                        )
+                # Execute ERC-4337 gasless redemption via smart account
+                async with _biconomy_slots:
+                    redeem_result = await aa_wellness_redeem(redeem_request, request)
 
-                    logger.info(f"✅ ERC-4337 gasless redemption successful for user {user_id}: {redeem_result}")
+                # ✅ CRITICAL: Verify the redemption was actually successful on blockchain
+                if not redeem_result or not isinstance(redeem_result, dict) or not redeem_result.get("success"):
+                    error_msg = redeem_result.get("error") if isinstance(redeem_result, dict) else "Unknown error"
+                    logger.error(f"❌ Blockchain redemption failed: {error_msg}")
 
-                except HTTPException:
-                    # Re-raise HTTP exceptions (these already have proper error messages)
-                    raise
-                except Exception as redemption_error:
-                    logger.error(f"❌ Redemption failed: {redemption_error}")
+                    # Redemption failed - refund the reserved points, no code generation
                     raise HTTPException(
                         status_code=500,
-                        detail=f"Redemption system error: {str(redemption_error)}"
+                        detail=f"Blockchain redemption failed: {error_msg}. Please contact support."
                     )
 
-            finally:
-                session.close()
+                logger.info(f"✅ ERC-4337 gasless redemption successful for user {user_id}: {redeem_result}")
+
+            except HTTPException:
+                # Re-raise HTTP exceptions (these already have proper error messages)
+                raise
+            except Exception as redemption_error:
+                logger.error(f"❌ Redemption failed: {redemption_error}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Redemption system error: {str(redemption_error)}"
+                )
 
         except Exception as blockchain_error:
+            if reserved:
+                # Give back the points reserved above; nothing was redeemed
+                try:
+                    await asyncio.to_thread(_refund_points_impl, user_id, voucher.points_required)
+                except Exception as refund_error:
+                    logger.error(f"Failed to refund reserved points for user {user_id}: {refund_error}")
+            if isinstance(blockchain_error, HTTPException) and blockchain_error.status_code == 400:
+                raise
             logger.error(f"Blockchain redemption failed: {blockchain_error}")
             raise HTTPException(status_code=500, detail=f"Redemption failed: {str(blockchain_error)}")
 
         # 4. 生成兑换码
         redemption_code = f"UNI-{voucher_id.upper()}-{secrets.token_hex(4).upper()}"
 
-        # 5. 更新用户积分
-        session = blockchain_db()
-        try:
-            # user_id from JWT is already the profile UUID
-            user_points_record = session.query(BlockchainUserPoints).filter(
-                BlockchainUserPoints.profile_id == user_id
-            ).first()
-
-            if user_points_record:
-                user_points_record.total_points -= voucher.points_required
-                user_points_record.last_updated = int(time.time())
-                session.commit()
-
-        except Exception as db_error:
-            session.rollback()
-            logger.error(f"Failed to update user points: {db_error}")
-        finally:
-            session.close()
-
-        # 6. Log the redemption activity
+        # 5. Log the redemption activity
         if ACTIVITY_LOGGING_ENABLED:
             try:
                 log_voucher_redemption(
@@ -678,7 +831,7 @@ async def redeem_voucher(
                 "category": voucher.category
             },
             "points_spent": voucher.points_required,
-            "remaining_points": max(0, user_points.available_points - voucher.points_required),
+            "remaining_points": remaining_points,
             "blockchain_tx": redeem_result.get("transaction_hash") if isinstance(redeem_result, dict) else None,
             "method": redemption_method,  # Shows which method was used: ERC-4337 or Standard
             "user_op_hash": redeem_result.get("user_op_hash") if isinstance(redeem_result, dict) else None,
@@ -703,28 +856,23 @@ async def get_my_vouchers(user: Dict[str, Any] = Depends(get_authenticated_user)
         # 从blockchain.py数据库获取用户的voucher记录
         session = blockchain_db()
         try:
-            # 获取用户的区块链记录
-            # user_id from JWT is already the profile UUID
-            blockchain_user = session.query(Profile).filter(
+            # 获取用户的voucher记录, 按兑换时间降序排列
+            # user_id from JWT is already the profile UUID; joining profiles on the
+            # email keeps this one query, and no profile simply means no rows
+            vouchers = session.query(BlockchainVoucher).join(
+                Profile, Profile.email == BlockchainVoucher.address
+            ).filter(
                 Profile.id == user_id
-            ).first()
-
-            if not blockchain_user:
-                return []
-            
-            # 获取用户的voucher记录
-            vouchers = session.query(BlockchainVoucher).filter(
-                BlockchainVoucher.address == blockchain_user.email
-            ).all()
+            ).order_by(
+                BlockchainVoucher.created_at.desc()
+            ).limit(MY_VOUCHERS_LIMIT).all()
             
-            # 获取可用券列表用于匹配
-            available_vouchers = await get_available_vouchers(user=user)
-            voucher_map = {v.id: v for v in available_vouchers}
+            expired_before = time.time() - VOUCHER_VALIDITY_SECONDS
             
             user_vouchers = []
             for v in vouchers:
                 # 匹配voucher信息
-                voucher_info = voucher_map.get(v.reward_id)
+                voucher_info = _VOUCHERS_BY_ID.get(v.reward_id)
                 if not voucher_info:
                     # 如果找不到匹配的券信息，创建基本信息
                     voucher_info = Voucher(
@@ -739,7 +887,7 @@ async def get_my_vouchers(user: Dict[str, Any] = Depends(get_authenticated_user)
                 status = "active"
                 if v.status == "used":
                     status = "used"
-                elif v.created_at < (time.time() - 30 * 24 * 60 * 60):  # 30天过期
+                elif v.created_at < expired_before:
                     status = "expired"
                 
                 user_voucher = UserVoucher(
@@ -751,9 +899,6 @@ async def get_my_vouchers(user: Dict[str, Any] = Depends(get_authenticated_user)
                 )
                 user_vouchers.append(user_voucher)
             
-            # 按兑换时间降序排列
-            user_vouchers.sort(key=lambda x: x.redeemed_at, reverse=True)
-            
             logger.info(f"Retrieved {len(user_vouchers)} vouchers for user {user_id}")
             return user_vouchers
             
@@ -793,114 +938,66 @@ async def earn_points(
             raise HTTPException(status_code=400, detail="Invalid points source")
         
         # 2. 获取或创建用户的区块链记录
-        session = blockchain_db()
-        try:
-            # user_id from JWT is already the profile UUID
-            blockchain_user = session.query(Profile).filter(
-                Profile.id == user_id
-            ).first()
+        # user_id from JWT is already the profile UUID; the sync DB work runs
+        # off the event loop and the points row is only touched after the mint
+        smart_account_address = await asyncio.to_thread(
+            _ensure_profile_impl, user_id, user.get("email", f"user_{user_id}@unimate.app")
+        )
+
+        # 3. Get user's smart account address
+        if not smart_account_address:
+            logger.warning(f"No smart account found for user {user_id}, skipping blockchain mint")
+            mint_result = None
+        else:
+            # 4. 使用TRUE Biconomy gasless mint系统 (ERC-4337)
+            try:
+                # 转换积分为代币 (100 points = 1 WELL token)
+                token_amount = amount / 100.0
 
-            if not blockchain_user:
-                # 创建新的区块链用户记录
-                blockchain_user = Profile(
-                    id=user_id,
-                    email=user.get("email", f"user_{user_id}@unimate.app"),
-                    created_at=int(time.time()),
-                    updated_at=int(time.time())
+                # ✅ Use unified Biconomy gasless minting helper
+                mint_result = await mint_tokens_gasless(
+                    user_id=user_id,
+                    smart_account_address=smart_account_address,
+                    token_amount=token_amount,
+                    request=request
                 )
-                session.add(blockchain_user)
-                session.commit()
-                logger.info(f"Created blockchain user record for {user_id}")
-            
-            # 3. Get user's smart account address
-            smart_account = session.query(SmartAccountInfo).filter(
-                SmartAccountInfo.user_id == user_id
-            ).first()
 
-            if not smart_account or not smart_account.smart_account_address:
-                logger.warning(f"No smart account found for user {user_id}, skipping blockchain mint")
-                mint_result = None
-            else:
-                # 4. 使用TRUE Biconomy gasless mint系统 (ERC-4337)
-                try:
-                    # 转换积分为代币 (100 points = 1 WELL token)
-                    token_amount = amount / 100.0
-
-                    # ✅ Use unified Biconomy gasless minting helper
-                    mint_result = await mint_tokens_gasless(
-                        user_id=user_id,
-                        smart_account_address=smart_account.smart_account_address,
-                        token_amount=token_amount,
-                        request=request
-                    )
+                logger.info(f"✅ Biconomy gasless mint successful: {token_amount} WELL → {smart_account_address}")
 
-                    logger.info(f"✅ Biconomy gasless mint successful: {token_amount} WELL → {smart_account.smart_account_address}")
+            except Exception as blockchain_error:
+                logger.error(f"❌ Biconomy gasless mint failed: {blockchain_error}")
+                # 不要因为区块链错误而失败，可以后续补发
+                mint_result = None
 
-                except Exception as blockchain_error:
-                    logger.error(f"❌ Biconomy gasless mint failed: {blockchain_error}")
-                    # 不要因为区块链错误而失败，可以后续补发
-                    mint_result = None
-            
-            # 4. 更新用户积分记录
-            user_points = session.query(BlockchainUserPoints).filter(
-                BlockchainUserPoints.profile_id == user_id
-            ).first()
+        # 4. 更新用户积分记录
+        new_total, earned_today = await asyncio.to_thread(_add_points_impl, user_id, amount)
 
-            # Use Malaysia timezone for daily reset logic
-            today_str_malaysia = datetime.now(MALAYSIA_TZ).strftime("%Y-%m-%d")
-
-            if user_points:
-                # ✅ Check if we need to reset daily points (Malaysia timezone)
-                if user_points.last_daily_reset != today_str_malaysia:
-                    user_points.earned_today = 0
-                    user_points.last_daily_reset = today_str_malaysia
-                    logger.info(f"Reset earned_today for user {user_id} (new day in MYT: {today_str_malaysia})")
-
-                user_points.total_points += amount
-                user_points.earned_today += amount
-                user_points.last_updated = int(time.time())
-            else:
-                # 创建新的积分记录 (Use Malaysia timezone)
-                user_points = BlockchainUserPoints(
-                    profile_id=blockchain_user.id,
-                    total_points=amount,
-                    earned_today=amount,
-                    last_updated=int(time.time()),
-                    last_daily_reset=today_str_malaysia
+        # 5. Log the points earning activity
+        if ACTIVITY_LOGGING_ENABLED:
+            try:
+                log_points_earned(
+                    profile_id=user_id,
+                    points_earned=amount,
+                    source=source,
+                    description=description,
+                    transaction_hash=mint_result.get("tx_hash") if isinstance(mint_result, dict) and mint_result else None,
+                    smart_account_address=smart_account_address
                 )
-                session.add(user_points)
-
-            session.commit()
+            except Exception as log_error:
+                logger.warning(f"Failed to log points earning activity: {log_error}")
+                # Don't fail the points award if logging fails
 
-            # 5. Log the points earning activity
-            if ACTIVITY_LOGGING_ENABLED:
-                try:
-                    log_points_earned(
-                        profile_id=user_id,
-                        points_earned=amount,
-                        source=source,
-                        description=description,
-                        transaction_hash=mint_result.get("tx_hash") if isinstance(mint_result, dict) and mint_result else None,
-                        smart_account_address=smart_account.smart_account_address if smart_account else None
-                    )
-                except Exception as log_error:
-                    logger.warning(f"Failed to log points earning activity: {log_error}")
-                    # Don't fail the points award if logging fails
+        return {
+            "success": True,
+            "points_earned": amount,
+            "source": source,
+            "description": description,
+            "new_total": new_total,
+            "earned_today": earned_today,
+            "blockchain_tx": mint_result.get("tx_hash") if isinstance(mint_result, dict) else None,
+            "gasless": True
+        }
 
-            return {
-                "success": True,
-                "points_earned": amount,
-                "source": source,
-                "description": description,
-                "new_total": user_points.total_points,
-                "earned_today": user_points.earned_today,
-                "blockchain_tx": mint_result.get("tx_hash") if isinstance(mint_result, dict) else None,
-                "gasless": True
-            }
-            
-        finally:
-            session.close()
-        
     except HTTPException:
         raise
     except Exception as e:
@@ -937,79 +1034,61 @@ async def exchange_points_for_tokens(
         if points_to_exchange < 100:
             raise HTTPException(status_code=400, detail="Minimum exchange is 100 points (1 WELL token)")
 
-        session = blockchain_db()
-        try:
-            # 1. Get or create blockchain user
-            # user_id from JWT is already the profile UUID
-            blockchain_user = session.query(Profile).filter(
-                Profile.id == user_id
-            ).first()
-
-            if not blockchain_user:
-                raise HTTPException(status_code=404, detail="User not found in blockchain system")
-
-            # 2. Check user has sufficient points
-            user_points = session.query(BlockchainUserPoints).filter(
-                BlockchainUserPoints.profile_id == user_id
-            ).first()
+        # 1. Get blockchain user and smart account
+        # user_id from JWT is already the profile UUID; the sync query runs off the event loop
+        has_profile, smart_account_address = await asyncio.to_thread(_smart_account_address_impl, user_id)
 
-            if not user_points or user_points.total_points < points_to_exchange:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Insufficient points. You have {user_points.total_points if user_points else 0}, need {points_to_exchange}"
-                )
+        if not has_profile:
+            raise HTTPException(status_code=404, detail="User not found in blockchain system")
 
-            # 3. Calculate WELL tokens (100 points = 1 WELL)
-            well_tokens = points_to_exchange / 100.0
-
-            # 4. Deduct points atomically
-            user_points.total_points -= points_to_exchange
-            user_points.last_updated = int(time.time())
+        # Check user's smart account address
+        if not smart_account_address:
+            raise HTTPException(
+                status_code=400,
+                detail="No smart account found. Please create a wallet first."
+            )
 
-            # 5. Mint WELL tokens to user's smart account via TRUE Biconomy gasless (ERC-4337)
-            try:
-                # Get user's smart account address
-                smart_account = session.query(SmartAccountInfo).filter(
-                    SmartAccountInfo.user_id == user_id
-                ).first()
+        # 2./4. Check and deduct points atomically (UPDATE ... WHERE total_points >= n),
+        # committed before the mint so no row lock is held across its await
+        deducted, remaining_points = await asyncio.to_thread(_deduct_points_impl, user_id, points_to_exchange)
 
-                if not smart_account or not smart_account.smart_account_address:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="No smart account found. Please create a wallet first."
-                    )
+        if not deducted:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient points. You have {remaining_points}, need {points_to_exchange}"
+            )
 
-                # ✅ Use unified Biconomy gasless minting helper (ERC-4337)
-                mint_result = await mint_tokens_gasless(
-                    user_id=user_id,
-                    smart_account_address=smart_account.smart_account_address,
-                    token_amount=well_tokens,
-                    request=request
-                )
+        # 3. Calculate WELL tokens (100 points = 1 WELL)
+        well_tokens = points_to_exchange / 100.0
 
-                logger.info(f"✅ Biconomy gasless points exchange: {points_to_exchange} points → {well_tokens} WELL")
-                logger.info(f"   UserOp Hash: {mint_result.get('user_op_hash')}")
-
-            except Exception as blockchain_error:
-                # Rollback points deduction if blockchain fails
-                user_points.total_points += points_to_exchange
-                logger.error(f"❌ Biconomy gasless mint failed, rolling back points: {blockchain_error}")
-                raise HTTPException(status_code=500, detail="Token minting failed, points not deducted")
+        # 5. Mint WELL tokens to user's smart account via TRUE Biconomy gasless (ERC-4337)
+        try:
+            # ✅ Use unified Biconomy gasless minting helper (ERC-4337)
+            mint_result = await mint_tokens_gasless(
+                user_id=user_id,
+                smart_account_address=smart_account_address,
+                token_amount=well_tokens,
+                request=request
+            )
 
-            session.commit()
+            logger.info(f"✅ Biconomy gasless points exchange: {points_to_exchange} points → {well_tokens} WELL")
+            logger.info(f"   UserOp Hash: {mint_result.get('user_op_hash')}")
 
-            return {
-                "success": True,
-                "points_exchanged": points_to_exchange,
-                "well_tokens_received": well_tokens,
-                "remaining_points": user_points.total_points,
-                "exchange_rate": "100 points = 1 WELL token",
-                "blockchain_tx": mint_result.get("tx_hash") if isinstance(mint_result, dict) else None,
-                "gasless": True
-            }
+        except Exception as blockchain_error:
+            # Refund the points deduction if blockchain fails
+            await asyncio.to_thread(_refund_points_impl, user_id, points_to_exchange)
+            logger.error(f"❌ Biconomy gasless mint failed, rolling back points: {blockchain_error}")
+            raise HTTPException(status_code=500, detail="Token minting failed, points not deducted")
 
-        finally:
-            session.close()
+        return {
+            "success": True,
+            "points_exchanged": points_to_exchange,
+            "well_tokens_received": well_tokens,
+            "remaining_points": remaining_points,
+            "exchange_rate": "100 points = 1 WELL token",
+            "blockchain_tx": mint_result.get("tx_hash") if isinstance(mint_result, dict) else None,
+            "gasless": True
+        }
 
     except HTTPException:
         raise
@@ -1078,8 +1157,7 @@ async def redeem_voucher_by_id(
     """Redeem voucher by ID - Frontend redeemVoucher() compatibility"""
     try:
         # Find the voucher from available vouchers
-        available_vouchers = await get_available_vouchers()
-        voucher = next((v for v in available_vouchers if v.id == voucher_id), None)
+        voucher = _VOUCHERS_BY_ID.get(voucher_id)
 
         if not voucher:
             raise HTTPException(status_code=404, detail="Voucher not found")
@@ -1097,7 +1175,6 @@ async def redeem_voucher_by_id(
             raise HTTPException(status_code=400, detail="Insufficient points")
 
         # Record the redemption - Use existing redeem_voucher function
-        from fastapi import Request
         request = Request({"type": "http", "method": "POST"})
         return await redeem_voucher(voucher_id, user, request)
 
@@ -1125,8 +1202,10 @@ def award_daily_action_points(user_id: str, action_id: str):
     This function runs as a FastAPI background task and manages its own DB session.
     Returns True if points were awarded, False if already completed today
     
-    Uses database-level locking (SELECT FOR UPDATE) to prevent race conditions
-    when multiple requests try to award points simultaneously.
+    "Already completed today" is claimed with one INSERT into
+    daily_action_completions (unique per user/action/day, ON CONFLICT DO
+    NOTHING); the user_points row is then locked (SELECT FOR UPDATE) for the
+    balance update.
     """
     # Create a new database session for this background task
     session = blockchain_db()
@@ -1147,65 +1226,29 @@ def award_daily_action_points(user_id: str, action_id: str):
             return False
 
         points_amount = ACTION_POINTS[action_id]
-        today_str_malaysia = datetime.now(MALAYSIA_TZ).strftime("%Y-%m-%d")
-        
-        # ✅ FIX: Use database-level atomic check within transaction
-        # Calculate start and end of today in Malaysia timezone, converted to UTC
-        start_of_today_malaysia = datetime.now(MALAYSIA_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_today_malaysia = start_of_today_malaysia + timedelta(days=1)
-        
-        # Convert to UTC for database comparison (database stores timestamps in UTC)
-        start_of_today_utc = start_of_today_malaysia.astimezone(ZoneInfo("UTC"))
-        end_of_today_utc = end_of_today_malaysia.astimezone(ZoneInfo("UTC"))
+        today_str_malaysia = _today_bounds_utc()[0]
 
-        # ✅ FIX: Check if already completed today using direct database query
-        # This is more reliable than calling get_user_activity_logs which may have caching issues
-        if ACTIVITY_LOGGING_ENABLED:
-            from models import ActivityLog
-            
-            # Direct database query to check if action was already completed today
-            # Query all points_earned logs for this user today, then filter by details.source in Python
-            logs_today = session.query(ActivityLog).filter(
-                ActivityLog.profile_id == user_id,
-                ActivityLog.activity_type == "points_earned",
-                ActivityLog.created_at >= start_of_today_utc,
-                ActivityLog.created_at < end_of_today_utc
-            ).all()
-            
-            # Check if any log has the matching source in details JSONB
-            for log in logs_today:
-                if log.details and isinstance(log.details, dict):
-                    if log.details.get("source") == f"daily_action_{action_id}":
-                        logger.info(f"⏭️  Action {action_id} already completed today for user {user_id} (found log ID: {log.id})")
-                        return False
+        # ✅ Claim today's completion with one indexed INSERT; a concurrent claim
+        # for the same user/action/day waits on the unique index, then conflicts.
+        # No row inserted = already awarded today
+        claimed = session.execute(
+            pg_insert(DailyActionCompletion).values(
+                profile_id=user_id,
+                action_id=action_id,
+                date=today_str_malaysia
+            ).on_conflict_do_nothing(constraint="uq_daily_action_completion")
+        )
+        if claimed.rowcount == 0:
+            logger.info(f"⏭️  Action {action_id} already completed today for user {user_id}")
+            return False
 
         # ✅ FIX: Use SELECT FOR UPDATE to lock the user_points record
-        # This prevents concurrent requests from both awarding points
+        # This prevents a concurrent award of another action from overwriting this one
         # Lock the user_points record for update (blocks other transactions until this one commits)
         user_points = session.query(BlockchainUserPoints).filter(
             BlockchainUserPoints.profile_id == user_id
         ).with_for_update().first()
 
-        # ✅ FIX: Double-check after acquiring lock (another request might have just completed)
-        # This is important because we check before locking, then lock, then check again
-        if ACTIVITY_LOGGING_ENABLED:
-            from models import ActivityLog
-            
-            # Re-check after lock to prevent race condition
-            logs_after_lock = session.query(ActivityLog).filter(
-                ActivityLog.profile_id == user_id,
-                ActivityLog.activity_type == "points_earned",
-                ActivityLog.created_at >= start_of_today_utc,
-                ActivityLog.created_at < end_of_today_utc
-            ).all()
-            
-            # Check if any log has the matching source in details JSONB
-            for log in logs_after_lock:
-                if log.details and isinstance(log.details, dict):
-                    if log.details.get("source") == f"daily_action_{action_id}":
-                        logger.info(f"⏭️  Action {action_id} already completed today for user {user_id} (found after lock, log ID: {log.id})")
-                        return False
-
         if user_points:
             # Check daily reset
             if user_points.last_daily_reset != today_str_malaysia:
@@ -1227,7 +1270,8 @@ def award_daily_action_points(user_id: str, action_id: str):
             )
             session.add(user_points)
 
-        # ✅ Log activity BEFORE commit to ensure it's visible for duplicate checks
+        # Activity log is the audit trail (and /points/history source); duplicate
+        # checks use daily_action_completions
         if ACTIVITY_LOGGING_ENABLED:
             try:
                 log_points_earned(
@@ -1244,6 +1288,7 @@ def award_daily_action_points(user_id: str, action_id: str):
 
         # ✅ Commit transaction (releases lock)
         session.commit()
+        invalidate_points(user_id)
 
         logger.info(f"✅ Awarded {points_amount} points for {action_id} to user {user_id}")
         return True
@@ -1295,10 +1340,7 @@ async def get_today_earn_actions(user: Dict[str, Any] = Depends(get_authenticate
     try:
         user_id = user["sub"]
         # ✅ Fix: Use Malaysia timezone
-        today_malaysia = datetime.now(MALAYSIA_TZ).date()
-        today_str = today_malaysia.strftime("%Y-%m-%d")
-        today_start_myt = datetime.combine(today_malaysia, dt_time.min, tzinfo=MALAYSIA_TZ)
-        today_start = today_start_myt.isoformat()
+        today_str, today_start, _ = _today_bounds_utc()
 
         if not BLOCKCHAIN_INTEGRATION:
             # Return default actions if blockchain not available
@@ -1313,7 +1355,6 @@ async def get_today_earn_actions(user: Dict[str, Any] = Depends(get_authenticate
             }
 
         # Use SQLAlchemy ORM (same as rest of rewards.py)
-        from models import Task, Reminder, UserChallenge
         session = blockchain_db()
 
         try:
@@ -1328,39 +1369,41 @@ async def get_today_earn_actions(user: Dict[str, Any] = Depends(get_authenticate
                 completed=True  # If they can call this API, they're logged in
             ))
 
-            # 2. Add a task (check tasks table for today)
-            task_count = session.query(Task).filter(
-                Task.user_id == user_id,
-                Task.created_at >= today_start
-            ).count()
-
+            # 2.-5. Task / reminder / completed challenges today - all in one round-trip.
+            # EXISTS stops at the first matching row; only "any today?" matters
+            has_task, has_reminder, challenge_count = session.query(
+                session.query(Task.id).filter(
+                    Task.user_id == user_id,
+                    Task.created_at >= today_start
+                ).exists(),
+                session.query(Reminder.id).filter(
+                    Reminder.user_id == user_id,
+                    Reminder.created_at >= today_start
+                ).exists(),
+                session.query(func.count(UserChallenge.id)).filter(
+                    UserChallenge.profile_id == user_id,
+                    UserChallenge.date == today_str,
+                    UserChallenge.status == "completed"
+                ).scalar_subquery()
+            ).one()
+
+            # 2. Add a task
             actions.append(DailyEarnAction(
                 id="add_task",
                 label="Add a task",
                 points=5,
-                completed=task_count > 0
+                completed=has_task
             ))
 
-            # 3. Add a reminder (check reminders table for today)
-            reminder_count = session.query(Reminder).filter(
-                Reminder.user_id == user_id,
-                Reminder.created_at >= today_start
-            ).count()
-
+            # 3. Add a reminder
             actions.append(DailyEarnAction(
                 id="add_reminder",
                 label="Add a reminder",
                 points=10,
-                completed=reminder_count > 0
+                completed=has_reminder
             ))
 
-            # 4. Complete a daily challenge (check user_challenges for today)
-            challenge_count = session.query(UserChallenge).filter(
-                UserChallenge.profile_id == user_id,
-                UserChallenge.date == today_str,
-                UserChallenge.status == "completed"
-            ).count()
-
+            # 4. Complete a daily challenge
             actions.append(DailyEarnAction(
                 id="complete_1_challenge",
                 label="Complete a daily challenge",
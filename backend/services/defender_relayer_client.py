@@ -14,6 +14,44 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+class RelayerError(Exception):
+    """Relayer API rejected or failed a request"""
+
+class RelayerAuthError(RelayerError):
+    """Relayer API rejected our credentials (401/403)"""
+
+class RelayerTimeoutError(RelayerError):
+    """Relayer API did not answer within the client timeout"""
+
+def _raise_for_status(response: httpx.Response):
+    """Map an HTTP error response from the relayer API to a RelayerError"""
+    if response.status_code in (401, 403):
+        raise RelayerAuthError(f"Relayer auth error: {response.text}")
+    if response.status_code >= 400:
+        raise RelayerError(f"Relayer error: {response.text}")
+
+def function_selector(function_signature: str) -> bytes:
+    """4-byte selector for e.g. "batchReconcile(address[],uint256[])" """
+    return bytes(Web3.keccak(text=function_signature)[:4])
+
+def encode_with_selector(selector: bytes, param_types, param_values) -> str:
+    """
+    Encode call data from a precomputed selector
+
+    Lets hot callers hash their function signature once at import and only
+    ABI-encode the arguments per call.
+    """
+    return "0x" + (selector + encode(param_types, param_values)).hex()
+
+def encode_no_arg_call(function_signature: str) -> str:
+    """
+    Encode call data for a function without parameters, e.g. "pause()"
+
+    The result is just the 4-byte selector, so callers can compute it once
+    at import instead of per request.
+    """
+    return "0x" + function_selector(function_signature).hex()
+
 class DefenderRelayerClient:
     """Client for OpenZeppelin Defender Relayer API with JWT authentication"""
 
@@ -26,7 +64,17 @@ class DefenderRelayerClient:
         self.api_url = api_url or settings.DEFENDER_API_URL
         self.api_key = api_key or settings.DEFENDER_API_KEY
         self.api_secret = api_secret or settings.DEFENDER_API_SECRET
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled HTTP/2 client for every relayer call, so submissions and
+        # status polls reuse warm connections instead of new TCP+TLS handshakes
+        # (pool settings live on the transport, which also retries failed connects)
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+            )
+        )
 
         # JWT token caching
         self._token_cache: Optional[str] = None
@@ -95,6 +143,11 @@ class DefenderRelayerClient:
                 "status": "pending",
                 "hash": null  // Set when mined
             }
+
+        Raises:
+            RelayerAuthError: Credentials rejected (401/403)
+            RelayerTimeoutError: No answer within the client timeout
+            RelayerError: Any other error response
         """
         try:
             payload = {
@@ -119,14 +172,15 @@ class DefenderRelayerClient:
                 }
             )
 
-            if response.status_code >= 400:
-                logger.error(f"Relayer transaction failed: {response.text}")
-                raise Exception(f"Relayer error: {response.text}")
+            _raise_for_status(response)
 
             result = response.json()
             logger.info(f"Transaction submitted: {result.get('transaction_id')}")
             return result
 
+        except httpx.TimeoutException as e:
+            logger.error(f"Relayer transaction timed out: {e}")
+            raise RelayerTimeoutError(f"Relayer timeout: {e}") from e
         except Exception as e:
             logger.error(f"Failed to send transaction via relayer: {e}")
             raise
@@ -156,7 +210,11 @@ class DefenderRelayerClient:
                 f"{self.api_url}/relayers/{relayer_id}/txs/{transaction_id}",
                 headers={"Authorization": f"Bearer {auth_token}"}
             )
+            _raise_for_status(response)
             return response.json()
+        except httpx.TimeoutException as e:
+            logger.error(f"Relayer status lookup timed out: {e}")
+            raise RelayerTimeoutError(f"Relayer timeout: {e}") from e
         except Exception as e:
             logger.error(f"Failed to get transaction status: {e}")
             raise
@@ -179,10 +237,7 @@ class DefenderRelayerClient:
             Encoded data as hex string (0x...)
         """
         try:
-            function_selector = Web3.keccak(text=function_signature)[:4]
-            encoded_params = encode(param_types, param_values)
-            data = "0x" + (function_selector + encoded_params).hex()
-            return data
+            return encode_with_selector(function_selector(function_signature), param_types, param_values)
         except Exception as e:
             logger.error(f"Failed to encode function call: {e}")
             raise
@@ -216,3 +271,10 @@ def get_relayer_client() -> Optional[DefenderRelayerClient]:
         )
         logger.info(f"✅ Defender client initialized: {settings.DEFENDER_API_URL}")
     return _relayer_client
+
+async def close_relayer_client():
+    """Close the singleton relayer client's HTTP pool (called on app shutdown)"""
+    global _relayer_client
+    if _relayer_client is not None:
+        await _relayer_client.close()
+        _relayer_client = None
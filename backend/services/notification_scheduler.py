@@ -13,7 +13,8 @@ NOTE: For production, consider adding `last_notification_sent_at` columns to Tas
 for persistent deduplication tracking across server restarts.
 """
 
-from models import db, Task, Reminder, PushToken
+from models import db, Task, Reminder
+from services.pushtoken_cache import get_active_tokens
 from services.push_notifications import (
     send_task_reminder,
     send_reminder_notification
@@ -110,11 +111,8 @@ async def check_and_send_task_reminders():
                         logger.debug(f"Skipping task {task.id} - notification sent recently")
                         continue
 
-                    # Get user's active push tokens
-                    push_tokens = session.query(PushToken).filter(
-                        PushToken.profile_id == task.user_id,
-                        PushToken.is_active == True
-                    ).all()
+                    # Get user's active push tokens (just the strings we send to)
+                    push_tokens = get_active_tokens(session, task.user_id)
 
                     if not push_tokens:
                         logger.debug(f"No push tokens for user {task.user_id}, skipping task {task.id}")
@@ -123,7 +121,7 @@ async def check_and_send_task_reminders():
                     # Send notification to all user's devices
                     for token in push_tokens:
                         result = await send_task_reminder(
-                            push_token=token.push_token,
+                            push_token=token["push_token"],
                             task_title=task.title,
                             task_id=str(task.id),
                             minutes_before=remind_minutes,
@@ -132,7 +130,7 @@ async def check_and_send_task_reminders():
 
                         if result["success"]:
                             notifications_sent += 1
-                            logger.info(f"✅ Sent task reminder for '{task.title}' to {token.device_type} device")
+                            logger.info(f"✅ Sent task reminder for '{task.title}' to {token['device_type']} device")
                         else:
                             errors += 1
                             logger.warning(f"❌ Failed to send task reminder: {result.get('error')}")
@@ -196,11 +194,8 @@ async def check_and_send_reminder_notifications():
                     logger.debug(f"Skipping reminder {reminder.id} - notification sent recently")
                     continue
 
-                # Get user's active push tokens
-                push_tokens = session.query(PushToken).filter(
-                    PushToken.profile_id == reminder.user_id,
-                    PushToken.is_active == True
-                ).all()
+                # Get user's active push tokens (just the strings we send to)
+                push_tokens = get_active_tokens(session, reminder.user_id)
 
                 if not push_tokens:
                     logger.debug(f"No push tokens for user {reminder.user_id}, skipping reminder {reminder.id}")
@@ -210,7 +205,7 @@ async def check_and_send_reminder_notifications():
                 sent_count = 0
                 for token in push_tokens:
                     result = await send_reminder_notification(
-                        push_token=token.push_token,
+                        push_token=token["push_token"],
                         reminder_title=reminder.title,
                         reminder_id=str(reminder.id),
                         reminder_description=reminder.description
@@ -219,7 +214,7 @@ async def check_and_send_reminder_notifications():
                     if result["success"]:
                         sent_count += 1
                         notifications_sent += 1
-                        logger.info(f"✅ Sent reminder notification for '{reminder.title}' to {token.device_type} device")
+                        logger.info(f"✅ Sent reminder notification for '{reminder.title}' to {token['device_type']} device")
                     else:
                         errors += 1
                         logger.warning(f"❌ Failed to send reminder notification: {result.get('error')}")
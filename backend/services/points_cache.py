@@ -0,0 +1,52 @@
+"""
+User Points Cache
+=================
+Caches the GET /rewards/points response per user and Malaysia day in Redis,
+so repeat polls skip the database entirely.
+
+Entries live for POINTS_CACHE_TTL seconds and are invalidated write-through
+whenever the user's points change (daily actions, earn, exchange, voucher
+redemption, challenge completion). The TTL stays short because a read that
+started before a write committed can still store the old value after the
+write invalidated it. The day is part of the key, so a new Malaysia day
+never serves yesterday's earned_today.
+
+Only the SQLAlchemy points path is cached; the Supabase fallback depends on
+tasks, reminders and challenges whose writes do not invalidate.
+
+Usage:
+    from services.points_cache import get_cached_points, cache_points, invalidate_points
+
+    cached = get_cached_points(user_id)
+    # {"total_points": 120, "available_points": 120, "earned_today": 15, "earned_this_week": 105}
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from services.redis_service import get_redis_client
+
+POINTS_CACHE_TTL = 60  # seconds
+
+# "Today" for points is the Malaysia day, as in routers/rewards.py
+MALAYSIA_TZ = ZoneInfo("Asia/Kuala_Lumpur")
+
+
+def _cache_key(user_id: str) -> str:
+    return f"user_points:{user_id}:{datetime.now(MALAYSIA_TZ).date().isoformat()}"
+
+
+def get_cached_points(user_id: str) -> Optional[Dict[str, Any]]:
+    """Cached points response for today, or None on a miss."""
+    return get_redis_client().get_json(_cache_key(user_id))
+
+
+def cache_points(user_id: str, points: Dict[str, Any]) -> None:
+    """Store today's points response for POINTS_CACHE_TTL seconds."""
+    get_redis_client().set_json(_cache_key(user_id), points, ttl=POINTS_CACHE_TTL)
+
+
+def invalidate_points(user_id: str) -> None:
+    """Drop a user's cached points after their user_points row changes."""
+    get_redis_client().delete_json(_cache_key(user_id))
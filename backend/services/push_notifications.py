@@ -6,20 +6,142 @@ Handles sending push notifications via Expo Push Notification API.
 Features:
 - Send individual notifications
 - Send batch notifications
+- Broadcast to many users from one token query
 - Support for iOS and Android via Expo
 - Automatic retry logic
+- Shared HTTP/2 client with a process-wide, 429-adaptive concurrency cap
 - Error handling and logging
 """
 
+import asyncio
+import os
+import time
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 import logging
+from sqlalchemy import select
+
+from models import PushToken
+from services.pushtoken_cache import prune_dead_tokens
 
 logger = logging.getLogger(__name__)
 
 EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
 MAX_BATCH_SIZE = 100  # Expo's max batch size
 
+# Process-wide client: keeps the TLS connection to Expo warm and lets
+# concurrent pushes multiplex over HTTP/2 instead of a handshake per send
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared Expo HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            }
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared Expo HTTP client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class _AdaptiveLimiter:
+    """
+    Caps in-flight Expo requests process-wide. The cap halves whenever Expo
+    answers 429 and creeps back up by one per accepted request (AIMD).
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def record(self, throttled: bool):
+        if throttled:
+            self.limit = max(1, self.limit // 2)
+            logger.warning("Expo throttled push requests, concurrency cap now %s", self.limit)
+        elif self.limit < self.max_limit:
+            self.limit += 1
+
+
+_limiter = _AdaptiveLimiter(int(os.getenv("PUSH_MAX_CONCURRENCY", "32")))
+
+# In-flight dispatches keyed by caller-chosen key (see single_flight)
+_inflight: Dict[Any, "asyncio.Future"] = {}
+
+
+# Monotonic deadline before which Expo has asked us to back off (Retry-After)
+_expo_paused_until = 0.0
+
+
+def expo_retry_after() -> int:
+    """Seconds left on Expo's last Retry-After, or 0 if not throttled."""
+    remaining = _expo_paused_until - time.monotonic()
+    return int(remaining) + 1 if remaining > 0 else 0
+
+
+def _note_expo_throttle(response: httpx.Response):
+    """Remember how long Expo asked us to wait after a 429."""
+    global _expo_paused_until
+    try:
+        delay = float(response.headers.get("retry-after", 30))
+    except ValueError:
+        delay = 30.0
+    _expo_paused_until = max(_expo_paused_until, time.monotonic() + delay)
+
+
+async def _post_to_expo(payload: Any, timeout: float) -> httpx.Response:
+    """POST to Expo through the shared client, under the concurrency cap."""
+    client = await get_client()
+    async with _limiter:
+        response = await client.post(EXPO_PUSH_URL, json=payload, timeout=timeout)
+        throttled = response.status_code == 429
+        _limiter.record(throttled=throttled)
+    if throttled:
+        _note_expo_throttle(response)
+    return response
+
+
+async def single_flight(key: Any, send: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run send() once per key at a time: callers arriving while a dispatch
+    with the same key is in flight share its result instead of re-sending.
+
+    Args:
+        key: Hashable dedup key, e.g. (user_id, title, body)
+        send: Zero-arg coroutine function performing the dispatch
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(send())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
 
 async def send_push_notification(
     push_token: str,
@@ -47,7 +169,7 @@ async def send_push_notification(
     """
     # Validate token format
     if not push_token or not push_token.startswith("ExponentPushToken["):
-        logger.error(f"Invalid push token format: {push_token[:30]}...")
+        logger.error("Invalid push token format: %s...", push_token[:30])
         return {"success": False, "error": "Invalid token format"}
 
     # Build message
@@ -65,54 +187,47 @@ async def send_push_notification(
         message["badge"] = badge
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                EXPO_PUSH_URL,
-                json=message,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            logger.debug(f"Expo response: {result}")
-
-            # Check for errors in Expo's response
-            if result.get("data") and len(result["data"]) > 0:
-                ticket = result["data"][0]
-                if ticket.get("status") == "error":
-                    error_msg = ticket.get("message", "Unknown error")
-                    error_details = ticket.get("details", {})
-                    logger.error(f"❌ Expo rejected notification: {error_msg}, Details: {error_details}")
-                    return {"success": False, "error": error_msg}
-                elif ticket.get("status") == "ok":
-                    logger.info(f"✅ Push notification sent successfully to {push_token[:30]}...")
-                    return {"success": True, "result": result}
-
-            logger.warning(f"⚠️  Unexpected Expo response format: {result}")
-            return {"success": True, "result": result}  # Assume success if no explicit error
+        response = await _post_to_expo(message, timeout=10.0)
+        response.raise_for_status()
+        result = response.json()
+
+        logger.debug("Expo response: %s", result)
+
+        # Check for errors in Expo's response
+        if result.get("data") and len(result["data"]) > 0:
+            ticket = result["data"][0]
+            if ticket.get("status") == "error":
+                error_msg = ticket.get("message", "Unknown error")
+                error_details = ticket.get("details", {})
+                logger.error("❌ Expo rejected notification: %s, Details: %s", error_msg, error_details)
+                return {"success": False, "error": error_msg}
+            elif ticket.get("status") == "ok":
+                logger.info("✅ Push notification sent successfully to %s...", push_token[:30])
+                return {"success": True, "result": result}
+
+        logger.warning("⚠️  Unexpected Expo response format: %s", result)
+        return {"success": True, "result": result}  # Assume success if no explicit error
 
     except httpx.TimeoutException:
-        logger.error(f"❌ Timeout sending push notification")
+        logger.error("❌ Timeout sending push notification")
         return {"success": False, "error": "Request timeout"}
     except httpx.HTTPStatusError as e:
-        logger.error(f"❌ HTTP error sending push notification: {e}")
+        logger.error("❌ HTTP error sending push notification: %s", e)
         return {"success": False, "error": str(e)}
     except Exception as e:
-        logger.error(f"❌ Failed to send push notification: {e}")
+        logger.error("❌ Failed to send push notification: %s", e)
         return {"success": False, "error": str(e)}
 
 
 async def send_batch_notifications(
-    notifications: List[Dict[str, Any]]
-) -> Dict[str, Any]:
+    messages: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
     """
-    Send multiple push notifications in batch (up to 100 at once).
+    Send many push notifications using Expo's multi-message API, one POST per
+    chunk of up to 100 messages, with the chunks sent concurrently.
 
     Args:
-        notifications: List of notification dicts, each with:
+        messages: List of message dicts, each with:
             - to: push token
             - title: notification title
             - body: notification body
@@ -121,71 +236,114 @@ async def send_batch_notifications(
             - priority: optional priority
 
     Returns:
-        Dict with success status and results
+        One result dict per input message, in the same order, with success
+        status and error / error_code (e.g. 'DeviceNotRegistered') on failure
     """
-    if not notifications:
-        return {"success": True, "count": 0}
-
-    # Validate batch size
-    if len(notifications) > MAX_BATCH_SIZE:
-        logger.warning(f"Batch size {len(notifications)} exceeds max {MAX_BATCH_SIZE}, splitting...")
-        # Split into multiple batches
-        results = []
-        for i in range(0, len(notifications), MAX_BATCH_SIZE):
-            batch = notifications[i:i + MAX_BATCH_SIZE]
-            result = await send_batch_notifications(batch)
-            results.append(result)
-        return {
-            "success": all(r["success"] for r in results),
-            "batches": len(results),
-            "results": results
-        }
-
-    # Add default fields to each notification
-    messages = []
-    for notif in notifications:
-        message = {
-            "to": notif["to"],
-            "title": notif.get("title", "UniMate"),
-            "body": notif.get("body", "You have a notification"),
-            "data": notif.get("data", {}),
-            "sound": notif.get("sound", "default"),
-            "priority": notif.get("priority", "high"),
+    results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+
+    # Reject malformed tokens locally, send the rest
+    pending = []  # (index, expo message)
+    for i, msg in enumerate(messages):
+        token = msg.get("to") or ""
+        if not token.startswith("ExponentPushToken["):
+            results[i] = {"success": False, "error": "Invalid token format"}
+            continue
+        pending.append((i, {
+            "to": token,
+            "title": msg.get("title", "UniMate"),
+            "body": msg.get("body", "You have a notification"),
+            "data": msg.get("data") or {},
+            "sound": msg.get("sound", "default"),
+            "priority": msg.get("priority", "high"),
             "channelId": "default"
-        }
-        messages.append(message)
+        }))
 
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                EXPO_PUSH_URL,
-                json=messages,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
+    async def _send_chunk(chunk):
+        try:
+            response = await _post_to_expo([message for _, message in chunk], timeout=30.0)
             response.raise_for_status()
-            result = response.json()
+            tickets = response.json().get("data", [])
+        except Exception as e:
+            logger.error("❌ Failed to send push batch of %s: %s", len(chunk), e)
+            for index, _ in chunk:
+                results[index] = {"success": False, "error": str(e)}
+            return
+
+        # Tickets come back in the same order as the messages
+        for (index, _), ticket in zip(chunk, tickets):
+            if ticket.get("status") == "error":
+                results[index] = {
+                    "success": False,
+                    "error": ticket.get("message", "Unknown error"),
+                    "error_code": (ticket.get("details") or {}).get("error")
+                }
+            else:
+                results[index] = {"success": True, "result": ticket}
+        for index, _ in chunk[len(tickets):]:
+            results[index] = {"success": False, "error": "Missing push ticket"}
 
-            # Count successes and errors
-            tickets = result.get("data", [])
-            success_count = sum(1 for t in tickets if t.get("status") != "error")
-            error_count = sum(1 for t in tickets if t.get("status") == "error")
+    await asyncio.gather(*(
+        _send_chunk(pending[i:i + MAX_BATCH_SIZE])
+        for i in range(0, len(pending), MAX_BATCH_SIZE)
+    ))
 
-            logger.info(f"✅ Sent batch of {len(messages)} notifications: {success_count} success, {error_count} errors")
+    return results
 
-            return {
-                "success": True,
-                "total": len(messages),
-                "success_count": success_count,
-                "error_count": error_count,
-                "result": result
-            }
 
-    except Exception as e:
-        logger.error(f"❌ Failed to send batch notifications: {e}")
-        return {"success": False, "error": str(e)}
+def _active_token_rows(session, user_ids: List[Any]) -> List[Any]:
+    """(profile_id, push_token) of every active device of the given users."""
+    return session.execute(
+        select(PushToken.profile_id, PushToken.push_token)
+        .where(PushToken.profile_id.in_(user_ids), PushToken.is_active.is_(True))
+    ).all()
+
+
+async def broadcast_push(
+    session,
+    user_ids: List[Any],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None
+) -> Dict[Any, bool]:
+    """
+    Push the same notification to every active device of many users.
+
+    Loads all tokens with one push_tokens query, then sends them through
+    send_batch_notifications (one Expo POST per 100 tokens), and
+    deactivates any tokens Expo reports as DeviceNotRegistered. The session
+    is synchronous, so the token query and the prune run via
+    asyncio.to_thread rather than on the event loop.
+
+    Args:
+        session: Database session
+        user_ids: Profile IDs to notify
+        title: Notification title
+        body: Notification message
+        data: Additional data to send with notification
+
+    Returns:
+        Dict mapping each profile ID that has active tokens to whether at
+        least one of its devices accepted the notification
+    """
+    if not user_ids:
+        return {}
+
+    rows = await asyncio.to_thread(_active_token_rows, session, user_ids)
+    if not rows:
+        return {}
+
+    push_tokens = [push_token for _, push_token in rows]
+    results = await send_batch_notifications([
+        {"to": push_token, "title": title, "body": body, "data": data}
+        for push_token in push_tokens
+    ])
+
+    delivered: Dict[Any, bool] = {}
+    for (profile_id, _), result in zip(rows, results):
+        delivered[profile_id] = delivered.get(profile_id, False) or result["success"]
+
+    await asyncio.to_thread(prune_dead_tokens, session, push_tokens, results)
+    return delivered
 
 
 async def send_task_reminder(
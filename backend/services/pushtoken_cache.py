@@ -0,0 +1,109 @@
+"""
+Push Token Cache
+================
+Caches each user's active push tokens in Redis so outbound notifications
+don't re-run the same push_tokens query on every send.
+
+Entries live for PUSH_TOKEN_CACHE_TTL seconds and are invalidated
+write-through whenever the user's tokens are registered, unregistered,
+or pruned after Expo reports them dead.
+
+Usage:
+    from services.pushtoken_cache import get_active_tokens, invalidate_active_tokens
+
+    tokens = get_active_tokens(session, user_id)
+    # [{"push_token": "ExponentPushToken[...]", "device_type": "ios", "created_at": "..."}]
+"""
+
+from typing import List, Dict, Any
+import logging
+from sqlalchemy import select, update
+
+from models import PushToken, push_token_hash
+from services.redis_service import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+PUSH_TOKEN_CACHE_TTL = 300  # 5 minutes
+
+
+def _cache_key(user_id: str) -> str:
+    return f"pushtokens:{user_id}"
+
+
+def get_active_tokens(session, user_id: str) -> List[Dict[str, Any]]:
+    """
+    Get a user's active push tokens, from cache when possible.
+
+    Args:
+        session: Database session used on a cache miss
+        user_id: Profile ID
+
+    Returns:
+        List of dicts with push_token, device_type and created_at (ISO string)
+    """
+    redis_client = get_redis_client()
+    cached = redis_client.get_json(_cache_key(user_id))
+    if cached is not None:
+        return cached
+
+    rows = session.execute(
+        select(PushToken.push_token, PushToken.device_type, PushToken.created_at)
+        .where(PushToken.profile_id == user_id, PushToken.is_active.is_(True))
+    ).all()
+
+    result = [
+        {
+            "push_token": push_token,
+            "device_type": device_type,
+            "created_at": created_at.isoformat() if created_at else None
+        }
+        for push_token, device_type, created_at in rows
+    ]
+
+    redis_client.set_json(_cache_key(user_id), result, ttl=PUSH_TOKEN_CACHE_TTL)
+    return result
+
+
+def invalidate_active_tokens(user_id: str) -> None:
+    """Drop a user's cached tokens after their push_tokens rows change."""
+    get_redis_client().delete_json(_cache_key(user_id))
+
+
+def prune_dead_tokens(session, push_tokens: List[str], results: List[Dict[str, Any]]) -> int:
+    """
+    Deactivate tokens Expo reported as DeviceNotRegistered, in one UPDATE.
+
+    Args:
+        session: Database session (committed here if anything was pruned)
+        push_tokens: Tokens that were sent to
+        results: Per-token results from send_batch_notifications, same order
+
+    Returns:
+        Number of tokens deactivated
+    """
+    dead = [
+        token for token, result in zip(push_tokens, results)
+        if result.get("error_code") == "DeviceNotRegistered"
+    ]
+    if not dead:
+        return 0
+
+    owners = session.execute(
+        update(PushToken)
+        .where(
+            PushToken.push_token_hash.in_([push_token_hash(token) for token in dead]),
+            PushToken.push_token.in_(dead),
+            PushToken.is_active.is_(True)
+        )
+        .values(is_active=False)
+        .returning(PushToken.profile_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    session.commit()
+
+    for user_id in set(owners):
+        invalidate_active_tokens(user_id)
+
+    logger.info("Deactivated %s unregistered push token(s)", len(owners))
+    return len(owners)
@@ -0,0 +1,162 @@
+"""
+Relayer Reconcile Batcher
+=========================
+Coalesces /relayer/backend-ops/reconcile-points calls that arrive within
+BATCH_WINDOW seconds into as few batchReconcile transactions as possible,
+and spreads those transactions across the configured Defender relayers
+(settings.DEFENDER_RELAYER_IDS) by fewest in-flight submissions.
+
+Each caller's addresses stay together in one transaction (a request is at
+most MAX_RECONCILE_BATCH users), so every caller gets back the relayer
+result of exactly the transaction that carries its users.
+
+The drain task is started on first use and cancelled by stop().
+
+Usage:
+    batcher = ReconcileBatcher(settings.DEFENDER_RELAYER_IDS, REDEMPTION_SYSTEM_ADDRESS)
+    result = await batcher.submit(addresses, points)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from services.defender_relayer_client import get_relayer_client, function_selector
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW = 0.05  # seconds to wait for more requests after the first
+MAX_RECONCILE_BATCH = 200  # users per batchReconcile tx (gas limit)
+RECONCILE_GAS_LIMIT = 500000  # ~3k gas per user
+
+# batchReconcile(address[],uint256[]) selector is hashed once; calls only ABI-encode arguments
+_RECONCILE_SELECTOR = function_selector("batchReconcile(address[],uint256[])")
+_ADDRESS_PAD = bytes(12)  # left padding of a 20-byte address to a 32-byte word
+
+# (user_addresses, points, future resolved with the relayer result)
+_Item = Tuple[List[str], List[int], asyncio.Future]
+
+
+def _encode_reconcile_args(addresses: List[str], points: List[int]) -> bytes:
+    """
+    ABI-encode (address[], uint256[]) for batchReconcile
+
+    Same bytes as eth_abi.encode(["address[]", "uint256[]"], ...), built with
+    one bytes.join per array instead of eth_abi's per-element encoder stack.
+    Addresses arrive pattern-validated (0x + 40 hex) and points range-checked
+    (0 <= p < 2**256) from BatchReconcileRequest.
+    """
+    n = len(addresses)
+    # Head: offsets of the two dynamic arrays, then each tail is length + words
+    head = (64).to_bytes(32, "big") + (64 + 32 * (n + 1)).to_bytes(32, "big")
+    length = n.to_bytes(32, "big")
+    address_words = b"".join(_ADDRESS_PAD + bytes.fromhex(address[2:]) for address in addresses)
+    point_words = b"".join(p.to_bytes(32, "big") for p in points)
+    return head + length + address_words + length + point_words
+
+
+class ReconcileBatcher:
+    """Window-based coalescing of batchReconcile submissions"""
+
+    def __init__(self, relayer_ids: List[str], contract_address: str):
+        self.contract_address = contract_address
+        self._in_flight: Dict[str, int] = {rid: 0 for rid in relayer_ids}
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()  # strong refs until each send finishes
+
+    def _ensure_started(self):
+        if self._drainer is None or self._drainer.done():
+            self._queue = asyncio.Queue()
+            self._drainer = asyncio.create_task(self._drain_loop())
+
+    async def submit(self, user_addresses: List[str], points: List[int]) -> Dict[str, Any]:
+        """
+        Queue one caller's batch and wait for the transaction that carries it
+
+        Returns:
+            Relayer send_transaction result ({transaction_id, status, ...})
+            plus the relayer_id it was sent through
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((user_addresses, points, future))
+        return await future
+
+    async def _drain_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            users = len(items[0][0])
+            deadline = loop.time() + BATCH_WINDOW
+
+            # Collect whatever else arrives within the window, until a full tx is ready
+            while users < MAX_RECONCILE_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                users += len(item[0])
+
+            for chunk in self._pack(items):
+                task = asyncio.create_task(self._dispatch(chunk))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    @staticmethod
+    def _pack(items: List[_Item]) -> List[List[_Item]]:
+        """Greedily group requests into chunks of at most MAX_RECONCILE_BATCH users"""
+        chunks: List[List[_Item]] = []
+        current: List[_Item] = []
+        size = 0
+        for item in items:
+            n = len(item[0])
+            if current and size + n > MAX_RECONCILE_BATCH:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(item)
+            size += n
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _dispatch(self, chunk: List[_Item]):
+        relayer_id = min(self._in_flight, key=self._in_flight.get)
+        self._in_flight[relayer_id] += 1
+        try:
+            addresses = [address for item in chunk for address in item[0]]
+            points = [p for item in chunk for p in item[1]]
+
+            data = "0x" + (_RECONCILE_SELECTOR + _encode_reconcile_args(addresses, points)).hex()
+            result = await get_relayer_client().send_transaction(
+                relayer_id=relayer_id,
+                to=self.contract_address,
+                data=data,
+                gas_limit=RECONCILE_GAS_LIMIT,
+                speed="fast"
+            )
+            logger.info(
+                "batchReconcile via %s: %d requests, %d users",
+                relayer_id, len(chunk), len(addresses)
+            )
+
+            result = {**result, "relayer_id": relayer_id}
+            for _, _, future in chunk:
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, _, future in chunk:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight[relayer_id] -= 1
+
+    async def stop(self):
+        """Cancel the drain task (called on application shutdown)"""
+        if self._drainer is not None:
+            self._drainer.cancel()
+            self._drainer = None
@@ -0,0 +1,183 @@
+"""
+Batch Reconcile Worker
+======================
+Supervises one long-lived Node.js process (aa-test/batch-reconcile-server.js)
+that executes reconciliation batches via Biconomy, so each batch skips Node
+start-up, SDK import and smart account setup.
+
+Requests and results are newline-delimited JSON over the child's
+stdin/stdout, matched by request id. The worker is started on first use,
+pinged every HEARTBEAT_INTERVAL seconds, killed if it stops answering, and
+restarted by the next request after it exits.
+
+The worker runs batches one at a time, so batches queue here and only one
+is outstanding at once: a batch's timeout starts when the worker gets it,
+and a batch still running past its timeout is waited on, never dropped (it
+may yet mint, so reporting it as failed would reconcile its users twice).
+
+Usage:
+    from services.reconcile_worker import reconcile_worker
+
+    result = await reconcile_worker.submit({"users": [...], "points": [...]}, timeout=300)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "aa-test", "batch-reconcile-server.js")
+HEARTBEAT_INTERVAL = 30.0  # seconds between pings
+HEARTBEAT_TIMEOUT = 10.0  # seconds to answer a ping before the worker is killed
+STREAM_LIMIT = 1024 * 1024  # max bytes per result line
+
+
+class ReconcileWorkerError(Exception):
+    """The worker could not be started or exited before answering"""
+
+
+class ReconcileWorker:
+    """Client for a supervised batch-reconcile Node.js process"""
+
+    def __init__(self, script_path: str = WORKER_SCRIPT_PATH):
+        self.script_path = os.path.abspath(script_path)
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self._batch_lock = asyncio.Lock()  # one reconcile batch in the worker at a time
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def _ensure_started(self):
+        async with self._start_lock:
+            if self.running:
+                return
+
+            try:
+                self._proc = await asyncio.create_subprocess_exec(
+                    "node", self.script_path,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    cwd=os.path.dirname(self.script_path),
+                    limit=STREAM_LIMIT
+                )
+            except OSError as e:
+                raise ReconcileWorkerError(f"Failed to start reconcile worker: {e}") from e
+
+            logger.info("Started reconcile worker (pid %s)", self._proc.pid)
+            self._reader = asyncio.create_task(self._read_loop(self._proc))
+            if self._heartbeat is None or self._heartbeat.done():
+                self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def _read_loop(self, proc: asyncio.subprocess.Process):
+        """Resolve pending requests from the worker's stdout until it exits"""
+        try:
+            async for line in proc.stdout:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring non-JSON reconcile worker output: %r", line[:200])
+                    continue
+
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message.get("result"))
+        finally:
+            returncode = await proc.wait()
+            logger.warning("Reconcile worker (pid %s) exited with code %s", proc.pid, returncode)
+
+            # Whatever was in flight will never be answered
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ReconcileWorkerError(f"Reconcile worker exited with code {returncode}"))
+
+    async def _heartbeat_loop(self):
+        """Kill the worker if it stops answering pings; next request restarts it"""
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            if not self.running:
+                continue
+            proc = self._proc
+            try:
+                await self._request({"type": "ping"}, timeout=HEARTBEAT_TIMEOUT)
+            except (asyncio.TimeoutError, ReconcileWorkerError) as e:
+                if proc.returncode is None:
+                    logger.error("Reconcile worker unresponsive (%s), restarting", e or "ping timeout")
+                    proc.kill()
+
+    async def _request(self, message: Dict[str, Any], timeout: float, keep_waiting: bool = False) -> Any:
+        if not self.running:
+            raise ReconcileWorkerError("Reconcile worker is not running")
+
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._proc.stdin.write((json.dumps({"id": request_id, **message}) + "\n").encode())
+            await self._proc.stdin.drain()
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                if not keep_waiting:
+                    raise
+                logger.error(
+                    "Reconcile request %s still running after %ss, waiting for its result", request_id, timeout
+                )
+                return await future
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise ReconcileWorkerError(f"Reconcile worker pipe closed: {e}") from e
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def submit(self, config: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Execute one reconciliation batch on the worker
+
+        Waits behind any batch already in the worker first; that wait does not
+        count against timeout.
+
+        Args:
+            config: {users, points, points_to_well_rate}
+            timeout: Seconds the batch may run before it is logged as overdue;
+                the result is still awaited after that
+
+        Returns:
+            Result dict from batch-reconcile.js (success, transactionHash, ...)
+
+        Raises:
+            ReconcileWorkerError: Worker could not start or died mid-batch
+        """
+        async with self._batch_lock:
+            await self._ensure_started()
+            return await self._request({"type": "reconcile", "config": config}, timeout, keep_waiting=True)
+
+    async def stop(self):
+        """Stop heartbeats and let the worker exit (called on application shutdown)"""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+        proc = self._proc
+        if proc is None or proc.returncode is not None:
+            return
+
+        # Closing stdin lets the worker finish queued batches and exit on its own
+        proc.stdin.close()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=10.0)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+
+# Shared worker for the process
+reconcile_worker = ReconcileWorker()
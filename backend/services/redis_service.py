@@ -5,6 +5,7 @@ This module provides a production-grade Redis client for:
 - Idempotency cache (persistent across restarts)
 - Rate limiting (shared across multiple instances)
 - Blocklist management (persistent blocked addresses)
+- Short-lived JSON caches (e.g. per-user push tokens)
 
 Usage:
     from services.redis_service import get_redis_client
@@ -16,6 +17,8 @@ Usage:
 import os
 import logging
 import json
+import time
+import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
@@ -296,6 +299,74 @@ class RedisService:
         allowed = current <= limit
         return (allowed, current, ttl)
 
+    def check_sliding_window(
+        self,
+        identifier: str,
+        limit: int,
+        window: int
+    ) -> tuple[bool, int, int]:
+        """
+        Check rate limit using a true sliding window (sorted set of hit
+        timestamps), so bursts can't straddle a fixed window boundary.
+
+        Args:
+            identifier: Client identifier (user ID, endpoint, etc.)
+            limit: Maximum requests allowed within any `window` seconds
+            window: Window length in seconds
+
+        Returns:
+            Tuple of (allowed, current_count, retry_after)
+            - allowed: True if request is allowed (and was recorded)
+            - current_count: Requests in the window, including this one
+            - retry_after: Seconds until a slot frees up (0 if allowed)
+        """
+        key = f"sliding_window:{identifier}"
+        now = time.time()
+
+        if self._client:
+            try:
+                member = f"{now}:{uuid.uuid4().hex}"
+                pipe = self._client.pipeline()
+                pipe.zremrangebyscore(key, 0, now - window)
+                pipe.zadd(key, {member: now})
+                pipe.zcard(key)
+                pipe.zrange(key, 0, 0, withscores=True)
+                pipe.expire(key, window)
+                _, _, current, oldest, _ = pipe.execute()
+
+                if current <= limit:
+                    return (True, current, 0)
+
+                # Over the limit: don't let the rejected hit occupy a slot
+                self._client.zrem(key, member)
+                retry_after = int(oldest[0][1] + window - now) + 1 if oldest else window
+                return (False, current - 1, retry_after)
+
+            except Exception as e:
+                logger.error(f"Redis sliding window check failed: {e}")
+                return self._fallback_sliding_window(key, limit, window, now)
+        else:
+            return self._fallback_sliding_window(key, limit, window, now)
+
+    def _fallback_sliding_window(
+        self,
+        key: str,
+        limit: int,
+        window: int,
+        now: float
+    ) -> tuple[bool, int, int]:
+        """Fallback sliding window using in-memory cache."""
+        cached = self._fallback_cache.get(key)
+        hits = [t for t in cached["hits"] if t > now - window] if cached else []
+
+        if len(hits) >= limit:
+            self._fallback_cache[key] = {"hits": hits, "expires_at": datetime.now() + timedelta(seconds=window)}
+            return (False, len(hits), int(hits[0] + window - now) + 1)
+
+        hits.append(now)
+        self._fallback_cache[key] = {"hits": hits, "expires_at": datetime.now() + timedelta(seconds=window)}
+        return (True, len(hits), 0)
+
     # ============================================================
     # Blocklist Management
     # ============================================================
@@ -521,6 +592,85 @@ class RedisService:
     # General Cache Operations
     # ============================================================
 
+    def get_json(self, key: str) -> Optional[Any]:
+        """
+        Get a JSON-encoded cache value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded value or None if not found/expired
+        """
+        full_key = f"cache:{key}"
+
+        if self._client:
+            try:
+                data = self._client.get(full_key)
+                return json.loads(data) if data is not None else None
+            except Exception as e:
+                logger.error(f"Redis get_json failed: {e}")
+                return self._fallback_get_json(full_key)
+        else:
+            return self._fallback_get_json(full_key)
+
+    def _fallback_get_json(self, key: str) -> Optional[Any]:
+        """Fallback cache read using in-memory cache."""
+        cached = self._fallback_cache.get(key)
+        if cached and cached["expires_at"] > datetime.now():
+            return json.loads(cached["value"])
+        return None
+
+    def set_json(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """
+        Store a JSON-serializable value with TTL.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time-to-live in seconds (default: 5 minutes)
+
+        Returns:
+            True if stored successfully
+        """
+        full_key = f"cache:{key}"
+        data = json.dumps(value, default=str)
+
+        if self._client:
+            try:
+                self._client.setex(full_key, ttl, data)
+                return True
+            except Exception as e:
+                logger.error(f"Redis set_json failed: {e}")
+                if not self._use_fallback:
+                    return False
+
+        self._fallback_cache[full_key] = {
+            "value": data,
+            "expires_at": datetime.now() + timedelta(seconds=ttl)
+        }
+        return True
+
+    def delete_json(self, key: str) -> bool:
+        """
+        Delete a cache value (write-through invalidation).
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key existed
+        """
+        full_key = f"cache:{key}"
+        existed = self._fallback_cache.pop(full_key, None) is not None
+
+        if self._client:
+            try:
+                return self._client.delete(full_key) > 0 or existed
+            except Exception as e:
+                logger.error(f"Redis delete_json failed: {e}")
+        return existed
+
     def clear_cache(self, pattern: str = "*") -> int:
         """
         Clear cache entries matching pattern.